@@ -2,12 +2,222 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import abc
+import io
 import re
+import codecs
+import contextlib
+import json
 import locale
+import os
+import hashlib
+import inspect
+import sqlite3
+import time
+import threading
+import multiprocessing
 import numpy as np
-from datetime import datetime, timedelta
+import requests
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
 from sklearn.linear_model import LinearRegression
 
+PANDAS_3 = int(pd.__version__.split('.')[0]) >= 3
+
+# Copy-on-write: as páginas recebem cópias rasas da base em cache e podem adicionar/alterar colunas sem afetá-la
+# (a partir do pandas 3.0 o copy-on-write é sempre ativo)
+if not PANDAS_3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Esquema das colunas do formulário. O cabeçalho longo do número do processo é referenciado pelo nome curto abaixo.
+COLUNA_PROCESSO = 'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'
+
+# Tipos de envio do formulário: rótulo exibido nas páginas -> resposta completa. A coluna derivada Tipo_Envio traz o
+# rótulo de cada resposta, com códigos fixos nesta ordem; qualquer outra resposta (ex.: Cancelado) fica 'Outros'.
+TIPOS_ENVIO = {
+    '1º Envio': '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)',
+    'Prioridades': 'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)',
+    'Reenvio': 'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)',
+}
+
+# Categorias de Informação Técnica dos quadros e treemaps. Os quadros contam, de forma independente, as respostas que
+# contêm cada categoria (sem diferenciar maiúsculas), então uma resposta pode contar em mais de um quadro: uma coluna
+# booleana por categoria (COLUNAS_CONTEM_IT). Os treemaps mostram as respostas iguais à categoria (Categoria_IT).
+CATEGORIAS_IT = ['IT - RADA', 'IT - IPA', 'IT - FISCALIZAÇÃO', 'IT - Descumprimento de Condicionante', 'IT - Outros', 'Não']
+COLUNAS_CONTEM_IT = {categoria: f'Contém {categoria}' for categoria in CATEGORIAS_IT}
+
+# Texto em Arrow (mesmo tipo padrão de texto do pandas 3, com NaN para valores ausentes)
+try:
+    TIPO_TEXTO = pd.StringDtype("pyarrow", na_value=np.nan)
+except TypeError:
+    TIPO_TEXTO = "string[pyarrow_numpy]"
+
+# Campos com poucos valores distintos viram categóricos; só a partir do pandas 3 (a versão de requirements.txt), em que
+# o groupby usa observed=True por padrão (antes, categorias sem linhas apareceriam nos agrupamentos das páginas)
+TIPO_CATEGORIA = "category" if PANDAS_3 else TIPO_TEXTO
+TIPO_ENVIO = pd.CategoricalDtype(list(TIPOS_ENVIO) + ['Outros']) if PANDAS_3 else TIPO_TEXTO
+TIPO_CATEGORIA_IT = pd.CategoricalDtype(CATEGORIAS_IT) if PANDAS_3 else TIPO_TEXTO
+TIPOS_COLUNAS = {
+    'Analista (você)': TIPO_CATEGORIA,
+    'Revisado por': TIPO_CATEGORIA,
+    'Informação Técnica': TIPO_CATEGORIA,
+    'Tipo de empreendimento': TIPO_CATEGORIA,
+    'Status do processo pós revisão': TIPO_CATEGORIA,
+    'Qual o tipo de envio?': TIPO_TEXTO,
+    'Empresa': TIPO_TEXTO,
+    COLUNA_PROCESSO: TIPO_TEXTO,
+    'Codigo_Processo': TIPO_TEXTO,
+    'Observações': TIPO_TEXTO,
+    'ANO': 'Int16',
+    'MÊS': 'Int8',
+    # Colunas derivadas no pré-processamento (ETAPAS_PREPROCESSAMENTO)
+    'MÊS_envio': 'int8',
+    'ANO_envio': 'int16',
+    'SEMANA_envio': 'int8',
+    'SEMANA_revisão': 'int8',
+    'Tipo de Processo': TIPO_TEXTO,
+    'Reenvio_Processo': 'bool',
+    'Envio_Cancelado': 'bool',
+    'Tipo_Envio': TIPO_ENVIO,
+    'Categoria_IT': TIPO_CATEGORIA_IT,
+    **{coluna: 'bool' for coluna in COLUNAS_CONTEM_IT.values()},
+}
+
+# Limite de memória (em MB) do cache de bases carregadas, compartilhado entre todas as sessões
+LIMITE_CACHE_MB = int(os.environ.get("NUPETR_CACHE_MB", "512"))
+
+# Limite de memória (em MB) do índice de filtros de cada versão da base: dimensões indexadas e seleções já
+# resolvidas em linhas
+LIMITE_INDICE_FILTROS_MB = int(os.environ.get("NUPETR_FILTROS_CACHE_MB", "64"))
+
+# Tamanho dos blocos lidos para validar a codificação e calcular o hash do conteúdo sem carregar o arquivo inteiro
+TAMANHO_BLOCO_LEITURA = 1024 * 1024
+
+# Diretório dos snapshots colunares (Feather) das bases já processadas
+DIRETORIO_SNAPSHOTS = os.environ.get("NUPETR_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".nupetr_cache"))
+
+# Atualização incremental: colunas que identificam uma resposta do formulário e fração máxima de linhas
+# novas/alteradas para a qual ainda compensa atualizar em vez de recarregar a base inteira
+COLUNAS_CHAVE_LINHA = ['Carimbo de data/hora', COLUNA_PROCESSO, 'Analista (você)']
+FRACAO_MAXIMA_INCREMENTAL = 0.5
+
+# Arquivos maiores que este limite (em MB) são lidos em blocos de LINHAS_POR_BLOCO linhas, gravados direto no
+# snapshot em disco, mantendo o pico de memória da leitura limitado
+LIMITE_LEITURA_EM_BLOCOS_MB = int(os.environ.get("NUPETR_BLOCOS_MB", "100"))
+LINHAS_POR_BLOCO = 100_000
+
+# Colunas de data do formulário e formatos aceitos, na ordem em que são testados. As datas são convertidas uma única
+# vez, na carga, sempre com a mesma resolução.
+COLUNAS_DATA = ['Carimbo de data/hora', 'Revisado em']
+FORMATOS_DATA = ['%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']
+TIPO_DATA = 'datetime64[us]'
+# Abreviações dos meses nos rótulos de semana do calendário (ver Calendario)
+MESES_ABREVIADOS = ['JAN', 'FEV', 'MAR', 'ABR', 'MAI', 'JUN', 'JUL', 'AGO', 'SET', 'OUT', 'NOV', 'DEZ']
+
+# Feriados do Rio Grande do Norte descontados na contagem de dias úteis: fixos (nacionais e estaduais), como
+# 'MM-DD' -> primeiro ano em vigor; móveis, em dias a partir do domingo de Páscoa (Carnaval e Corpus Christi são ponto
+# facultativo no serviço público estadual); e datas avulsas (AAAA-MM-DD, separadas por vírgula) em NUPETR_FERIADOS,
+# para pontos facultativos decretados
+FERIADOS_FIXOS = {
+    '01-01': 0,     # Confraternização Universal
+    '04-21': 0,     # Tiradentes
+    '05-01': 0,     # Dia do Trabalho
+    '09-07': 0,     # Independência do Brasil
+    '10-03': 2007,  # Mártires de Cunhaú e Uruaçu (estadual)
+    '10-12': 0,     # Nossa Senhora Aparecida
+    '11-02': 0,     # Finados
+    '11-15': 0,     # Proclamação da República
+    '11-20': 2024,  # Zumbi e da Consciência Negra
+    '12-25': 0,     # Natal
+}
+FERIADOS_MOVEIS = [-48, -47, -2, 60]  # Carnaval (segunda e terça), Sexta-feira Santa, Corpus Christi
+FERIADOS_AVULSOS = [data for data in os.environ.get("NUPETR_FERIADOS", "").split(",") if data]
+# Revisão com data anterior à do envio (erro de preenchimento): 'zerar' conta 0 dias; 'excluir' deixa a resposta fora
+# da análise dos tempos
+POLITICAS_PRAZO_NEGATIVO = ['zerar', 'excluir']
+POLITICA_PRAZO_NEGATIVO = os.environ.get("NUPETR_PRAZO_NEGATIVO", "zerar").strip().lower()
+if POLITICA_PRAZO_NEGATIVO not in POLITICAS_PRAZO_NEGATIVO:
+    raise ValueError(f"NUPETR_PRAZO_NEGATIVO inválido: {POLITICA_PRAZO_NEGATIVO!r} (use {' ou '.join(POLITICAS_PRAZO_NEGATIVO)})")
+
+# Vários arquivos (ex.: exportações anuais + planilha atual) são processados em paralelo, em até
+# MAX_PROCESSOS_LEITURA processos, esperando cada leitura por até TIMEOUT_LEITURA_PARALELA_S segundos. Sem upload, são
+# lidos os CSVs de DIRETORIO_DADOS, quando configurado, verificado em segundo plano a cada INTERVALO_MONITORAMENTO_S
+# segundos
+MAX_PROCESSOS_LEITURA = int(os.environ.get("NUPETR_PROCESSOS", str(min(4, os.cpu_count() or 1))))
+TIMEOUT_LEITURA_PARALELA_S = float(os.environ.get("NUPETR_LEITURA_TIMEOUT_S", "600"))
+DIRETORIO_DADOS = os.environ.get("NUPETR_DADOS_DIR", "")
+INTERVALO_MONITORAMENTO_S = float(os.environ.get("NUPETR_MONITOR_S", "10"))
+
+# Link padrão da planilha (CSV ou Google Sheets), intervalo mínimo entre duas verificações do mesmo link e tempo
+# limite das requisições
+URL_DADOS = os.environ.get("NUPETR_DADOS_URL", "")
+INTERVALO_HTTP_S = float(os.environ.get("NUPETR_HTTP_S", "60"))
+TIMEOUT_HTTP_S = 30
+
+# Banco de dados embutido (SQLite) opcional, habilitado por NUPETR_BANCO: guarda todas as respostas já carregadas
+# (uma linha por resposta, pela chave de linha) e as páginas leem dele só o período escolhido, por padrão os
+# ANOS_BANCO_PADRAO anos mais recentes (0 = todo o histórico). Índices do banco -> coluna indexada; as contagens por
+# período, tipo de envio e Informação Técnica são consultas agrupadas pela faixa de datas de envio
+# (BancoRespostas.agregar).
+CAMINHO_BANCO = os.environ.get("NUPETR_BANCO", "")
+ANOS_BANCO_PADRAO = int(os.environ.get("NUPETR_BANCO_ANOS", "0"))
+INDICES_BANCO = {
+    'indice_envio': 'Carimbo de data/hora',
+    'indice_revisao': 'Revisado em',
+    'indice_analista': 'Analista (você)',
+    'indice_revisor': 'Revisado por',
+    'indice_processo': 'Codigo_Processo',
+}
+FORMATO_DATA_BANCO = '%Y-%m-%d %H:%M:%S'
+
+# Versão do formato das bases processadas; incrementar ao mudar a normalização feita em normalizar_dados ou os
+# tipos de TIPOS_COLUNAS
+VERSAO_ESQUEMA = 4
+
+# Colunas lidas por cada página (projeção sobre a base em cache). As demais, como as respostas livres do
+# formulário, só são carregadas quando escolhidas em "Crie sua Tabela"
+COLUNAS_VISOES = [
+    'Carimbo de data/hora', 'Analista (você)',
+    COLUNA_PROCESSO,
+    'Qual o tipo de envio?', 'Informação Técnica', 'Empresa', 'Tipo de empreendimento', 'Quantidade de empreendimentos',
+    'Revisado em', 'Revisado por', 'Status do processo pós revisão', 'ANO', 'MÊS', 'Codigo_Processo', 'Envio_Cancelado',
+    'Tipo_Envio', 'Categoria_IT', *COLUNAS_CONTEM_IT.values(),
+]
+COLUNAS_PERIODO_ENVIO = ['MÊS_envio', 'ANO_envio', 'SEMANA_envio']
+# Dimensões dos filtros de ano, mês e semana (chave da semana ISO das datas) do envio
+COLUNAS_PERIODO_FILTROS = ['ANO_envio', 'MÊS_envio', 'Carimbo de data/hora']
+# Colunas derivadas usadas só em filtros e agrupamentos, omitidas nas tabelas exibidas
+COLUNAS_AUXILIARES = ['Envio_Cancelado', 'Tipo_Envio', 'Categoria_IT', *COLUNAS_CONTEM_IT.values()]
+
+# Siglas reconhecidas como tipo de processo (as demais viram 'Outros'); ver classificar_tipo_processo
+SIGLAS_TIPO_PROCESSO = os.environ.get("NUPETR_SIGLAS", "LP,LPpe,LI,LIO,LO,LRO,LA,AE,ATO,LS,RLO,RLS,LPpr").split(",")
+PADRAO_SIGLA_APOS_TEC = r'TEC[/-]*(?P<sigla>[A-Z]{2,5})'
+PADRAO_SIGLA_AVULSA = r'(?i)\b(?P<sigla>' + '|'.join(sorted(map(re.escape, SIGLAS_TIPO_PROCESSO), key=len, reverse=True)) + r')\b'
+# Marca de reenvio no número do processo (Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)
+PADRAO_REENVIO = r'(?i)CORRIGID[OA]'
+# Tipos de envio que indicam envio cancelado ('Cancelado', 'Cancelar ...'); ver etapa_cancelamento
+PADRAO_CANCELAMENTO = r'(?i)\bcancel(?:ad[oa]s?|ar)\b'
+
+COLUNAS_POR_PAGINA = {
+    "Visão Global - NUPETR": COLUNAS_VISOES + COLUNAS_PERIODO_ENVIO + ['Tipo de Processo'],
+    "Visão - Analista": COLUNAS_VISOES + COLUNAS_PERIODO_ENVIO + ['Tipo de Processo'],
+    "Visão - Revisão": COLUNAS_VISOES + ['SEMANA_revisão', 'Tipo de Processo'],
+    # Os resumos exibem as tabelas de processos do dia/mês com as colunas do formulário (exceto as respostas livres)
+    "Resumo de Envios": COLUNAS_VISOES + ['Tipo de Processo'],
+    "Resumo de Revisões": COLUNAS_VISOES + ['Tipo de Processo'],
+    "Análise dos Tempos e Estatísticas": [
+        'Carimbo de data/hora', 'Analista (você)',
+        COLUNA_PROCESSO,
+        'Qual o tipo de envio?', 'Informação Técnica', 'Tipo de empreendimento', 'Revisado em', 'Revisado por',
+        'Status do processo pós revisão', 'ANO', 'MÊS', 'Codigo_Processo', 'Envio_Cancelado', 'Tipo_Envio',
+    ] + COLUNAS_PERIODO_ENVIO + ['Tipo de Processo'],
+}
+
 
 
 # Configura o título e o ícone da página
@@ -51,8 +261,11 @@ with st.sidebar:
         Faça o upload da planilha CSV com as revisões do NUPETR.
     """, unsafe_allow_html=True)
 
-    # Carregamento da base de dados
-    uploaded_file = st.sidebar.file_uploader("Clique para carregar o arquivo CSV:", type="csv")
+    # Carregamento da base de dados (um ou mais arquivos CSV)
+    uploaded_file = st.sidebar.file_uploader("Clique para carregar o(s) arquivo(s) CSV:", type="csv", accept_multiple_files=True)
+
+    # Ou o link da planilha (Google Sheets ou CSV), baixada novamente só quando for alterada
+    url_dados = st.sidebar.text_input("Ou informe o link da planilha:", value=URL_DADOS).strip()
 
     # Filtros (título maior e com destaque em verde)
     st.sidebar.markdown('<h4 style="text-align: center; color: #388E3C; font-weight: bold;">Filtros</h4>', unsafe_allow_html=True)
@@ -61,13 +274,18 @@ with st.sidebar:
     """, unsafe_allow_html=True)
 
 
+# Extrai o código do processo: os seis números próximos de /TEC ou -TEC, em qualquer posição
+def extrair_codigo_processo(numeros_processo):
+    codigos = numeros_processo.str.extract(r'(\d{6})(?=.*TEC)', expand=False)
+
+    # Preenchendo possíveis valores ausentes com um identificador genérico
+    return codigos.fillna('Desconhecido')
+
 # Função para criar a coluna Codigo_Processo
 def criar_codigo_processo(df):
-    # Utiliza uma expressão regular para extrair os seis números próximos de /TEC ou -TEC, em qualquer posição
-    df['Codigo_Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].str.extract(r'(\d{6})(?=.*TEC)', expand=False)
-
-    # Preenchendo possíveis valores ausentes na coluna 'Codigo_Processo' com um identificador genérico
-    df['Codigo_Processo'] = df['Codigo_Processo'].fillna('Desconhecido')
+    # Código já extraído no pré-processamento; só é extraído aqui se a coluna não foi carregada
+    if 'Codigo_Processo' not in df.columns:
+        df['Codigo_Processo'] = extrair_codigo_processo(df[COLUNA_PROCESSO])
 
     # Contagem total de cada processo
     df['Contagem_Processo'] = df.groupby('Codigo_Processo')['Codigo_Processo'].transform('count')
@@ -77,24 +295,1561 @@ def criar_codigo_processo(df):
     
     return df
 
-# Função para carregar dados do arquivo CSV
-def load_data(file_path):
+
+# Ciclo de vida dos processos: as respostas de cada Codigo_Processo (1º envio, correções e reenvios), ordenadas pelo
+# envio e guardadas em arrays contíguos; os eventos do processo i ocupam as posições inicios[i]:fins[i]. Ciclos, dias
+# do primeiro envio até a última revisão e situação atual de cada processo são calculados uma vez, na construção.
+class CicloProcessos:
+    SITUACAO_PENDENTE = 'Aguardando revisão'
+
+    def __init__(self, df):
+        validos = (df['Codigo_Processo'].fillna('Desconhecido') != 'Desconhecido').to_numpy(dtype=bool)
+        if 'Envio_Cancelado' in df.columns:
+            validos = validos & ~df['Envio_Cancelado'].to_numpy(dtype=bool)
+        dados = df[validos]
+
+        # Ordena por processo e, dentro dele, pela data de envio; cada processo começa onde o código muda
+        codigos, processos = pd.factorize(dados['Codigo_Processo'])
+        envios = dados['Carimbo de data/hora'].to_numpy(dtype=TIPO_DATA)
+        ordem = np.lexsort((envios, codigos))
+        codigos = codigos[ordem]
+        self.processos = pd.Index(processos, dtype=TIPO_TEXTO)
+        self.inicios = np.flatnonzero(np.diff(codigos, prepend=-1))
+        self.fins = np.append(self.inicios[1:], len(codigos))[:len(self.inicios)]
+
+        # Eventos (índice da linha na base, datas, revisor, status e tipo de envio como códigos)
+        self.linhas = dados.index.to_numpy()[ordem]
+        self.envios = envios[ordem]
+        self.revisoes = dados['Revisado em'].to_numpy(dtype=TIPO_DATA)[ordem]
+        self.revisores, self.nomes_revisores = self._codificar(dados, 'Revisado por', ordem)
+        self.status, self.nomes_status = self._codificar(dados, 'Status do processo pós revisão', ordem)
+        self.tipos_envio, self.nomes_tipos_envio = self._codificar(dados, 'Tipo_Envio', ordem)
+
+        # Resumo por processo
+        self.ciclos = self.fins - self.inicios
+        ultimos = self.fins - 1
+        fim = np.where(np.isnat(self.revisoes), self.envios, self.revisoes)
+        if len(self.inicios):
+            fim = np.maximum.reduceat(fim.view('int64'), self.inicios).view(TIPO_DATA)
+        self.dias = (fim[:len(self.inicios)] - self.envios[self.inicios]) / np.timedelta64(1, 'D')
+        # Situação atual: status da última resposta ou, enquanto ela não foi revisada, SITUACAO_PENDENTE (último código)
+        self.nomes_situacoes = np.append(self.nomes_status, self.SITUACAO_PENDENTE)
+        self.situacoes = np.where(np.isnat(self.revisoes[ultimos]), len(self.nomes_status), self.status[ultimos])
+
+    @staticmethod
+    def _codificar(dados, coluna, ordem):
+        if coluna not in dados.columns:
+            return np.full(len(ordem), -1, dtype=np.int32), np.array([], dtype=object)
+        codigos, nomes = pd.factorize(dados[coluna])
+        return codigos[ordem].astype(np.int32), np.asarray(nomes, dtype=object)
+
+    # Rótulos dos códigos (-1, valor ausente, vira None)
+    @staticmethod
+    def _rotulos(nomes, codigos):
+        return np.append(nomes, None)[codigos]
+
+    def posicao(self, codigo):
+        try:
+            return self.processos.get_loc(codigo)
+        except KeyError:
+            return None
+
+    def resumo(self, codigo):
+        posicao = self.posicao(codigo)
+        if posicao is None:
+            return None
+        return {
+            'ciclos': int(self.ciclos[posicao]),
+            'dias': float(self.dias[posicao]),
+            'situacao': self._rotulos(self.nomes_situacoes, self.situacoes[posicao:posicao + 1])[0],
+            'primeiro_envio': self.envios[self.inicios[posicao]],
+            'ultimo_envio': self.envios[self.fins[posicao] - 1],
+        }
+
+    def eventos(self, codigo):
+        posicao = self.posicao(codigo)
+        fatia = slice(0, 0) if posicao is None else slice(self.inicios[posicao], self.fins[posicao])
+        return pd.DataFrame({
+            'Carimbo de data/hora': self.envios[fatia],
+            'Tipo de envio': self._rotulos(self.nomes_tipos_envio, self.tipos_envio[fatia]),
+            'Revisado em': self.revisoes[fatia],
+            'Revisado por': self._rotulos(self.nomes_revisores, self.revisores[fatia]),
+            'Status do processo pós revisão': self._rotulos(self.nomes_status, self.status[fatia]),
+        }, index=self.linhas[fatia])
+
+    # Resumo por processo; com codigos, só os processos informados
+    def tabela(self, codigos=None):
+        posicoes = np.arange(len(self.processos))
+        if codigos is not None:
+            posicoes = self.processos.get_indexer(pd.Index(pd.unique(codigos), dtype=TIPO_TEXTO))
+            posicoes = posicoes[posicoes >= 0]
+        return pd.DataFrame({
+            'Codigo_Processo': self.processos[posicoes],
+            'Ciclos': self.ciclos[posicoes],
+            'Dias_Totais': self.dias[posicoes].round(1),
+            'Situação': self._rotulos(self.nomes_situacoes, self.situacoes[posicoes]),
+        })
+
+
+# Índice do ciclo de vida de cada versão da base, construído uma única vez e compartilhado entre reruns e sessões
+@st.cache_resource(max_entries=8)
+def obter_ciclo_processos(versao_base, _df):
+    return CicloProcessos(_df)
+
+
+# Ciclo de vida dos processos da base carregada pela página (antes de qualquer filtro)
+def ciclo_processos(df):
+    versao_base = df.attrs.get('versao_base')
+    return CicloProcessos(df) if versao_base is None else obter_ciclo_processos(versao_base, df)
+
+# Cache LRU das bases já processadas, indexado pelo hash do conteúdo do arquivo
+class CacheDatasets:
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()  # chave -> (DataFrame, assinaturas das linhas, tamanho em bytes)
+        self._origens = {}  # nome do arquivo -> chave da última versão carregada
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _obter_item(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            # Marca como usado mais recentemente
+            self._itens.move_to_end(chave)
+            return item
+
+    def obter(self, chave):
+        item = self._obter_item(chave)
+        return None if item is None else item[0]
+
+    def obter_com_assinaturas(self, chave):
+        item = self._obter_item(chave)
+        return (None, None) if item is None else item[:2]
+
+    def guardar(self, chave, df, assinaturas=None):
+        tamanho = int(df.memory_usage(index=True, deep=True).sum())
+        if assinaturas is not None:
+            tamanho += assinaturas.nbytes
+        with self._lock:
+            if chave in self._itens:
+                self._total_bytes -= self._itens.pop(chave)[2]
+            self._itens[chave] = (df, assinaturas, tamanho)
+            self._total_bytes += tamanho
+            # Remove as bases usadas há mais tempo até respeitar o limite (mantém sempre a mais recente)
+            while self._total_bytes > self.limite_bytes and len(self._itens) > 1:
+                _, (_, _, tamanho_removido) = self._itens.popitem(last=False)
+                self._total_bytes -= tamanho_removido
+
+    def registrar_origem(self, origem, chave):
+        with self._lock:
+            self._origens[origem] = chave
+
+    def ultima_chave(self, origem):
+        with self._lock:
+            return self._origens.get(origem)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._origens.clear()
+            self._total_bytes = 0
+
+
+# Instância única do cache, compartilhada entre reruns, páginas e sessões do Streamlit
+@st.cache_resource
+def obter_cache_datasets():
+    return CacheDatasets(LIMITE_CACHE_MB * 1024 * 1024)
+
+
+# Fontes de dados: arquivo enviado, CSV local e CSV em um link (HTTP). Todas têm um nome (a origem usada na
+# atualização incremental), a chave (hash do conteúdo) quando já é conhecida sem ler o arquivo, ler(), que devolve
+# o conteúdo bruto, e abrir(), que o devolve como arquivo binário (para uso com with) sem copiá-lo para a memória
+class FonteDados(abc.ABC):
+    name = None
+    chave = None
+
+    @abc.abstractmethod
+    def ler(self):
+        ...
+
+    def abrir(self):
+        return io.BytesIO(self.ler())
+
+
+class FonteUpload(FonteDados):
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.name = arquivo.name
+
+    def ler(self):
+        return self.arquivo.getvalue()
+
+    # O arquivo enviado já está em memória (e continua aberto depois do with)
+    def abrir(self):
+        self.arquivo.seek(0)
+        return contextlib.nullcontext(self.arquivo)
+
+
+# CSV local; os do diretório monitorado já trazem a chave da versão processada
+class FonteLocal(FonteDados, os.PathLike):
+    def __init__(self, caminho, chave=None):
+        self.caminho = caminho
+        self.chave = chave
+        self.name = os.path.basename(caminho)
+
+    def __fspath__(self):
+        return self.caminho
+
+    def ler(self):
+        with open(self.caminho, 'rb') as arquivo:
+            return arquivo.read()
+
+    def abrir(self):
+        return open(self.caminho, 'rb')
+
+
+# CSV em um link. verificar() faz a requisição condicional: sem alterações desde a última versão, a chave é a da
+# versão já processada e nada é baixado
+class FonteHTTP(FonteDados):
+    def __init__(self, url, cliente):
+        self.url = url
+        self.name = url
+        self.cliente = cliente
+        self._dados = None
+
+    def verificar(self):
+        self.chave, self._dados, situacao = self.cliente.verificar(self.url)
+        return situacao
+
+    def ler(self):
+        if self._dados is None:
+            self._dados = self.cliente.baixar(self.url)
+        return self._dados
+
+
+# Monitora um diretório local em uma thread de fundo: CSVs novos ou alterados são processados (e gravados no cache
+# compartilhado e nos snapshots) fora das sessões, e só então a versão dos dados é incrementada. As sessões abertas
+# passam a usar a nova versão no próximo rerun, sem esperar pela leitura.
+class MonitorDiretorio:
+    def __init__(self, diretorio, intervalo):
+        self.diretorio = diretorio
+        self.intervalo = intervalo
+        self._arquivos = []  # FonteLocal da versão atual
+        self._estados = {}  # caminho -> (data de modificação, tamanho) da versão atual
+        self._versao = 0
+        self._atualizado_em = None
+        self._erros = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._executar, name="nupetr-monitor-dados", daemon=True)
+        self._thread.start()
+
+    def estado(self):
+        with self._lock:
+            return self._versao, list(self._arquivos), self._atualizado_em, list(self._erros)
+
+    def _listar(self):
+        estados = {}
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and entrada.name.lower().endswith('.csv'):
+                    info = entrada.stat()
+                    estados[entrada.path] = (info.st_mtime_ns, info.st_size)
+        return estados
+
+    def _executar(self):
+        anteriores = None
+        while True:
+            try:
+                estados = self._listar()
+                # Arquivos ainda sendo copiados mudam entre duas verificações: só processa quando a listagem se
+                # repete (ou na primeira verificação)
+                if estados != self._estados and (anteriores is None or estados == anteriores):
+                    self._ingerir(estados)
+                anteriores = estados
+            except Exception as erro:
+                # Qualquer falha fica registrada para o sidebar e a verificação continua: a thread não pode parar
+                with self._lock:
+                    self._erros = [f"{self.diretorio}: {erro}"]
+            time.sleep(self.intervalo)
+
+    def _ingerir(self, estados):
+        estados = dict(estados)
+        with self._lock:
+            atuais = {arquivo.caminho: arquivo for arquivo in self._arquivos}
+            estados_atuais = dict(self._estados)
+        arquivos, erros = [], []
+        for caminho in sorted(estados):
+            # Arquivo sem alteração (mesma data de modificação e tamanho): reaproveita a chave já calculada, sem
+            # ler o arquivo de novo; só os novos ou alterados têm o hash calculado
+            if caminho in atuais and estados_atuais.get(caminho) == estados[caminho]:
+                arquivos.append(atuais[caminho])
+                continue
+            try:
+                arquivos.append(FonteLocal(caminho, hash_fonte(caminho)))
+            except OSError as erro:
+                erros.append(f"{os.path.basename(caminho)}: {erro}")
+
+        # Arquivos ainda não processados são lidos ao mesmo tempo nos processos de leitura; os que não terminaram no
+        # tempo limite ficam fora desta versão (e do estado, para entrarem numa próxima verificação)
+        chaves = [arquivo.chave for arquivo in arquivos]
+        pendentes = arquivos_pendentes(arquivos, chaves)
+        em_andamento = set()
+        if len(pendentes) > 1:
+            situacoes = processar_em_paralelo([(arquivos[indice], chaves[indice]) for indice in pendentes])
+            em_andamento = {indice for indice, situacao in zip(pendentes, situacoes) if situacao == 'em andamento'}
+
+        prontos = []
+        for indice, arquivo in enumerate(arquivos):
+            if indice in em_andamento:
+                estados.pop(arquivo.caminho)
+                continue
+            try:
+                # Só prepara o snapshot (ou o lê, se já veio dos processos de leitura): as páginas carregam dele as
+                # colunas de que precisam
+                obter_base(arquivo, colunas=[])
+                prontos.append(arquivo)
+            except Exception as erro:
+                erros.append(f"{arquivo.name}: {erro}")
+        with self._lock:
+            self._arquivos = prontos
+            self._estados = estados
+            self._versao += 1
+            self._atualizado_em = datetime.now()
+            self._erros = erros
+
+
+# Respostas guardadas no banco, a partir do ano inicio (None = todo o histórico). Não é uma FonteDados: não tem
+# conteúdo bruto para ler ou abrir e é consultada direto por obter_dados.
+class FonteBanco:
+    def __init__(self, banco, inicio=None):
+        self.banco = banco
+        self.inicio = inicio
+        self.name = CAMINHO_BANCO
+
+
+# Cliente HTTP das fontes por link: reaproveita as conexões e guarda, por URL, o ETag/Last-Modified e a chave da
+# última versão baixada, para as requisições condicionais (uma planilha sem alterações custa só uma resposta 304).
+# Cada link é verificado no máximo a cada intervalo segundos.
+class ClienteHTTP:
+    def __init__(self, intervalo, sessao=None):
+        self.intervalo = intervalo
+        self.sessao = sessao or requests.Session()
+        self._estados = {}  # url -> (ETag, Last-Modified, chave, momento da verificação)
+        self._lock = threading.Lock()
+
+    def verificar(self, url):
+        with self._lock:
+            etag, modificado, chave, verificado_em = self._estados.get(url, (None, None, None, None))
+        if chave is not None and time.monotonic() - verificado_em < self.intervalo:
+            return chave, None, 'verificada há pouco'
+
+        cabecalhos = {}
+        if chave is not None and etag:
+            cabecalhos['If-None-Match'] = etag
+        if chave is not None and modificado:
+            cabecalhos['If-Modified-Since'] = modificado
+        resposta = self.sessao.get(url, headers=cabecalhos, timeout=TIMEOUT_HTTP_S)
+        if resposta.status_code == 304 and chave is not None:
+            dados, situacao = None, 'sem alterações'
+        else:
+            resposta.raise_for_status()
+            dados, situacao = resposta.content, 'baixada'
+            chave = hash_conteudo(dados)
+        with self._lock:
+            self._estados[url] = (
+                resposta.headers.get('ETag', etag), resposta.headers.get('Last-Modified', modificado), chave, time.monotonic(),
+            )
+        return chave, dados, situacao
+
+    def baixar(self, url):
+        resposta = self.sessao.get(url, timeout=TIMEOUT_HTTP_S)
+        resposta.raise_for_status()
+        return resposta.content
+
+
+# Nome de coluna entre aspas, para o SQL
+def nome_sql(coluna):
+    return '"' + coluna.replace('"', '""') + '"'
+
+
+# Banco SQLite com todas as respostas carregadas. Cada arquivo (pela chave do conteúdo) é gravado uma única vez; uma
+# resposta já existente (mesma chave de linha) é atualizada pela versão gravada por último. Respostas repetidas de um
+# mesmo arquivo (mesmas colunas de COLUNAS_CHAVE_LINHA) são mantidas, como na leitura dos arquivos: a chave de linha
+# inclui a ordem da ocorrência no arquivo. As colunas novas dos arquivos são acrescentadas à tabela e as de data são
+# guardadas como texto ISO, ordenável pelos índices.
+class BancoRespostas:
+    def __init__(self, caminho):
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("CREATE TABLE IF NOT EXISTS respostas (chave_linha INTEGER PRIMARY KEY)")
+            self._conexao.execute("CREATE TABLE IF NOT EXISTS cargas (chave TEXT PRIMARY KEY, linhas INTEGER, gravado_em TEXT)")
+
+    def _colunas(self):
+        return [linha[1] for linha in self._conexao.execute("PRAGMA table_info(respostas)") if linha[1] != 'chave_linha']
+
+    def versao(self):
+        with self._lock:
+            return self._conexao.execute("SELECT count(*) FROM cargas").fetchone()[0]
+
+    def gravado(self, chave):
+        with self._lock:
+            return self._conexao.execute("SELECT 1 FROM cargas WHERE chave = ?", (chave,)).fetchone() is not None
+
+    # Grava as respostas de uma carga a partir de blocos (DataFrames já normalizados), cada bloco em uma transação;
+    # a carga só é registrada depois do último. Uma carga interrompida é gravada de novo na próxima sincronização
+    # (as respostas já gravadas são apenas atualizadas).
+    def gravar(self, chave, blocos):
+        linhas = 0
+        # Ocorrências já gravadas de cada chave nesta carga, para numerar as repetidas entre blocos
+        ocorrencias = pd.Series(dtype='int64')
+        for df in blocos:
+            ocorrencias = self._gravar_bloco(df, ocorrencias)
+            linhas += len(df)
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO cargas VALUES (?, ?, ?)", (chave, linhas, datetime.now().strftime(FORMATO_DATA_BANCO))
+            )
+
+    # A primeira ocorrência de uma chave usa o próprio hash das colunas; as seguintes, o hash do par (hash, ocorrência).
+    # Devolve as ocorrências atualizadas com as do bloco.
+    def _gravar_bloco(self, df, ocorrencias):
+        colunas_chave = [coluna for coluna in COLUNAS_CHAVE_LINHA if coluna in df.columns]
+        chaves = pd.util.hash_pandas_object(df[colunas_chave], index=False).to_numpy()
+        ordem = pd.Series(chaves).groupby(chaves).cumcount().to_numpy() + ocorrencias.reindex(chaves, fill_value=0).to_numpy()
+        repetidas = pd.util.hash_pandas_object(pd.DataFrame({'chave': chaves, 'ordem': ordem}), index=False).to_numpy()
+        valores = [np.where(ordem == 0, chaves, repetidas).view(np.int64).tolist()]
+        for coluna in df.columns:
+            serie = df[coluna].dt.strftime(FORMATO_DATA_BANCO) if coluna in COLUNAS_DATA else df[coluna]
+            valores.append(serie.astype(object).where(serie.notna(), None).tolist())
+        nomes = [nome_sql(coluna) for coluna in df.columns]
+        comando = (
+            f"INSERT INTO respostas (chave_linha, {', '.join(nomes)}) VALUES ({', '.join(['?'] * (len(nomes) + 1))}) "
+            f"ON CONFLICT(chave_linha) DO UPDATE SET {', '.join(f'{nome} = excluded.{nome}' for nome in nomes)}"
+        )
+        with self._lock, self._conexao:
+            existentes = set(self._colunas())
+            for coluna in df.columns:
+                if coluna not in existentes:
+                    self._conexao.execute(f"ALTER TABLE respostas ADD COLUMN {nome_sql(coluna)}")
+            for indice, coluna in INDICES_BANCO.items():
+                if coluna in df.columns:
+                    self._conexao.execute(f"CREATE INDEX IF NOT EXISTS {indice} ON respostas ({nome_sql(coluna)})")
+            self._conexao.executemany(comando, zip(*valores))
+        return ocorrencias.add(pd.Series(chaves).value_counts(), fill_value=0).astype('int64')
+
+    # Anos com respostas, do primeiro ao último envio (mínimo e máximo lidos pelo índice das datas de envio)
+    def anos(self):
+        with self._lock:
+            if 'Carimbo de data/hora' not in self._colunas():
+                return []
+            primeiro, ultimo = self._conexao.execute(
+                f"SELECT min({nome_sql('Carimbo de data/hora')}), max({nome_sql('Carimbo de data/hora')}) FROM respostas"
+            ).fetchone()
+        return [] if primeiro is None else list(range(int(ultimo[:4]), int(primeiro[:4]) - 1, -1))
+
+    # Colunas pedidas das respostas enviadas a partir do ano inicio (busca por faixa no índice das datas de envio).
+    # O índice do DataFrame é a chave de linha, estável entre consultas.
+    def consultar(self, colunas=None, inicio=None):
+        with self._lock:
+            disponiveis = self._colunas()
+            selecionadas = [coluna for coluna in (disponiveis if colunas is None else colunas) if coluna in disponiveis]
+            comando = f"SELECT {', '.join(['chave_linha'] + [nome_sql(coluna) for coluna in selecionadas])} FROM respostas"
+            parametros = ()
+            if inicio is not None and 'Carimbo de data/hora' in disponiveis:
+                comando += f" WHERE {nome_sql('Carimbo de data/hora')} >= ?"
+                parametros = (f"{inicio}-01-01",)
+            if 'Carimbo de data/hora' in disponiveis:
+                comando += f" ORDER BY {nome_sql('Carimbo de data/hora')}"
+            df = pd.read_sql_query(comando, self._conexao, params=parametros, index_col='chave_linha')
+        df.index.name = None
+        for coluna in COLUNAS_DATA:
+            if coluna in df.columns:
+                df[coluna] = pd.to_datetime(df[coluna], format=FORMATO_DATA_BANCO).astype(TIPO_DATA)
+        df = aplicar_tipos(df)
+        df.attrs = {'colunas_disponiveis': disponiveis, 'banco': {'linhas': len(df), 'inicio': inicio}}
+        return df
+
+    # Envios não cancelados a partir do ano inicio, agrupados pelas colunas grupos no próprio banco (GROUP BY): a
+    # quantidade e, por coluna de COLUNAS_CONTEM_IT, quantos contêm a categoria. intervalos ({coluna de data: lista de
+    # intervalos [início, fim) em texto ISO}) restringe as datas, com a busca por faixa nos índices das datas; filtros
+    # ({coluna: valores}) restringe as demais colunas aos valores escolhidos. None deixa a coluna sem filtro.
+    def agregar(self, grupos, inicio=None, intervalos=None, filtros=None):
+        envio = nome_sql('Carimbo de data/hora')
+        with self._lock:
+            disponiveis = self._colunas()
+            colunas_it = [coluna for coluna in COLUNAS_CONTEM_IT.values() if coluna in disponiveis]
+            selecao = [nome_sql(coluna) for coluna in grupos] + ['count(*) AS "Quantidade"']
+            selecao += [f"total({nome_sql(coluna)}) AS {nome_sql(coluna)}" for coluna in colunas_it]
+            condicoes, parametros = [], []
+            if 'Envio_Cancelado' in disponiveis:
+                condicoes.append(f"NOT {nome_sql('Envio_Cancelado')}")
+            if inicio is not None:
+                condicoes.append(f"{envio} >= ?")
+                parametros.append(f"{inicio}-01-01")
+            for coluna, faixas in (intervalos or {}).items():
+                if faixas is None:
+                    continue
+                data = nome_sql(coluna)
+                condicoes.append("(" + " OR ".join([f"({data} >= ? AND {data} < ?)"] * len(faixas)) + ")" if faixas else "0")
+                parametros += [limite for faixa in faixas for limite in faixa]
+            for coluna, valores in (filtros or {}).items():
+                if valores is None:
+                    continue
+                # Valores ausentes do banco (ou de uma coluna que ele não tem) não selecionam nenhuma resposta
+                valores = [valor.item() if isinstance(valor, np.generic) else valor for valor in valores]
+                condicoes.append(f"{nome_sql(coluna)} IN ({', '.join(['?'] * len(valores))})" if valores and coluna in disponiveis else "0")
+                parametros += valores if valores and coluna in disponiveis else []
+            comando = f"SELECT {', '.join(selecao)} FROM respostas"
+            if condicoes:
+                comando += f" WHERE {' AND '.join(condicoes)}"
+            if grupos:
+                comando += f" GROUP BY {', '.join(nome_sql(coluna) for coluna in grupos)}"
+            df = pd.read_sql_query(comando, self._conexao, params=parametros)
+        df[colunas_it] = df[colunas_it].astype('int64')
+        if not grupos:
+            return df
+        # Só as colunas dos grupos recebem os tipos da base (as de Informação Técnica aqui são contagens)
+        df[grupos] = aplicar_tipos(df[grupos])
+        return df.sort_values(grupos, ignore_index=True)
+
+
+# Um único banco por processo, compartilhado entre as sessões (None quando não habilitado)
+@st.cache_resource
+def obter_banco():
+    return BancoRespostas(CAMINHO_BANCO) if CAMINHO_BANCO else None
+
+
+# Respostas de uma fonte em blocos de até LINHAS_POR_BLOCO linhas, já normalizadas, sem montar a base inteira em
+# memória: do snapshot (memory-map) quando a exportação já foi processada, senão direto do CSV
+def blocos_respostas(fonte, chave):
+    tabela, metadados = abrir_snapshot(chave)
+    if tabela is not None:
+        for inicio in range(0, tabela.num_rows, LINHAS_POR_BLOCO):
+            yield converter_snapshot(tabela.slice(inicio, LINHAS_POR_BLOCO), metadados)
+        return
+    with abrir_fonte(fonte) as arquivo:
+        codificacao = detectar_codificacao(arquivo)
+        for bloco in pd.read_csv(arquivo, encoding=codificacao, chunksize=LINHAS_POR_BLOCO):
+            yield aplicar_tipos(normalizar_dados(bloco))
+
+
+# Grava no banco as fontes ainda não gravadas e devolve a fonte do banco, com o período escolhido no Sidebar
+def sincronizar_banco(banco, fontes):
+    for fonte in fontes:
+        chave = getattr(fonte, 'chave', None) or hash_fonte(fonte)
+        # Com a versão da normalização na chave da carga, colunas derivadas novas também chegam às respostas já gravadas
+        carga = f"{chave}-{versao_esquema()}"
+        if not banco.gravado(carga):
+            banco.gravar(carga, blocos_respostas(fonte, chave))
+
+    anos = banco.anos()
+    if not anos:
+        return None
+    opcoes = ["Todo o histórico"] + anos
+    padrao = anos[0] - ANOS_BANCO_PADRAO + 1 if ANOS_BANCO_PADRAO > 0 else None
+    inicio = st.sidebar.selectbox("Carregar respostas a partir de:", opcoes, index=opcoes.index(padrao) if padrao in opcoes else 0)
+    return FonteBanco(banco, None if inicio == "Todo o histórico" else inicio)
+
+
+# Consulta ao banco, guardada no cache compartilhado até a próxima gravação
+def consultar_banco(fonte, colunas=None):
+    cache = obter_cache_datasets()
+    chave = hash_conteudo(f"banco|{fonte.banco.versao()}|{fonte.inicio}|{','.join(colunas or ['*'])}".encode('utf-8'))
+    df = cache.obter(chave)
+    if df is None:
+        df = fonte.banco.consultar(colunas, fonte.inicio)
+        df.attrs['versao_base'] = chave
+        cache.guardar(chave, df)
+    return df
+
+
+# Intervalos [início, fim) de datas de envio (texto ISO, comparável às datas do banco) das seleções dos filtros de
+# ano, mês e semana (as mesmas de IndiceFiltros.selecionar; None = "TODOS"), com os anos do banco quando só o mês é
+# escolhido. None quando nenhuma dessas dimensões é filtrada.
+def intervalos_envio(selecoes, anos_banco):
+    return intervalos_datas(*(selecoes.get(coluna) for coluna in COLUNAS_PERIODO_FILTROS), anos_banco)
+
+
+# Intervalos [início, fim) (texto ISO) dos anos, meses e semanas (chaves ano ISO * 100 + semana) escolhidos, o E entre
+# as dimensões; None quando nenhuma é escolhida
+def intervalos_datas(anos, meses, semanas, anos_banco):
+    if anos is None and meses is None and semanas is None:
+        return None
+    intervalos = [(date.min, date.max)]
+    if anos is not None or meses is not None:
+        intervalos = []
+        for ano in map(int, anos if anos is not None else anos_banco):
+            if meses is None:
+                intervalos.append((date(ano, 1, 1), date(ano + 1, 1, 1)))
+            else:
+                intervalos += [(date(ano, mes, 1), date(ano + mes // 12, mes % 12 + 1, 1)) for mes in map(int, meses)]
+    if semanas is not None:
+        inicios = [date.fromisocalendar(chave // 100, chave % 100, 1) for chave in semanas]
+        intervalos = [
+            (max(inicio, segunda), min(fim, segunda + timedelta(days=7)))
+            for inicio, fim in intervalos for segunda in inicios if max(inicio, segunda) < min(fim, segunda + timedelta(days=7))
+        ]
+    return [(inicio.isoformat(), fim.isoformat()) for inicio, fim in intervalos]
+
+
+# Intervalos [início, fim) (texto ISO) dos dias e dos meses (primeiro dia do mês) escolhidos nos resumos, os mesmos
+# de IndiceDatas.mascara_dias e IndiceDatas.mascara_meses
+def intervalos_dias(dias):
+    return [(dia.isoformat(), (dia + timedelta(days=1)).isoformat()) for dia in dias]
+
+
+def intervalos_meses(meses):
+    return [(mes.isoformat(), date(mes.year + mes.month // 12, mes.month % 12 + 1, 1).isoformat()) for mes in meses]
+
+
+# Envios não cancelados da seleção agrupados pelas colunas grupos, com a quantidade e as contagens de Informação
+# Técnica (COLUNAS_CONTEM_IT). Com as respostas no banco, é uma consulta agrupada (BancoRespostas.agregar) com as
+# seleções dos filtros (as de IndiceFiltros.selecionar: ano, mês e semana do envio, semanas de outras colunas de data
+# e valores das demais colunas) e os intervalos de datas dos resumos ({coluna: intervalos}, ver intervalos_dias),
+# guardada no cache compartilhado até a próxima gravação; senão, o groupby da seleção da página.
+def agregar_envios(fonte, df_selection, grupos, selecoes, intervalos=None):
+    if isinstance(fonte, FonteBanco):
+        intervalos = dict(intervalos or {})
+        filtros = {}
+        for coluna, valores in selecoes.items():
+            if valores is None or coluna in COLUNAS_PERIODO_FILTROS:
+                continue
+            if coluna in COLUNAS_DATA:
+                intervalos[coluna] = intervalos_datas(None, None, valores, [])
+            else:
+                filtros[coluna] = valores
+        envio = intervalos_envio(selecoes, fonte.banco.anos())
+        if envio is not None:
+            intervalos['Carimbo de data/hora'] = envio
+        cache = obter_cache_datasets()
+        selecao = sorted((coluna, sorted(map(str, valores))) for coluna, valores in selecoes.items() if valores is not None)
+        chave = hash_conteudo(
+            f"agregado|{fonte.banco.versao()}|{fonte.inicio}|{grupos}|{selecao}|{sorted(intervalos.items())}".encode('utf-8')
+        )
+        agregados = cache.obter(chave)
+        if agregados is None:
+            agregados = fonte.banco.agregar(grupos, fonte.inicio, intervalos, filtros)
+            cache.guardar(chave, agregados)
+        return agregados
+    colunas_it = list(COLUNAS_CONTEM_IT.values())
+    # Envios sem tipo de envio ficam num grupo próprio, como no GROUP BY
+    agrupado = df_selection[~df_selection['Envio_Cancelado']].groupby(grupos, observed=True, dropna=False)
+    return agrupado[colunas_it].sum().astype('int64').assign(Quantidade=agrupado.size()).reset_index()
+
+
+# Um único cliente HTTP, compartilhado entre as sessões
+@st.cache_resource
+def obter_cliente_http():
+    return ClienteHTTP(INTERVALO_HTTP_S)
+
+
+# Link de exportação em CSV de uma planilha do Google Sheets (outros links são usados como estão)
+def url_exportacao_csv(url):
+    planilha = re.match(r'https://docs\.google\.com/spreadsheets/d/([\w-]+)', url)
+    if planilha is None:
+        return url
+    aba = re.search(r'gid=(\d+)', url)
+    return f"https://docs.google.com/spreadsheets/d/{planilha.group(1)}/export?format=csv" + (f"&gid={aba.group(1)}" if aba else "")
+
+
+# Um único monitor por diretório, compartilhado entre as sessões
+@st.cache_resource
+def obter_monitor_diretorio(diretorio):
+    return MonitorDiretorio(diretorio, INTERVALO_MONITORAMENTO_S)
+
+
+# Arquivos da versão atual do diretório monitorado (None enquanto a primeira leitura não termina)
+def arquivos_diretorio_dados():
+    versao, arquivos, atualizado_em, erros = obter_monitor_diretorio(DIRETORIO_DADOS).estado()
+    for erro in erros:
+        st.sidebar.warning(f"Arquivo não carregado: {erro}")
+    if versao == 0:
+        st.sidebar.info(f"Processando os arquivos de {DIRETORIO_DADOS}; os dados aparecem na próxima atualização da página.")
+        return None
+    if st.session_state.get('versao_dados', versao) != versao:
+        st.toast("Dados atualizados a partir do diretório local.")
+    st.session_state['versao_dados'] = versao
+    st.sidebar.caption(f"Diretório {DIRETORIO_DADOS}: versão {versao} dos dados ({len(arquivos)} arquivos), de {atualizado_em:%d/%m/%Y %H:%M:%S}")
+    return arquivos or None
+
+
+# Conteúdo bruto da fonte como arquivo binário, para uso com with: arquivos locais são lidos aos poucos e arquivos
+# já em memória (upload) não são copiados
+def abrir_fonte(file_path):
+    if isinstance(file_path, FonteDados):
+        return file_path.abrir()
+    if isinstance(file_path, (str, os.PathLike)):
+        return open(file_path, 'rb')
+    file_path.seek(0)
+    return contextlib.nullcontext(file_path)
+
+
+# Hash do conteúdo usado como chave do cache (o mesmo arquivo reenviado gera a mesma chave)
+def hash_conteudo(dados):
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+# Mesmo hash de hash_conteudo, calculado lendo a fonte em blocos
+def hash_fonte(file_path):
+    resumo = hashlib.blake2b(digest_size=16)
+    with abrir_fonte(file_path) as arquivo:
+        for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_LEITURA), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+# Divide o CSV bruto em registros (cabeçalho + uma entrada por linha da planilha), sem fazer o parse.
+# Campos entre aspas com quebra de linha (respostas longas do formulário) continuam no mesmo registro.
+def dividir_registros(dados):
+    registros = []
+    pendente = None
+    for linha in dados.split(b'\n'):
+        aspas_impares = linha.count(b'"') % 2 == 1
+        if pendente is not None:
+            pendente += b'\n' + linha
+            if aspas_impares:
+                registros.append(pendente)
+                pendente = None
+        elif aspas_impares:
+            pendente = linha
+        elif linha.strip(b'\r'):
+            # Linhas em branco são ignoradas, como no read_csv
+            registros.append(linha)
+    if pendente is not None:
+        registros.append(pendente)
+    return registros
+
+
+# Assinatura (hash estável de 64 bits) de cada registro bruto, usada para identificar linhas novas ou alteradas
+def assinar_registros(registros):
+    return pd.util.hash_array(np.array(registros, dtype=object))
+
+
+# Detecta a codificação do CSV bruto (conteúdo ou arquivo binário, devolvido à posição inicial) sem fazer o parse:
+# valida o arquivo inteiro como utf-8, em blocos, parando no primeiro byte inválido. Um trecho em latin1 no fim do
+# arquivo é encontrado aqui, e não no meio do parse, que assim é feito uma única vez (ver processar_csv).
+def detectar_codificacao(dados):
+    arquivo = io.BytesIO(dados) if isinstance(dados, (bytes, bytearray)) else dados
+    inicio = arquivo.tell()
     try:
-        # Tenta carregar o arquivo com codificação utf-8
-        df = pd.read_csv(file_path, encoding='utf-8', dayfirst=True)
-    except UnicodeDecodeError:
-        # Em caso de erro de decodificação, tenta com latin1
-        df = pd.read_csv(file_path, encoding='latin1', dayfirst=True)
-    
-    # Verifica se a coluna "Carimbo de data/hora" existe e faz a conversão para datetime
+        if arquivo.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+            return 'utf-8-sig'
+        arquivo.seek(inicio)
+        # Um caractere dividido entre dois blocos fica pendente no decodificador até o bloco seguinte
+        decodificador = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_LEITURA), b''):
+                decodificador.decode(bloco)
+            decodificador.decode(b'', final=True)
+        except UnicodeDecodeError:
+            # Exportações antigas do formulário vêm em latin1
+            return 'latin1'
+        return 'utf-8'
+    finally:
+        arquivo.seek(inicio)
+
+
+# Faz a leitura e a conversão do CSV bruto para DataFrame (um único parse, na codificação detectada)
+def processar_csv(dados, codificacao=None):
+    if codificacao is None:
+        codificacao = detectar_codificacao(dados)
+    df = pd.read_csv(io.BytesIO(dados), encoding=codificacao)
+    # Codificação usada, exibida no sidebar
+    df.attrs['codificacao'] = codificacao
+
+    return aplicar_tipos(normalizar_dados(df))
+
+
+# Converte uma coluna de datas em texto: cada valor distinto é convertido uma única vez, testando os formatos de
+# FORMATOS_DATA em ordem, e o resultado é mapeado de volta para as linhas. Retorna as datas e quantos valores
+# preenchidos não correspondem a nenhum formato.
+def converter_datas(valores):
+    if pd.api.types.is_datetime64_any_dtype(valores):
+        return valores.astype(TIPO_DATA), 0
+
+    codigos, unicos = pd.factorize(valores)
+    unicos = pd.Series(unicos.astype(str)).str.strip()
+    datas = pd.Series(pd.NaT, index=unicos.index, dtype=TIPO_DATA)
+    for formato in FORMATOS_DATA:
+        pendentes = datas.isna()
+        if not pendentes.any():
+            break
+        datas[pendentes] = pd.to_datetime(unicos[pendentes], format=formato, errors='coerce').astype(TIPO_DATA)
+
+    # Código -1 (valor ausente) aponta para o NaT acrescentado ao final
+    convertidas = np.append(datas.to_numpy(), np.datetime64('NaT'))[codigos]
+    invalidas = int((np.isnat(convertidas) & (codigos >= 0)).sum())
+    return pd.Series(convertidas, index=valores.index, name=valores.name), invalidas
+
+
+# Etapas do pré-processamento. Cada uma recebe e devolve a base; todas calculam linha a linha, para valerem também
+# bloco a bloco (leitura em blocos) e só nas linhas novas (atualização incremental).
+
+# Converte as colunas de data; valores em formato não reconhecido ficam NaT e são contados
+def etapa_datas(df):
+    datas_invalidas = {}
+    for coluna in COLUNAS_DATA:
+        if coluna in df.columns:
+            df[coluna], datas_invalidas[coluna] = converter_datas(df[coluna])
+    df.attrs['datas_invalidas'] = datas_invalidas
+    return df
+
+
+# Mês, ano e semana (ISO) do envio e semana da revisão; 0 quando a data está ausente
+def etapa_periodos(df):
     if 'Carimbo de data/hora' in df.columns:
-        df['Carimbo de data/hora'] = pd.to_datetime(df['Carimbo de data/hora'], format="%d/%m/%Y %H:%M:%S", errors='coerce')
-    else:
+        envio = df['Carimbo de data/hora']
+        df['MÊS_envio'] = envio.dt.month.fillna(0).astype(TIPOS_COLUNAS['MÊS_envio'])
+        df['ANO_envio'] = envio.dt.year.fillna(0).astype(TIPOS_COLUNAS['ANO_envio'])
+        df['SEMANA_envio'] = envio.dt.isocalendar().week.fillna(0).astype(TIPOS_COLUNAS['SEMANA_envio'])
+    if 'Revisado em' in df.columns:
+        df['SEMANA_revisão'] = df['Revisado em'].dt.isocalendar().week.fillna(0).astype(TIPOS_COLUNAS['SEMANA_revisão'])
+    return df
+
+
+# Tipo de processo (sigla de SIGLAS_TIPO_PROCESSO) de cada número de processo, nesta ordem de precedência:
+#   1. a sigla logo após o TEC, em maiúsculas (ex.: 100746/2023-TEC/LP -> LP);
+#   2. senão, a primeira sigla da tabela encontrada no número (da esquerda para a direita) como palavra isolada,
+#      sem diferenciar maiúsculas (ex.: 100746/2023-TEC lo -> LO);
+#   3. senão, 'Outros'.
+# Cada número distinto é classificado uma única vez, com as expressões aplicadas pelo Arrow a todos de uma vez.
+def classificar_tipo_processo(numeros_processo):
+    valores = pa.array(numeros_processo.astype(TIPO_TEXTO), from_pandas=True)
+    codificados = pc.dictionary_encode(valores.combine_chunks() if isinstance(valores, pa.ChunkedArray) else valores)
+    unicos = codificados.dictionary
+
+    apos_tec = pc.struct_field(pc.extract_regex(unicos, PADRAO_SIGLA_APOS_TEC), [0])
+    tipos = pc.if_else(pc.is_in(apos_tec, value_set=pa.array(SIGLAS_TIPO_PROCESSO)), apos_tec, None).to_numpy(zero_copy_only=False)
+    pendentes = np.flatnonzero(pd.isna(tipos))
+    if len(pendentes):
+        avulsas = pc.struct_field(pc.extract_regex(unicos.take(pendentes), PADRAO_SIGLA_AVULSA), [0])
+        siglas = {sigla.upper(): sigla for sigla in SIGLAS_TIPO_PROCESSO}
+        tipos[pendentes] = pd.Series(pc.utf8_upper(avulsas).to_numpy(zero_copy_only=False)).map(siglas).to_numpy()
+
+    # Índice -1 (número ausente) aponta para o 'Outros' acrescentado ao final
+    tipos = np.append(pd.Series(tipos).fillna('Outros').to_numpy(dtype=object), 'Outros')
+    indices = pc.fill_null(codificados.indices, -1).to_numpy()
+    return pd.Series(tipos[indices], index=numeros_processo.index, name='Tipo de Processo')
+
+
+# Análise de números de processo distintos (texto): Codigo_Processo, tipo de processo e se traz a marca de reenvio
+def analisar_numeros_processo(numeros):
+    return pd.DataFrame({
+        'Codigo_Processo': extrair_codigo_processo(numeros).astype(TIPO_TEXTO).array,
+        'Tipo de Processo': classificar_tipo_processo(numeros).astype(TIPO_TEXTO).array,
+        'Reenvio_Processo': numeros.str.contains(PADRAO_REENVIO, regex=True).to_numpy(dtype=bool),
+    }, index=pd.Index(numeros, dtype=TIPO_TEXTO, name='Número'))
+
+
+# Memória persistente da análise dos números de processo (número -> Codigo_Processo, tipo, reenvio), gravada em
+# DIRETORIO_SNAPSHOTS com a versão das regras no nome do arquivo. Os mesmos números voltam em toda exportação
+# diária e em todo reenvio: só os nunca vistos passam pelas expressões regulares. Cada processo (inclusive os de
+# leitura em paralelo) relê o arquivo quando outro o atualizou e grava mesclando com o que está em disco; uma
+# entrada perdida numa gravação simultânea é apenas analisada de novo na próxima carga.
+class MemoProcessos:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._tabela = analisar_numeros_processo(pd.Series([], dtype=TIPO_TEXTO))
+        self._modificado = None
+        self._lock = threading.Lock()
+
+    # Relê o arquivo quando outro processo o atualizou; só a mescla com a tabela em memória é feita sob o lock
+    def _recarregar(self):
+        try:
+            modificado = os.stat(self.caminho).st_mtime_ns
+            if modificado == self._modificado:
+                return
+            em_disco = feather.read_table(self.caminho).to_pandas().set_index('Número')
+        except (OSError, KeyError, pa.ArrowException):
+            return
+        with self._lock:
+            self._tabela = pd.concat([em_disco, self._tabela[em_disco.index.get_indexer(self._tabela.index) < 0]])
+            self._modificado = modificado
+
+    # Acrescenta as análises ainda ausentes da tabela. A tabela nunca é alterada no lugar (cada mescla cria uma
+    # nova), então uma referência obtida sob o lock pode ser lida fora dele.
+    def _mesclar(self, novas):
+        with self._lock:
+            self._tabela = pd.concat([self._tabela, novas[self._tabela.index.get_indexer(novas.index) < 0]])
+
+    # Grava um arquivo temporário e o troca pelo atual (os.replace), fora do lock
+    def _gravar(self, tabela):
+        try:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            temporario = f"{self.caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            feather.write_feather(pa.Table.from_pandas(tabela.reset_index()), temporario, compression='uncompressed')
+            os.replace(temporario, self.caminho)
+            modificado = os.stat(self.caminho).st_mtime_ns
+        except (OSError, ValueError, pa.ArrowException):
+            return
+        with self._lock:
+            self._modificado = modificado
+
+    # Análise de cada número (alinhada ao índice de numeros); número ausente é tratado como texto vazio. As
+    # expressões regulares e a gravação rodam fora do lock.
+    def analisar(self, numeros):
+        codigos, unicos = pd.factorize(numeros.astype(TIPO_TEXTO).fillna(''))
+        unicos = pd.Index(unicos, dtype=TIPO_TEXTO)
+        self._recarregar()
+        with self._lock:
+            tabela = self._tabela
+        novos = tabela.index.get_indexer(unicos) < 0
+        if novos.any():
+            self._mesclar(analisar_numeros_processo(pd.Series(unicos[novos], dtype=TIPO_TEXTO)))
+            # A gravação mescla antes com o arquivo em disco, para não descartar o que outro processo gravou
+            self._recarregar()
+            with self._lock:
+                tabela = self._tabela
+            self._gravar(tabela)
+        return tabela.iloc[tabela.index.get_indexer(unicos)[codigos]].set_axis(numeros.index)
+
+
+# Arquivo da memória de números de processo para a versão atual das regras de análise
+def caminho_memo_processos():
+    partes = [PADRAO_SIGLA_APOS_TEC, PADRAO_SIGLA_AVULSA, PADRAO_REENVIO] + [
+        fonte_funcao(funcao) for funcao in [extrair_codigo_processo, classificar_tipo_processo, analisar_numeros_processo]
+    ]
+    versao = hashlib.blake2b('\n'.join(partes).encode('utf-8'), digest_size=6).hexdigest()
+    return os.path.join(DIRETORIO_SNAPSHOTS, f"processos-{versao}.feather")
+
+
+# Uma única memória por versão das regras, compartilhada entre as sessões
+@st.cache_resource
+def obter_memo_processos(caminho):
+    return MemoProcessos(caminho)
+
+
+# Codigo_Processo, tipo de processo e reenvio, consultados na memória de números de processo
+def etapa_numero_processo(df):
+    if COLUNA_PROCESSO in df.columns:
+        analise = obter_memo_processos(caminho_memo_processos()).analisar(df[COLUNA_PROCESSO])
+        for coluna in analise.columns:
+            df[coluna] = analise[coluna].astype(TIPOS_COLUNAS.get(coluna, TIPO_TEXTO))
+    return df
+
+
+# Envio cancelado: o padrão é verificado uma única vez por valor distinto do tipo de envio
+def etapa_cancelamento(df):
+    if 'Qual o tipo de envio?' in df.columns:
+        codigos, unicos = pd.factorize(df['Qual o tipo de envio?'])
+        cancelados = pd.Series(unicos, dtype=TIPO_TEXTO).str.contains(PADRAO_CANCELAMENTO, regex=True).to_numpy(dtype=bool)
+        # Código -1 (tipo de envio ausente) aponta para o False acrescentado ao final
+        df['Envio_Cancelado'] = np.append(cancelados, False)[codigos]
+    return df
+
+
+# Tipo de envio canônico: cada resposta distinta é comparada uma única vez com as respostas completas de TIPOS_ENVIO
+def etapa_tipo_envio(df):
+    if 'Qual o tipo de envio?' in df.columns:
+        codigos, unicos = pd.factorize(df['Qual o tipo de envio?'])
+        tipos_unicos = pd.Index(list(TIPOS_ENVIO.values())).get_indexer(pd.Index(unicos, dtype=TIPO_TEXTO))
+        # Resposta fora da lista vira 'Outros' (último código); resposta ausente (código -1) fica sem tipo
+        tipos_unicos[tipos_unicos < 0] = len(TIPOS_ENVIO)
+        tipos = pd.Categorical.from_codes(np.append(tipos_unicos, -1)[codigos], categories=list(TIPOS_ENVIO) + ['Outros'])
+        df['Tipo_Envio'] = pd.Series(tipos, index=df.index).astype(TIPO_ENVIO)
+    return df
+
+
+# Categorias de Informação Técnica, calculadas uma única vez por resposta distinta: uma coluna booleana por categoria
+# contida na resposta e Categoria_IT, a categoria igual à resposta (sem os espaços das pontas nem diferenciar
+# maiúsculas)
+def etapa_categoria_it(df):
+    if 'Informação Técnica' in df.columns:
+        codigos, unicos = pd.factorize(df['Informação Técnica'])
+        unicos = pd.Series(unicos, dtype=TIPO_TEXTO)
+        # Resposta ausente (código -1) usa o último elemento: nenhuma categoria
+        for categoria, coluna in COLUNAS_CONTEM_IT.items():
+            contem = unicos.str.contains(categoria, case=False, regex=False, na=False).to_numpy(dtype=bool)
+            df[coluna] = np.append(contem, False)[codigos]
+        iguais = pd.Index([categoria.upper() for categoria in CATEGORIAS_IT]).get_indexer(unicos.str.strip().str.upper())
+        categorias = pd.Categorical.from_codes(np.append(iguais, -1)[codigos], categories=CATEGORIAS_IT)
+        df['Categoria_IT'] = pd.Series(categorias, index=df.index).astype(TIPO_CATEGORIA_IT)
+    return df
+
+
+# Etapas, na ordem em que são executadas
+ETAPAS_PREPROCESSAMENTO = [
+    ('Datas', etapa_datas),
+    ('Número do processo', etapa_numero_processo),
+    ('Períodos', etapa_periodos),
+    ('Cancelamento', etapa_cancelamento),
+    ('Tipo de envio', etapa_tipo_envio),
+    ('Informação Técnica', etapa_categoria_it),
+]
+
+
+# Conversões e colunas derivadas calculadas uma única vez por base (e gravadas no snapshot), com o tempo de cada
+# etapa em segundos
+def normalizar_dados(df):
+    tempos = {}
+    for nome, etapa in ETAPAS_PREPROCESSAMENTO:
+        inicio = time.perf_counter()
+        df = etapa(df)
+        tempos[nome] = time.perf_counter() - inicio
+    df.attrs['tempos_preprocessamento'] = tempos
+    return df
+
+
+# Converte as colunas do formulário para os tipos de TIPOS_COLUNAS. Uma coluna que não se encaixa no tipo previsto
+# (ex.: ANO preenchido com texto) fica como foi lida.
+def aplicar_tipos(df):
+    for coluna, tipo in TIPOS_COLUNAS.items():
+        if coluna not in df.columns or df[coluna].dtype == tipo:
+            continue
+        if tipo in ('Int16', 'Int8') and not pd.api.types.is_numeric_dtype(df[coluna]):
+            continue
+        try:
+            df[coluna] = df[coluna].astype(tipo)
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+# Leitura em blocos para exportações muito grandes: cada bloco é normalizado e gravado no snapshot (Arrow/Feather)
+# à medida que é lido, acumulando apenas agregados (envios por mês). A base final é lida do snapshot via memory-map,
+# apenas com as colunas pedidas.
+def ingerir_em_blocos(fonte, codificacao, chave, colunas=None):
+    caminho = caminho_snapshot(chave)
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(DIRETORIO_SNAPSHOTS, exist_ok=True)
+
+    escritor = None
+    esquema = None
+    colunas_numericas = None
+    envios_por_mes = pd.Series(dtype='int64')
+    datas_invalidas = {}
+    tempos_preprocessamento = {}
+    total_linhas = 0
+    try:
+        # dtype=str mantém o mesmo esquema em todos os blocos; colunas numéricas são convertidas na leitura do snapshot
+        for bloco in pd.read_csv(fonte, encoding=codificacao, dtype=str, chunksize=LINHAS_POR_BLOCO):
+            if colunas_numericas is None:
+                colunas_numericas = [coluna for coluna in bloco.columns if coluna not in COLUNAS_DATA]
+            # Uma coluna só é numérica se todos os valores preenchidos, em todos os blocos, forem números
+            for coluna in list(colunas_numericas):
+                convertida = pd.to_numeric(bloco[coluna], errors='coerce')
+                if (convertida.isna() & bloco[coluna].notna()).any():
+                    colunas_numericas.remove(coluna)
+
+            bloco = normalizar_dados(bloco)
+            total_linhas += len(bloco)
+            for coluna, quantidade in bloco.attrs['datas_invalidas'].items():
+                datas_invalidas[coluna] = datas_invalidas.get(coluna, 0) + quantidade
+            for etapa, segundos in bloco.attrs['tempos_preprocessamento'].items():
+                tempos_preprocessamento[etapa] = tempos_preprocessamento.get(etapa, 0) + segundos
+            if 'Carimbo de data/hora' in bloco.columns:
+                meses = bloco['Carimbo de data/hora'].dt.strftime('%Y-%m').value_counts()
+                envios_por_mes = envios_por_mes.add(meses, fill_value=0)
+
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            if escritor is None:
+                # Colunas vazias no primeiro bloco viriam com tipo nulo; fixa como texto para os blocos seguintes
+                esquema = pa.schema([campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo for campo in tabela.schema])
+                escritor = pa.ipc.new_file(temporario, esquema)
+            escritor.write_table(tabela.cast(esquema))
+
+        if escritor is None:
+            return None
+        escritor.close()
+        escritor = None
+
+        # Metadados: codificação, colunas numéricas e agregados calculados durante a leitura
+        metadados = dict(esquema.metadata or {})
+        metadados[b'codificacao'] = codificacao.encode('utf-8')
+        metadados[b'datas_invalidas'] = json.dumps(datas_invalidas).encode('utf-8')
+        metadados[b'tempos_preprocessamento'] = json.dumps(tempos_preprocessamento).encode('utf-8')
+        metadados[b'colunas_numericas'] = json.dumps(colunas_numericas).encode('utf-8')
+        metadados[b'agregados'] = json.dumps({
+            'linhas': total_linhas,
+            'envios_por_mes': {mes: int(quantidade) for mes, quantidade in envios_por_mes.sort_index().items()},
+        }).encode('utf-8')
+        tabela = feather.read_table(temporario, memory_map=True).replace_schema_metadata(metadados)
+        feather.write_feather(tabela, f"{temporario}.final", compression='uncompressed')
+        os.replace(f"{temporario}.final", caminho)
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        return None
+    finally:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    return ler_snapshot(chave, colunas)[0]
+
+
+# Atualização incremental: compara os registros da nova exportação com os da última versão carregada do mesmo
+# arquivo e faz o parse/normalização apenas das linhas novas ou alteradas. Retorna None quando não compensa.
+def atualizar_incremental(base, assinaturas_base, registros, assinaturas, codificacao):
+    if base is None or assinaturas_base is None or len(assinaturas_base) != len(base) + 1:
+        return None
+    # Cabeçalho diferente (colunas do formulário mudaram): exige carga completa
+    if assinaturas_base[0] != assinaturas[0]:
+        return None
+
+    assinaturas_linhas_base = assinaturas_base[1:]
+    assinaturas_linhas = assinaturas[1:]
+
+    # Posição de cada linha da nova exportação na base anterior (-1 para linhas novas ou alteradas)
+    posicoes_base = pd.Series(np.arange(len(base)), index=assinaturas_linhas_base)
+    posicoes_base = posicoes_base[~posicoes_base.index.duplicated()]
+    posicao_na_base = posicoes_base.reindex(assinaturas_linhas).fillna(-1).to_numpy(dtype=np.int64)
+    linhas_novas = np.flatnonzero(posicao_na_base < 0)
+
+    if len(linhas_novas) > FRACAO_MAXIMA_INCREMENTAL * len(assinaturas_linhas):
+        return None
+
+    # Parse apenas do cabeçalho + linhas novas/alteradas
+    trecho = b'\n'.join([registros[0]] + [registros[i + 1] for i in linhas_novas])
+    novos = processar_csv(trecho, codificacao)
+    if len(novos) != len(linhas_novas) or list(novos.columns) != list(base.columns):
+        return None
+
+    # Mantém os tipos da base (um trecho pequeno pode ter colunas inteiramente vazias, lidas como float).
+    # Categóricos não são convertidos (valores novos ficariam fora das categorias) e são refeitos após juntar as linhas.
+    for coluna in base.columns:
+        if novos[coluna].dtype != base[coluna].dtype and not isinstance(base[coluna].dtype, pd.CategoricalDtype):
+            try:
+                novos[coluna] = novos[coluna].astype(base[coluna].dtype)
+            except (ValueError, TypeError):
+                pass
+
+    # Remonta a base na ordem da nova exportação; linhas que sumiram da planilha são descartadas
+    combinado = pd.concat([base, novos], ignore_index=True)
+    posicao_final = posicao_na_base.copy()
+    posicao_final[linhas_novas] = len(base) + np.arange(len(linhas_novas))
+    df = aplicar_tipos(combinado.iloc[posicao_final].reset_index(drop=True))
+    df.attrs['codificacao'] = codificacao
+    # Soma das datas não reconhecidas da base e das linhas novas (pode contar linhas que saíram da planilha)
+    df.attrs['datas_invalidas'] = {
+        coluna: base.attrs.get('datas_invalidas', {}).get(coluna, 0) + quantidade
+        for coluna, quantidade in novos.attrs.get('datas_invalidas', {}).items()
+    }
+    # Tempos do pré-processamento só das linhas novas
+    df.attrs['tempos_preprocessamento'] = novos.attrs.get('tempos_preprocessamento', {})
+
+    # Linhas cuja chave estável já existia foram alteradas (ex.: revisão preenchida depois); as demais são novas
+    colunas_chave = [coluna for coluna in COLUNAS_CHAVE_LINHA if coluna in df.columns]
+    chaves_base = pd.util.hash_pandas_object(base[colunas_chave], index=False)
+    chaves_novos = pd.util.hash_pandas_object(novos[colunas_chave], index=False)
+    alteradas = int(chaves_novos.isin(chaves_base).sum())
+    # Linhas da base ausentes na nova exportação, descontadas as que foram substituídas por uma versão alterada
+    removidas = max(len(base) - len(np.unique(posicao_na_base[posicao_na_base >= 0])) - alteradas, 0)
+    df.attrs['atualizacao'] = {'novas': len(novos) - alteradas, 'alteradas': alteradas, 'removidas': removidas}
+    return df
+
+
+# Código-fonte de uma função (ou o bytecode, quando o fonte não está disponível), para compor versões
+def fonte_funcao(funcao):
+    try:
+        return inspect.getsource(funcao)
+    except (OSError, TypeError):
+        return funcao.__code__.co_code.hex()
+
+
+# Identificador da versão da normalização: muda com VERSAO_ESQUEMA ou com o código das funções de extração,
+# invalidando snapshots gerados com regras antigas
+def versao_esquema():
+    partes = [str(VERSAO_ESQUEMA), ','.join(SIGLAS_TIPO_PROCESSO), PADRAO_CANCELAMENTO]
+    funcoes = [
+        normalizar_dados, converter_datas, aplicar_tipos, extrair_codigo_processo, classificar_tipo_processo,
+        analisar_numeros_processo,
+    ]
+    partes += [fonte_funcao(funcao) for funcao in funcoes + [etapa for _, etapa in ETAPAS_PREPROCESSAMENTO]]
+    return hashlib.blake2b('\n'.join(partes).encode('utf-8'), digest_size=6).hexdigest()
+
+
+# Caminho do snapshot de uma base, indexado pelo hash do conteúdo e pela versão da normalização
+def caminho_snapshot(chave):
+    return os.path.join(DIRETORIO_SNAPSHOTS, f"{chave}-{versao_esquema()}.feather")
+
+
+# Tabela do snapshot (arquivo mapeado em memória, sem cópia) e seus metadados; (None, None) se não existir ou estiver
+# corrompido
+def abrir_snapshot(chave):
+    caminho = caminho_snapshot(chave)
+    if not os.path.exists(caminho):
+        return None, None
+    try:
+        tabela = feather.read_table(caminho, memory_map=True)
+    except (OSError, pa.ArrowException):
+        return None, None
+    return tabela, tabela.schema.metadata or {}
+
+
+# Converte (parte de) uma tabela do snapshot para DataFrame com os tipos das colunas
+def converter_snapshot(tabela, metadados):
+    df = tabela.to_pandas()
+    # Snapshots gravados em blocos guardam tudo como texto; converte as colunas que são numéricas no arquivo todo
+    for coluna in json.loads(metadados.get(b'colunas_numericas', b'[]')):
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna])
+    return aplicar_tipos(df)
+
+
+# Lê o snapshot colunar mapeando o arquivo em memória; retorna (None, None) se não existir ou estiver corrompido.
+# Com colunas, converte para DataFrame apenas as colunas pedidas (as demais continuam só no arquivo).
+def ler_snapshot(chave, colunas=None):
+    tabela, metadados = abrir_snapshot(chave)
+    if tabela is None:
+        return None, None
+
+    colunas_disponiveis = tabela.column_names
+    if colunas is not None:
+        tabela = tabela.select([coluna for coluna in colunas_disponiveis if coluna in colunas])
+    df = converter_snapshot(tabela, metadados)
+    df.attrs['codificacao'] = metadados.get(b'codificacao', b'desconhecida').decode('utf-8')
+    df.attrs['datas_invalidas'] = json.loads(metadados.get(b'datas_invalidas', b'{}'))
+    df.attrs['tempos_preprocessamento'] = json.loads(metadados.get(b'tempos_preprocessamento', b'{}'))
+    # Todas as colunas da base, inclusive as que não foram carregadas
+    df.attrs['colunas_disponiveis'] = colunas_disponiveis
+    if b'agregados' in metadados:
+        agregados = json.loads(metadados[b'agregados'])
+        envios_por_mes = agregados['envios_por_mes']
+        df.attrs['leitura_em_blocos'] = {'linhas': agregados['linhas'], 'inicio': min(envios_por_mes, default=''), 'fim': max(envios_por_mes, default='')}
+
+    # Assinaturas das linhas (quando gravadas) permitem usar o snapshot como base de uma atualização incremental
+    try:
+        assinaturas = np.load(caminho_snapshot(chave).replace('.feather', '.assinaturas.npy'))
+    except (OSError, ValueError):
+        assinaturas = None
+    return df, assinaturas
+
+
+# Grava o snapshot sem compressão (permite memory-map na leitura); falhas apenas desativam o snapshot
+def gravar_snapshot(chave, df, assinaturas=None):
+    caminho = caminho_snapshot(chave)
+    try:
+        os.makedirs(DIRETORIO_SNAPSHOTS, exist_ok=True)
+        if assinaturas is not None:
+            np.save(caminho.replace('.feather', '.assinaturas.npy'), assinaturas)
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        metadados = dict(tabela.schema.metadata or {})
+        metadados[b'codificacao'] = df.attrs.get('codificacao', 'desconhecida').encode('utf-8')
+        metadados[b'datas_invalidas'] = json.dumps(df.attrs.get('datas_invalidas', {})).encode('utf-8')
+        metadados[b'tempos_preprocessamento'] = json.dumps(df.attrs.get('tempos_preprocessamento', {})).encode('utf-8')
+        tabela = tabela.replace_schema_metadata(metadados)
+
+        # Escreve em arquivo temporário e renomeia, para que outra sessão nunca leia um snapshot incompleto
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        feather.write_feather(tabela, temporario, compression='uncompressed')
+        os.replace(temporario, caminho)
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        return False
+    return True
+
+
+# Base em cache com (pelo menos) as colunas pedidas; colunas ainda não carregadas são lidas do snapshot e
+# anexadas à entrada do cache. Retorna None se a base não estiver no cache ou o snapshot não existir mais.
+def obter_colunas(cache, chave, colunas=None):
+    df, assinaturas = cache.obter_com_assinaturas(chave)
+    if df is None:
+        return None
+
+    colunas_disponiveis = df.attrs.get('colunas_disponiveis', list(df.columns))
+    faltantes = [coluna for coluna in colunas_disponiveis if coluna not in df.columns and (colunas is None or coluna in colunas)]
+    if faltantes:
+        extras, _ = ler_snapshot(chave, faltantes)
+        if extras is None:
+            return None
+        completo = pd.concat([df, extras], axis=1)
+        completo = completo[[coluna for coluna in colunas_disponiveis if coluna in completo.columns]]
+        completo.attrs = dict(df.attrs)
+        cache.guardar(chave, completo, assinaturas)
+        df = completo
+    return df
+
+
+# Processa um arquivo que não está no cache nem tem snapshot: leitura em blocos para exportações muito grandes,
+# atualização incremental quando há uma versão anterior do mesmo arquivo (base) ou parse completo. Grava o snapshot
+# e retorna (DataFrame, assinaturas das linhas).
+def processar_arquivo(fonte, chave, colunas=None, base=None, assinaturas_base=None):
+    with abrir_fonte(fonte) as arquivo:
+        if arquivo.seek(0, os.SEEK_END) > LIMITE_LEITURA_EM_BLOCOS_MB * 1024 * 1024:
+            # Exportação muito grande: leitura em blocos do próprio arquivo direto para o snapshot (sem atualização
+            # incremental), sem carregar o conteúdo bruto nem a base inteira em memória
+            arquivo.seek(0)
+            df = ingerir_em_blocos(arquivo, detectar_codificacao(arquivo), chave, colunas)
+            if df is not None:
+                return df, None
+        arquivo.seek(0)
+        dados = arquivo.read()
+
+    codificacao = detectar_codificacao(dados)
+    registros = dividir_registros(dados)
+    assinaturas = assinar_registros(registros)
+
+    # Nova versão de um arquivo já carregado: processa apenas as linhas novas ou alteradas
+    df = atualizar_incremental(base, assinaturas_base, registros, assinaturas, codificacao)
+    if df is None:
+        df = processar_csv(dados, codificacao)
+
+    # Sem alinhamento entre registros e linhas do DataFrame, a base não serve para atualizações incrementais
+    if len(assinaturas) != len(df) + 1:
+        assinaturas = None
+    gravar_snapshot(chave, df, assinaturas)
+    return df, assinaturas
+
+
+# Tarefa dos processos de leitura: processa o arquivo e grava apenas o snapshot. O servidor lê a base do snapshot
+# (memory-map), sem copiar o DataFrame entre os processos.
+def preparar_snapshot(fonte, chave):
+    processar_arquivo(fonte, chave, colunas=[])
+
+
+# Fonte que pode ser enviada a outro processo: arquivos locais são lidos pelo próprio processo de leitura; os demais
+# (upload, link) vão com o conteúdo bruto
+def fonte_para_processo(fonte):
+    if isinstance(fonte, (str, FonteLocal)):
+        return fonte
+    with abrir_fonte(fonte) as arquivo:
+        return io.BytesIO(arquivo.read())
+
+
+# Pool de processos de leitura, compartilhado entre as sessões. Os processos são iniciados com spawn (não herdam as
+# threads e os locks do servidor) e reaproveitados, pagando a importação do módulo uma única vez. Cada arquivo (pela
+# chave) tem no máximo uma leitura em andamento: uma sessão que pede o mesmo arquivo espera pela leitura já submetida.
+class LeituraParalela:
+    def __init__(self, processos, timeout):
+        self.processos = processos
+        self.timeout = timeout
+        self._executor = None
+        self._futuros = {}  # chave -> leitura submetida
+        self._lock = threading.Lock()
+
+    def _submeter(self, fonte, chave):
+        with self._lock:
+            futuro = self._futuros.get(chave)
+            if futuro is not None and not futuro.done():
+                return futuro
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processos, mp_context=multiprocessing.get_context('spawn'))
+            try:
+                futuro = self._executor.submit(preparar_snapshot, fonte, chave)
+            except BrokenProcessPool:
+                # Um processo de leitura terminou de forma abrupta: o próximo pedido cria um novo pool
+                self._executor = None
+                raise
+            self._futuros = {chave: futuro for chave, futuro in self._futuros.items() if not futuro.done()}
+            self._futuros[chave] = futuro
+            return futuro
+
+    # Situação de cada arquivo (fonte, chave): 'pronto' (snapshot gravado), 'falhou' (a obter_base o processa em
+    # seguida, em sequência) ou 'em andamento' (não terminou no tempo limite e continua no processo de leitura; não é
+    # processado de novo enquanto isso)
+    def processar(self, arquivos):
+        futuros = []
+        for fonte, chave in arquivos:
+            try:
+                futuros.append(self._submeter(fonte_para_processo(fonte), chave))
+            except (OSError, BrokenProcessPool):
+                futuros.append(None)
+        concluidos, _ = wait([futuro for futuro in futuros if futuro is not None], timeout=self.timeout)
+        situacoes = []
+        for futuro in futuros:
+            if futuro is None:
+                situacoes.append('falhou')
+            elif futuro not in concluidos:
+                situacoes.append('em andamento')
+            elif futuro.exception() is not None:
+                if isinstance(futuro.exception(), BrokenProcessPool):
+                    with self._lock:
+                        self._executor = None
+                situacoes.append('falhou')
+            else:
+                situacoes.append('pronto')
+        return situacoes
+
+
+@st.cache_resource
+def obter_leitura_paralela():
+    return LeituraParalela(MAX_PROCESSOS_LEITURA, TIMEOUT_LEITURA_PARALELA_S)
+
+
+# Posições dos arquivos que ainda precisam ser processados do zero: sem base no cache compartilhado nem snapshot e sem
+# versão anterior carregada da mesma origem (esta fica para a atualização incremental, em sequência)
+def arquivos_pendentes(arquivos, chaves):
+    cache = obter_cache_datasets()
+    return [
+        indice for indice, (arquivo, chave) in enumerate(zip(arquivos, chaves))
+        if cache.obter(chave) is None and not os.path.exists(caminho_snapshot(chave))
+        and cache.ultima_chave(getattr(arquivo, 'name', str(arquivo))) is None
+    ]
+
+
+# Prepara ao mesmo tempo, nos processos de leitura, os snapshots de vários arquivos (fonte, chave) ainda não
+# processados; retorna a situação de cada um (ver LeituraParalela.processar)
+def processar_em_paralelo(arquivos):
+    if min(MAX_PROCESSOS_LEITURA, len(arquivos)) < 2:
+        return ['falhou'] * len(arquivos)
+    return obter_leitura_paralela().processar(arquivos)
+
+
+# Base de um arquivo com (pelo menos) as colunas pedidas: cache em memória, snapshot ou processamento do CSV
+def obter_base(file_path, colunas=None, chave=None):
+    # Arquivos do diretório monitorado já trazem a chave da versão processada em segundo plano
+    chave = chave or getattr(file_path, 'chave', None) or hash_fonte(file_path)
+    origem = getattr(file_path, 'name', str(file_path))
+    cache = obter_cache_datasets()
+
+    df = obter_colunas(cache, chave, colunas)
+    if df is None:
+        # Mesma exportação já processada antes (outra sessão ou antes de reiniciar o servidor)
+        df, assinaturas = ler_snapshot(chave, colunas)
+        if df is None:
+            if getattr(file_path, 'chave', None):
+                # O arquivo monitorado pode ter mudado desde a última verificação
+                chave = hash_fonte(file_path)
+            chave_anterior = cache.ultima_chave(origem)
+            df, assinaturas = processar_arquivo(file_path, chave, colunas, obter_colunas(cache, chave_anterior), cache.obter_com_assinaturas(chave_anterior)[1])
+        df.attrs['versao_base'] = chave
+        cache.guardar(chave, df, assinaturas)
+    cache.registrar_origem(origem, chave)
+    return df
+
+
+# Junta as bases de vários arquivos (ex.: exportações anuais + planilha atual). Arquivos com colunas diferentes do
+# primeiro são ignorados com aviso. Uma resposta presente em mais de um arquivo (mesma chave de linha) fica só na
+# versão do arquivo mais recente, pela data do último envio.
+def combinar_arquivos(arquivos, colunas=None):
+    cache = obter_cache_datasets()
+    chaves = [getattr(arquivo, 'chave', None) or hash_fonte(arquivo) for arquivo in arquivos]
+    chave_combinada = hash_conteudo(('|'.join(chaves) + '|' + ','.join(colunas or ['*'])).encode('utf-8'))
+    df = cache.obter(chave_combinada)
+    if df is not None:
+        return df
+
+    # Arquivos ainda não processados são lidos em paralelo; os que têm versão anterior carregada ficam para a
+    # atualização incremental, em sequência. Os que passaram do tempo limite ficam de fora até terminarem.
+    colunas_base = None if colunas is None else list(colunas) + COLUNAS_CHAVE_LINHA
+    pendentes = arquivos_pendentes(arquivos, chaves)
+    em_andamento = set()
+    if len(pendentes) > 1:
+        situacoes = processar_em_paralelo([(arquivos[indice], chaves[indice]) for indice in pendentes])
+        em_andamento = {indice for indice, situacao in zip(pendentes, situacoes) if situacao == 'em andamento'}
+
+    bases, nomes, colunas_disponiveis = [], [], None
+    for indice, (arquivo, chave) in enumerate(zip(arquivos, chaves)):
+        nome = getattr(arquivo, 'name', os.path.basename(str(arquivo)))
+        if indice in em_andamento:
+            st.sidebar.warning(f"{nome}: ainda em processamento; o arquivo entra na base numa próxima atualização da página.")
+            continue
+        base = obter_base(arquivo, colunas_base, chave)
+        disponiveis = base.attrs.get('colunas_disponiveis', list(base.columns))
+        if colunas_disponiveis is None:
+            colunas_disponiveis = disponiveis
+        elif set(disponiveis) != set(colunas_disponiveis):
+            st.sidebar.warning(f"{nome}: colunas diferentes das do primeiro arquivo; arquivo ignorado.")
+            continue
+        if colunas_base is not None:
+            base = base[[coluna for coluna in base.columns if coluna in colunas_base]]
+        bases.append(base)
+        nomes.append(nome)
+
+    if not bases:
+        st.info("Os arquivos ainda estão sendo processados; atualize a página em instantes.")
+        st.stop()
+
+    # Do arquivo mais recente para o mais antigo: descarta as linhas cuja chave já apareceu em um arquivo mais recente
+    ordem = sorted(range(len(bases)), key=lambda indice: bases[indice]['Carimbo de data/hora'].max() if 'Carimbo de data/hora' in bases[indice] else pd.NaT)
+    colunas_chave = [coluna for coluna in COLUNAS_CHAVE_LINHA if all(coluna in base.columns for base in bases)]
+    vistas = np.array([], dtype=np.uint64)
+    partes = {}
+    for indice in reversed(ordem):
+        chaves_linhas = pd.util.hash_pandas_object(bases[indice][colunas_chave], index=False).to_numpy()
+        partes[indice] = bases[indice][~np.isin(chaves_linhas, vistas)]
+        vistas = np.union1d(vistas, chaves_linhas)
+
+    df = aplicar_tipos(pd.concat([partes[indice] for indice in ordem], ignore_index=True))
+    if colunas is not None:
+        df = df[[coluna for coluna in df.columns if coluna in colunas]]
+    df.attrs = {
+        'codificacao': ', '.join(sorted({base.attrs.get('codificacao', 'desconhecida') for base in bases})),
+        'colunas_disponiveis': colunas_disponiveis,
+        'datas_invalidas': {
+            coluna: sum(base.attrs.get('datas_invalidas', {}).get(coluna, 0) for base in bases) for coluna in COLUNAS_DATA
+        },
+        'tempos_preprocessamento': {
+            nome: sum(base.attrs.get('tempos_preprocessamento', {}).get(nome, 0) for base in bases) for nome, _ in ETAPAS_PREPROCESSAMENTO
+        },
+        'arquivos': {'nomes': nomes, 'linhas': len(df), 'repetidas': sum(len(base) for base in bases) - len(df)},
+        # Base parcial (arquivos ainda em processamento): sem versão, não é guardada nem indexada
+        'versao_base': None if em_andamento else chave_combinada,
+    }
+    if not em_andamento:
+        cache.guardar(chave_combinada, df)
+    return df
+
+
+# Base de um ou mais arquivos
+def obter_dados(file_path, colunas=None):
+    if isinstance(file_path, FonteBanco):
+        return consultar_banco(file_path, colunas)
+    arquivos = list(file_path) if isinstance(file_path, (list, tuple)) else [file_path]
+    if len(arquivos) == 1:
+        return obter_base(arquivos[0], colunas)
+    return combinar_arquivos(arquivos, colunas)
+
+
+# Função para carregar dados do arquivo CSV, ou de vários arquivos (apenas as colunas da página, quando informadas)
+def load_data(file_path, colunas=None):
+    if not file_path:
+        return None
+
+    df = obter_dados(file_path, colunas)
+
+    if 'Carimbo de data/hora' not in df.attrs.get('colunas_disponiveis', df.columns):
         st.warning("A coluna 'Carimbo de data/hora' não foi encontrada no arquivo.")
-    
+
+    if 'arquivos' in df.attrs:
+        arquivos = df.attrs['arquivos']
+        st.sidebar.caption(f"{len(arquivos['nomes'])} arquivos combinados: {arquivos['linhas']} linhas ({arquivos['repetidas']} repetidas removidas)")
+    if 'banco' in df.attrs:
+        banco = df.attrs['banco']
+        st.sidebar.caption(f"Banco de dados: {banco['linhas']} respostas" + (f" desde {banco['inicio']}" if banco['inicio'] else ""))
+    else:
+        st.sidebar.caption(f"Codificação detectada: {df.attrs.get('codificacao', 'desconhecida')}")
+    datas_invalidas = {coluna: quantidade for coluna, quantidade in df.attrs.get('datas_invalidas', {}).items() if quantidade}
+    if datas_invalidas:
+        st.sidebar.caption("Datas não reconhecidas: " + ", ".join(f"{coluna}: {quantidade}" for coluna, quantidade in datas_invalidas.items()))
+    tempos = df.attrs.get('tempos_preprocessamento', {})
+    if tempos:
+        st.sidebar.caption("Pré-processamento: " + ", ".join(f"{etapa} {segundos * 1000:.0f} ms" for etapa, segundos in tempos.items()))
+    if 'leitura_em_blocos' in df.attrs:
+        leitura = df.attrs['leitura_em_blocos']
+        st.sidebar.caption(f"Leitura em blocos: {leitura['linhas']} linhas, de {leitura['inicio']} a {leitura['fim']}")
+    if 'atualizacao' in df.attrs:
+        atualizacao = df.attrs['atualizacao']
+        st.sidebar.caption(f"Atualização incremental: {atualizacao['novas']} novas, {atualizacao['alteradas']} alteradas, {atualizacao['removidas']} removidas")
+
+    # Projeção nas colunas da página; cópia rasa: com copy-on-write, alterações feitas pelas páginas não chegam à
+    # base compartilhada
+    colunas_disponiveis = df.attrs.get('colunas_disponiveis', list(df.columns))
+    if colunas is not None:
+        df = df[[coluna for coluna in df.columns if coluna in colunas]]
+    df = df.copy(deep=False)
+    df.attrs['colunas_disponiveis'] = colunas_disponiveis
     return df
 
 
+# Colunas disponíveis para "Crie sua Tabela": as da página e, em seguida, as demais colunas da base
+def colunas_para_tabela(df):
+    return list(df.columns) + [coluna for coluna in df.attrs.get('colunas_disponiveis', []) if coluna not in df.columns]
+
+
+# Anexa à seleção da página as colunas escolhidas em "Crie sua Tabela" que ficaram fora da projeção,
+# carregando-as só nesse momento (alinhadas pelo índice das linhas da base)
+def anexar_colunas(file_path, df, colunas):
+    faltantes = [coluna for coluna in colunas if coluna not in df.columns]
+    if not faltantes:
+        return df
+    base = obter_dados(file_path, faltantes)
+    return df.join(base[[coluna for coluna in faltantes if coluna in base.columns]])
+
+
 # Página selecionada pelo usuário
 def main():
     paginaSelecionada = st.selectbox("Selecione a página:", ["Visão Global - NUPETR", "Visão - Analista", "Visão - Revisão", "Resumo de Envios", "Resumo de Revisões", "Análise dos Tempos e Estatísticas", ])
@@ -112,65 +1867,320 @@ def main():
     elif paginaSelecionada == "Análise dos Tempos e Estatísticas":
         analise_tempos()
 
+# Contagem de valores sem os que não aparecem na seleção (em colunas categóricas o value_counts lista todas as
+# categorias, inclusive com contagem zero)
+def contar_valores(serie):
+    contagem = serie.value_counts()
+    return contagem[contagem > 0]
+
+# Domingo de Páscoa do ano (algoritmo de Meeus/Jones/Butcher, calendário gregoriano)
+def domingo_de_pascoa(ano):
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return np.datetime64(f'{ano}-{mes:02d}-{dia + 1:02d}')
+
+
+# Feriados dos anos de ano_inicial a ano_final (ver FERIADOS_FIXOS), em ordem
+def feriados(ano_inicial, ano_final):
+    datas = list(FERIADOS_AVULSOS)
+    for ano in range(ano_inicial, ano_final + 1):
+        datas += [f'{ano}-{dia}' for dia, desde in FERIADOS_FIXOS.items() if ano >= desde]
+        pascoa = domingo_de_pascoa(ano)
+        datas += [pascoa + np.timedelta64(dias, 'D') for dias in FERIADOS_MOVEIS]
+    return np.unique(np.array(datas, dtype='datetime64[D]'))
+
+
+# Dimensão de calendário: uma linha por dia dos anos de ano_inicial a ano_final, com ano e semana ISO (a mesma
+# numeração de SEMANA_envio/SEMANA_revisão) e a chave da semana (ano ISO * 100 + semana). Uma data da base é
+# localizada pela distância em dias até o primeiro dia. Em tabela_semanas, uma linha por chave de semana com o
+# início (segunda), o fim (domingo) e os rótulos usados nos seletores e nos eixos dos gráficos. Os dias úteis
+# excluem sábados, domingos e os feriados do período.
+class Calendario:
+    def __init__(self, ano_inicial, ano_final):
+        dias = pd.date_range(f'{ano_inicial}-01-01', f'{ano_final}-12-31', freq='D')
+        self.feriados = feriados(ano_inicial, ano_final)
+        self.calendario_util = np.busdaycalendar(holidays=self.feriados)
+        iso = dias.isocalendar()
+        self.dias = dias.to_numpy().astype('datetime64[D]')
+        self.chaves_semana = iso['year'].to_numpy(dtype=np.int32) * 100 + iso['week'].to_numpy(dtype=np.int32)
+        self.inicios_semana = self.dias - dias.weekday.to_numpy()
+
+        primeiros = np.flatnonzero(np.diff(self.chaves_semana, prepend=0))
+        inicios = pd.DatetimeIndex(self.inicios_semana[primeiros])
+        fins = inicios + pd.Timedelta(days=6)
+        semanas = pd.Index(self.chaves_semana[primeiros] % 100)
+        self.tabela_semanas = pd.DataFrame({
+            'ANO_ISO': self.chaves_semana[primeiros] // 100,
+            'SEMANA': semanas,
+            'INICIO': inicios,
+            'FIM': fins,
+            'ROTULO': "Semana " + semanas.astype(str) + " - " + inicios.strftime('%d/%m/%y') + " a " + fins.strftime('%d/%m/%y'),
+            'ROTULO_CURTO': "S" + semanas.astype(str) + "-" + np.array(MESES_ABREVIADOS, dtype=object)[inicios.month - 1] + inicios.strftime('-%y'),
+        }, index=pd.Index(self.chaves_semana[primeiros], name='CHAVE_SEMANA'))
+
+    # Posição de cada data no calendário (-1 para data ausente ou fora dos anos do calendário)
+    def posicoes(self, datas):
+        posicoes = (datas.to_numpy(dtype=TIPO_DATA).astype('datetime64[D]') - self.dias[0]).astype(np.int64)
+        posicoes[(posicoes < 0) | (posicoes >= len(self.dias))] = -1
+        return posicoes
+
+    # Chave da semana de cada data (0 para data ausente)
+    def chave_semana(self, datas):
+        posicoes = self.posicoes(datas)
+        return np.where(posicoes >= 0, self.chaves_semana[posicoes], 0)
+
+    # Dias úteis de cada início até o fim correspondente (o dia do início conta, o do fim não); negativo quando o fim
+    # é anterior ao início
+    def dias_uteis(self, inicios, fins):
+        return np.busday_count(inicios, fins, busdaycal=self.calendario_util)
+
+    # Semanas das chaves informadas, como (ano ISO, semana, rótulo), da mais recente para a mais antiga
+    def semanas(self, chaves):
+        chaves = np.unique(chaves)
+        tabela = self.tabela_semanas.loc[chaves[chaves > 0][::-1]]
+        return list(zip(tabela['ANO_ISO'].tolist(), tabela['SEMANA'].tolist(), tabela['ROTULO'].tolist()))
+
+
+# Um calendário por intervalo de anos, compartilhado entre reruns e sessões
+@st.cache_resource(max_entries=16)
+def obter_calendario(ano_inicial, ano_final):
+    return Calendario(ano_inicial, ano_final)
+
+
+# Calendário que cobre todos os anos das datas informadas, de uma ou mais colunas (sem datas válidas, o ano atual)
+def calendario_das_datas(*colunas):
+    extremos = [data for datas in colunas for data in (datas.min(), datas.max()) if pd.notna(data)] or [pd.Timestamp.now()]
+    return obter_calendario(min(extremos).year, max(extremos).year)
+
+
+# Tempo do envio até a revisão (ambos preenchidos), pelas datas sem horário: (dias corridos, dias úteis), negativos
+# quando a revisão tem data anterior à do envio
+def calcular_prazos(envios, revisoes):
+    inicios = envios.to_numpy(dtype=TIPO_DATA).astype('datetime64[D]')
+    fins = revisoes.to_numpy(dtype=TIPO_DATA).astype('datetime64[D]')
+    corridos = (fins - inicios).astype(np.int64)
+    return corridos, calendario_das_datas(envios, revisoes).dias_uteis(inicios, fins)
+
+
+# Chaves inteiras do início da semana (segunda, em dias desde 1970-01-01, que foi uma quinta) e do início do mês (em
+# meses desde 1970-01) de cada data preenchida, calculadas sobre o datetime64 sem criar um Period por linha
+def chaves_semana_mes(datas):
+    valores = datas.to_numpy(dtype=TIPO_DATA)
+    dias = valores.astype('datetime64[D]').astype(np.int64)
+    return dias - (dias + 3) % 7, valores.astype('datetime64[M]').astype(np.int64)
+
+
+# Rótulos das chaves de período ('D' para as chaves de semana, 'M' para as de mês), formatados uma vez por período
+def rotulos_periodos(chaves, unidade, formato):
+    return pd.DatetimeIndex(np.asarray(chaves).astype(f'datetime64[{unidade}]')).strftime(formato)
+
+
+# Semanas com datas na coluna, com o intervalo de datas no rótulo, para os seletores de semana
+def semanas_disponiveis(df, coluna):
+    calendario = calendario_das_datas(df[coluna])
+    return calendario.semanas(calendario.chave_semana(df[coluna]))
+
+
+# Chaves (ano ISO * 100 + semana) das semanas escolhidas nos seletores, ignorando a opção "TODOS"
+def chaves_semanas(semanas):
+    return [ano * 100 + semana for ano, semana, _ in (s for s in semanas if isinstance(s, tuple))]
+
+
+# Índice dos filtros de uma versão da base (já sem os envios cancelados): para cada dimensão filtrável, as posições
+# das linhas agrupadas por valor. A dimensão é uma coluna da base ou, para as colunas de data, a chave da semana ISO
+# (ver chaves_semanas). Cada dimensão é indexada na primeira vez em que é filtrada e reaproveitada nos reruns
+# seguintes. Uma seleção junta as linhas dos valores escolhidos dentro da dimensão e faz o E entre as dimensões sobre
+# bitmaps compactados (np.packbits); as linhas são extraídas uma única vez, no final. Dimensões e seleções resolvidas
+# ficam num LRU limitado pelo tamanho em bytes.
+class IndiceFiltros:
+    def __init__(self, linhas, limite_bytes):
+        self.linhas = linhas
+        self.limite_bytes = limite_bytes
+        # ('dimensao', coluna) -> (valores, posições agrupadas, início de cada valor) e ('selecao', seleção canônica)
+        # -> bitmap das linhas selecionadas, com o tamanho em bytes
+        self._itens = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _obter(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def _guardar(self, chave, valor, tamanho):
+        with self._lock:
+            if chave in self._itens:
+                self._total_bytes -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, tamanho)
+            self._total_bytes += tamanho
+            # Remove os itens usados há mais tempo até respeitar o limite (mantém sempre o mais recente)
+            while self._total_bytes > self.limite_bytes and len(self._itens) > 1:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self._total_bytes -= tamanho_removido
+
+    # Uma única passada pelos códigos do factorize: a ordenação estável deixa as linhas de cada valor contíguas (e em
+    # ordem crescente) em posicoes[inicios[código]:inicios[código + 1]]
+    def _dimensao(self, df, coluna):
+        dimensao = self._obter(('dimensao', coluna))
+        if dimensao is None:
+            if coluna in COLUNAS_DATA:
+                chaves = calendario_das_datas(df[coluna]).chave_semana(df[coluna])
+            else:
+                chaves = df[coluna]
+            codigos, valores = pd.factorize(chaves, use_na_sentinel=False)
+            # Códigos e posições no menor tipo inteiro possível (a ordenação estável de inteiros pequenos é linear)
+            codigos = codigos.astype(np.min_scalar_type(max(len(valores) - 1, 0)))
+            posicoes = np.argsort(codigos, kind='stable').astype(np.min_scalar_type(max(self.linhas - 1, 0)))
+            inicios = np.concatenate([[0], np.cumsum(np.bincount(codigos, minlength=len(valores)))])
+            dimensao = (pd.Index(valores), posicoes, inicios)
+            self._guardar(('dimensao', coluna), dimensao, posicoes.nbytes + inicios.nbytes + int(dimensao[0].memory_usage(deep=True)))
+        return dimensao
+
+    # Bitmap compactado das linhas com algum dos valores escolhidos na dimensão
+    def _bitmap(self, df, coluna, escolhidos):
+        valores, posicoes, inicios = self._dimensao(df, coluna)
+        linhas = np.zeros(self.linhas, dtype=bool)
+        for codigo in valores.get_indexer(list(escolhidos)):
+            if codigo >= 0:
+                linhas[posicoes[inicios[codigo]:inicios[codigo + 1]]] = True
+        return np.packbits(linhas)
+
+    # Máscara booleana das linhas que atendem às seleções ({coluna: valores escolhidos}); None deixa a dimensão de
+    # fora (opção "TODOS") e valores ausentes da base não selecionam nenhuma linha. O resultado fica guardado sob a
+    # forma canônica da seleção (sem as dimensões de fora e sem depender da ordem das colunas e dos valores), e a
+    # mesma seleção feita em outra página ou em outro rerun não é recalculada.
+    def mascara(self, df, selecoes):
+        chave = tuple(sorted((coluna, tuple(sorted(set(map(str, escolhidos)))))
+                             for coluna, escolhidos in selecoes.items() if escolhidos is not None))
+        if not chave:
+            return np.ones(self.linhas, dtype=bool)
+        combinado = self._obter(('selecao', chave))
+        if combinado is None:
+            for coluna, escolhidos in selecoes.items():
+                if escolhidos is None:
+                    continue
+                bitmap = self._bitmap(df, coluna, escolhidos)
+                combinado = bitmap if combinado is None else combinado & bitmap
+            self._guardar(('selecao', chave), combinado, combinado.nbytes)
+        return np.unpackbits(combinado, count=self.linhas).astype(bool)
+
+    # Linhas de df que atendem às seleções (o próprio df quando todas as dimensões estão em "TODOS")
+    def selecionar(self, df, selecoes):
+        if all(escolhidos is None for escolhidos in selecoes.values()):
+            return df
+        return df[self.mascara(df, selecoes)]
+
+
+# Índice dos filtros de cada versão da base, compartilhado entre reruns, páginas e sessões
+@st.cache_resource(max_entries=8)
+def obter_indice_filtros(versao_base, linhas):
+    return IndiceFiltros(linhas, LIMITE_INDICE_FILTROS_MB * 1024 * 1024)
+
+
+def indice_filtros(df):
+    versao_base = df.attrs.get('versao_base')
+    if versao_base is None:
+        return IndiceFiltros(len(df), LIMITE_INDICE_FILTROS_MB * 1024 * 1024)
+    return obter_indice_filtros(versao_base, len(df))
+
+
+# Índice ordenado de uma coluna de data de uma versão da base (já sem os envios cancelados): as posições das linhas
+# com data, na ordem das datas. Um dia ou um mês selecionado é um intervalo [início, fim) localizado com searchsorted,
+# sem converter as datas de cada linha em date/Period. Os dias e os meses com dados, do mais recente ao mais antigo,
+# ficam prontos para as opções dos seletores.
+class IndiceDatas:
+    def __init__(self, datas):
+        valores = datas.to_numpy(dtype=TIPO_DATA)
+        validas = np.flatnonzero(~np.isnat(valores))
+        self.linhas = len(valores)
+        self.ordem = validas[np.argsort(valores[validas], kind='stable')]
+        self.datas = valores[self.ordem]
+        self.dias = np.unique(self.datas.astype('datetime64[D]'))[::-1].tolist()
+        self.meses = np.unique(self.datas.astype('datetime64[M]'))[::-1].tolist()
+
+    # Máscara booleana das linhas com data em algum dos intervalos [inicios, fins)
+    def _mascara(self, inicios, fins):
+        mascara = np.zeros(self.linhas, dtype=bool)
+        primeiras = np.searchsorted(self.datas, inicios.astype(self.datas.dtype))
+        ultimas = np.searchsorted(self.datas, fins.astype(self.datas.dtype))
+        for primeira, ultima in zip(primeiras, ultimas):
+            mascara[self.ordem[primeira:ultima]] = True
+        return mascara
+
+    # Linhas com data nos dias escolhidos (datetime.date, como em self.dias)
+    def mascara_dias(self, dias):
+        dias = np.array(dias, dtype='datetime64[D]')
+        return self._mascara(dias, dias + 1)
+
+    # Linhas com data nos meses escolhidos (primeiro dia do mês, como em self.meses)
+    def mascara_meses(self, meses):
+        meses = np.array(meses, dtype='datetime64[M]')
+        return self._mascara(meses, meses + 1)
+
+
+# Índice de datas de cada coluna de cada versão da base, compartilhado entre reruns e sessões
+@st.cache_resource(max_entries=16)
+def obter_indice_datas(versao_base, linhas, coluna, _datas):
+    return IndiceDatas(_datas)
+
+
+def indice_datas(df, coluna):
+    versao_base = df.attrs.get('versao_base')
+    return IndiceDatas(df[coluna]) if versao_base is None else obter_indice_datas(versao_base, len(df), coluna, df[coluna])
+
+
+# Ficha de texto de uma opção dos filtros compartilhados: "TODOS" para a opção de não filtrar ("TODOS", "Todos" ou a
+# semana ("Todos", "Todos", "Todos")), a chave ano ISO * 100 + semana para as semanas e o próprio valor para as demais
+def ficha_filtro(opcao):
+    if isinstance(opcao, tuple):
+        return "TODOS" if opcao[0] == "Todos" else str(opcao[0] * 100 + opcao[1])
+    return "TODOS" if opcao in ("TODOS", "Todos") else str(opcao)
+
+
+# Multiselect de um filtro compartilhado entre as páginas (nome: 'ano', 'mes', 'semana' ou 'it'). A seleção fica na
+# sessão e nos parâmetros da URL (ex.: ?ano=2026&mes=10&semana=202642) como fichas (ver ficha_filtro), e cada página a
+# traduz para as suas opções ao ser aberta; sem seleção anterior que exista nas opções da página, vale o padrão.
+def filtro_compartilhado(nome, pagina, area, rotulo, opcoes, padrao, **kwargs):
+    filtros = st.session_state.setdefault('filtros', {})
+    chave = f'filtro_{nome}_{pagina}'
+    if chave in st.session_state:
+        # Remove opções que deixaram de existir (nova versão dos dados)
+        validas = [opcao for opcao in st.session_state[chave] if opcao in opcoes]
+        if len(validas) != len(st.session_state[chave]):
+            st.session_state[chave] = validas
+    else:
+        fichas = filtros.get(nome, st.query_params.get_all(nome))
+        st.session_state[chave] = [opcao for opcao in opcoes if ficha_filtro(opcao) in fichas] or list(padrao)
+    selecao = area.multiselect(rotulo, options=opcoes, key=chave, **kwargs)
+    filtros[nome] = [ficha_filtro(opcao) for opcao in selecao]
+    st.query_params[nome] = filtros[nome]
+    return selecao
+
+
 # Função para formatar a exibição da semana com intervalo de datas dos envios
 def formatar_semanas(df):
-    semanas_disponiveis_envio = []
-    for ano in sorted(df['ANO_envio'].unique(), reverse=True):
-        if ano == 0:
-            continue  # Ignora ano 0
-        for semana in sorted(df[df['ANO_envio'] == ano]['SEMANA_envio'].unique(), reverse=True):
-            if semana == 0:
-                continue  # Ignora semana 0
-            inicio_semana = datetime.strptime(f'{int(ano)}-W{int(semana)}-1', "%Y-W%W-%w")
-            fim_semana = inicio_semana + timedelta(days=6)
-            semanas_disponiveis_envio.append(
-                (int(ano), int(semana), f"Semana {int(semana)} - {inicio_semana.strftime('%d/%m/%y')} a {fim_semana.strftime('%d/%m/%y')}")
-            )
-    return semanas_disponiveis_envio
+    return semanas_disponiveis(df, 'Carimbo de data/hora')
 
 # Função para formatar a exibição da semana com intervalo de datas das revisões
 def formatar_semanas_revisão(df):
-    semanas_disponiveis_revisão = []
-    
-    # Filtra apenas valores válidos para ANO
-    anos_validos = pd.to_numeric(df['ANO'], errors='coerce').dropna().astype(int).unique()
-    
-    for ano in sorted(anos_validos, reverse=True):
-        if ano == 0:
-            continue  # Ignora ano 0
-        for semana in sorted(df[(df['ANO'].notna()) & (df['ANO'] == ano)]['SEMANA_revisão'].dropna().unique(), reverse=True):
-            if semana > 0:
-                try:
-                    inicio_semana = datetime.strptime(f'{int(ano)}-W{int(semana)}-1', "%Y-W%W-%w")
-                    fim_semana = inicio_semana + timedelta(days=6)
-                    semanas_disponiveis_revisão.append(
-                        (int(ano), int(semana), f"Semana {int(semana)} - {inicio_semana.strftime('%d/%m/%y')} a {fim_semana.strftime('%d/%m/%y')}")
-                    )
-                except ValueError:
-                    st.warning(f"A semana {semana} do ano {ano} é inválida e foi ignorada.")
-    return semanas_disponiveis_revisão
-
-# Função aprimorada para extrair o tipo de processo
-def extrair_tipo_processo(numero_processo):
-    # Lista das siglas reconhecidas
-    siglas_reconhecidas = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']
-    match = re.search(r'TEC[-]*([A-Z]{2,3})', numero_processo, re.IGNORECASE)
-    if match:
-        sigla = match.group(1).upper()
-        if sigla in siglas_reconhecidas:
-            return sigla
-    for sigla in siglas_reconhecidas:
-        if re.search(rf'\b{sigla}\b', numero_processo, re.IGNORECASE):
-            return sigla
-    return 'Outros'
-
+    return semanas_disponiveis(df, 'Revisado em')
 
 # Função para criar a visão global
 def visao_global():
     
     if uploaded_file is not None:
         # Carrega os dados do arquivo
-        df = load_data(uploaded_file)
+        df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Visão Global - NUPETR"])
 
         st.markdown(
             "<h1 style='text-align: center; color: #98FF98; font-size: 42px; font-weight: bold; text-decoration: underline;'>Visão Global - NUPETR</h1>",
@@ -178,14 +2188,9 @@ def visao_global():
         )
 
         # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'\bcancel(ad|ar)\b', case=False, na=False)]
+        df = df[~df['Envio_Cancelado']]
 
         if df is not None and not df.empty:
-            # Convertendo valores de ano, mês e semana, tratando valores ausentes
-            df['MÊS_envio'] = df['Carimbo de data/hora'].dt.month.fillna(0).astype(int)
-            df['ANO_envio'] = df['Carimbo de data/hora'].dt.year.fillna(0).astype(int)
-            df['SEMANA_envio'] = df['Carimbo de data/hora'].dt.isocalendar().week.fillna(0).astype(int)
-
             # Filtrando anos e meses disponíveis como inteiros, removendo o valor 0
             anos_disponiveis_envio = [ano for ano in sorted(df['ANO_envio'].unique(), reverse=True) if ano != 0]
             meses_disponiveis_envio = [mes for mes in sorted(df['MÊS_envio'].unique(), reverse=True) if mes != 0]
@@ -209,46 +2214,47 @@ def visao_global():
             mes_default = [mes_atual] if mes_atual in meses_disponiveis_envio else ["TODOS"]
             semana_default = ["TODOS"]
 
-            # Sidebar para seleção de ano, mês e semana
-            ano = st.sidebar.multiselect("SELECIONE O ANO", options=anos_disponiveis_envio, default=ano_default)
-            mes = st.sidebar.multiselect("SELECIONE O MÊS", options=meses_disponiveis_envio, default=mes_default)
-            semana = st.sidebar.multiselect(
+            # Sidebar para seleção de ano, mês e semana (compartilhada com as outras páginas)
+            ano = filtro_compartilhado('ano', 'global', st.sidebar, "SELECIONE O ANO", anos_disponiveis_envio, ano_default)
+            mes = filtro_compartilhado('mes', 'global', st.sidebar, "SELECIONE O MÊS", meses_disponiveis_envio, mes_default)
+            semana = filtro_compartilhado(
+                'semana', 'global', st.sidebar,
                 "SELECIONE A SEMANA", 
-                options=semanas_disponiveis_envio, 
-                default=semana_default, 
+                semanas_disponiveis_envio, 
+                semana_default, 
                 format_func=lambda x: x[2] if isinstance(x, tuple) else x
             )
 
-            # Aplicando os filtros de ano, mês e semana ao DataFrame
-            df_selection = df
-            if "TODOS" not in ano:
-                df_selection = df_selection[df_selection['ANO_envio'].isin(ano)]
-            if "TODOS" not in mes:
-                df_selection = df_selection[df_selection['MÊS_envio'].isin(mes)]
-
-            # Verifica se "TODOS" não está selecionado para aplicar o filtro da semana
-            if "TODOS" not in semana:
-                semanas_selecionadas = [s[1] for s in semana if isinstance(s, tuple)]  # Extrai apenas o número da semana
-                df_selection = df_selection[df_selection['SEMANA_envio'].isin(semanas_selecionadas)]
+            # Aplicando os filtros de ano, mês e semana ao DataFrame ("TODOS" deixa o filtro de fora)
+            selecoes = {
+                'ANO_envio': None if "TODOS" in ano else ano,
+                'MÊS_envio': None if "TODOS" in mes else mes,
+                'Carimbo de data/hora': None if "TODOS" in semana else chaves_semanas(semana),
+            }
+            df_selection = indice_filtros(df).selecionar(df, selecoes)
 
 
             # Criando a coluna Codigo_Processo
             df_selection = criar_codigo_processo(df_selection)
 
+            # Envios por ano, mês, semana e tipo de envio, com as contagens de Informação Técnica (no banco, quando
+            # habilitado), usados nos quadros e no gráfico semanal
+            envios_agregados = agregar_envios(uploaded_file, df_selection, ['ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Tipo_Envio'], selecoes)
+
             # Contagem de processos enviados (excluindo os processos com status de cancelamento)
-            quantidade_processos_enviados = df_selection[~df_selection['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)].shape[0]
+            quantidade_processos_enviados = int(envios_agregados['Quantidade'].sum())
   
             # Contagem de envios por tipo
-            envios_por_tipo = df_selection['Qual o tipo de envio?'].value_counts()
+            envios_por_tipo = envios_agregados.groupby('Tipo_Envio', observed=True)['Quantidade'].sum()
  
             # Contagem de reenvio
-            reenvio = envios_por_tipo.get('Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)', 0)
+            reenvio = envios_por_tipo.get('Reenvio', 0)
 
             # Contagem de prioridades
-            prioridades = envios_por_tipo.get('Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)',  0)
+            prioridades = envios_por_tipo.get('Prioridades', 0)
  
             # Contagem de 1º envio
-            primeiro_envio = envios_por_tipo.get('1º envio (Primeira vez que o Parecer está sendo enviado para revisão)', 0)
+            primeiro_envio = envios_por_tipo.get('1º Envio', 0)
    
             # Espaçador ou linha de separação entre seções
             st.markdown("<hr style='border: 1px solid #ccc; margin-top: 20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
@@ -290,16 +2296,14 @@ def visao_global():
             st.markdown("<h3 style='font-size:20px; margin-top:10px; margin-bottom:5px; color:#555555;'>Informação Técnica</h3>", unsafe_allow_html=True)
 
 
-            # Filtrando o DataFrame para excluir registros com "cancelado" na coluna 'Qual o tipo de envio?'
-            df_informacao_tecnica = df_selection[~df_selection['Qual o tipo de envio?'].str.contains('cancelado', na=False, case=False)]
-
-            # Contagem de processos por tipo de "Informação Técnica"
-            it_rada = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('IT - RADA', na=False, case=False)].shape[0]
-            it_ipa = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('IT - IPA', na=False, case=False)].shape[0]
-            nao = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('Não', na=False, case=False)].shape[0]
-            it_fiscalizacao = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('IT - FISCALIZAÇÃO', na=False, case=False)].shape[0]
-            it_descumprimento = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('IT - Descumprimento de Condicionante', na=False, case=False)].shape[0]
-            it_outros = df_informacao_tecnica[df_informacao_tecnica['Informação Técnica'].str.contains('IT - Outros', na=False, case=False)].shape[0]
+            # Contagem de processos por categoria de "Informação Técnica" (calculada na carga), sem os envios cancelados
+            contagem_it = envios_agregados[list(COLUNAS_CONTEM_IT.values())].sum().set_axis(CATEGORIAS_IT)
+            it_rada = contagem_it.get('IT - RADA', 0)
+            it_ipa = contagem_it.get('IT - IPA', 0)
+            nao = contagem_it.get('Não', 0)
+            it_fiscalizacao = contagem_it.get('IT - FISCALIZAÇÃO', 0)
+            it_descumprimento = contagem_it.get('IT - Descumprimento de Condicionante', 0)
+            it_outros = contagem_it.get('IT - Outros', 0)
 
             # Layout: 4 colunas para a "Informação Técnica"
             col_it1, col_it2, col_it3, col_it4 = st.columns(4)
@@ -343,9 +2347,6 @@ def visao_global():
 ### Gráfico de linhas e barras empilhadas para análises temporais
 
 
-            # Filtrando o DataFrame para excluir os processos cancelados
-            df_selection_filtered = df_selection[~df_selection['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)]
-
             # Espaçador ou linha de separação entre seções
             st.markdown("<hr style='border: 1px solid #ccc; margin-top: 20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
 
@@ -354,11 +2355,11 @@ def visao_global():
 
 
             # Agrupando os dados por semana e tipo de envio
-            df_temporal = df_selection_filtered.groupby(['ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Qual o tipo de envio?']).size().reset_index(name='Quantidade de Processos')
+            df_temporal = envios_agregados.dropna(subset=['Tipo_Envio'])[['ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Tipo_Envio', 'Quantidade']].rename(columns={'Quantidade': 'Quantidade de Processos'})
 
             # Filtra apenas os envios de prioridades e primeiros envios
             df_prioridade_primeiro_envio = df_temporal[
-                df_temporal['Qual o tipo de envio?'].str.contains('Prioridades|1º envio', case=False, na=False)
+                df_temporal['Tipo_Envio'].isin(['1º Envio', 'Prioridades'])
             ]
 
             # Soma a quantidade de processos de prioridade e primeiro envio por semana
@@ -368,20 +2369,20 @@ def visao_global():
             fig_temporal = go.Figure()
 
             # Adicionando as barras empilhadas para cada tipo de envio
-            for tipo_envio in df_temporal['Qual o tipo de envio?'].unique():
-                df_tipo = df_temporal[df_temporal['Qual o tipo de envio?'] == tipo_envio]
+            for tipo_envio in df_temporal['Tipo_Envio'].unique():
+                df_tipo = df_temporal[df_temporal['Tipo_Envio'] == tipo_envio]
                 fig_temporal.add_trace(go.Bar(
                     x=df_tipo['SEMANA_envio'],
                     y=df_tipo['Quantidade de Processos'],
                     name=tipo_envio,
                     text=df_tipo['Quantidade de Processos'],  # Adicionando os valores
                     textposition='auto',  # Exibindo os valores nas barras
-                    marker_color=px.colors.sequential.Tealgrn[df_temporal['Qual o tipo de envio?'].unique().tolist().index(tipo_envio)],
+                    marker_color=px.colors.sequential.Tealgrn[df_temporal['Tipo_Envio'].unique().tolist().index(tipo_envio)],
                     textfont=dict(size=12)  # Aumentando o tamanho do texto dos rótulos de barra
                 ))
 
             # Adicionando a linha com a quantidade total de processos por semana
-            df_total_semana = df_selection_filtered.groupby(['ANO_envio', 'SEMANA_envio']).size().reset_index(name='Quantidade Total de Processos')
+            df_total_semana = envios_agregados.groupby(['ANO_envio', 'SEMANA_envio'])['Quantidade'].sum().reset_index(name='Quantidade Total de Processos')
             fig_temporal.add_trace(go.Scatter(
                 x=df_total_semana['SEMANA_envio'],
                 y=df_total_semana['Quantidade Total de Processos'],
@@ -440,14 +2441,10 @@ def visao_global():
             st.subheader("Distribuição Mensal dos Tipos de Envio")
 
             # Filtrar o DataFrame para excluir processos cancelados
-            df_selection_filtered = df_selection[~df_selection['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)]
+            df_selection_filtered = df_selection[~df_selection['Envio_Cancelado']]
 
-            # Renomear valores em 'Qual o tipo de envio?' para consistência
-            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Qual o tipo de envio?'].replace({
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1º Envio',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridades',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvios'
-            })
+            # Rótulos curtos dos tipos de envio (calculados na carga)
+            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Tipo_Envio'].astype(TIPO_TEXTO)
 
             # Definir cores para cada tipo de envio
             cor_1_envio = '#2ca02c'  # Verde
@@ -531,7 +2528,7 @@ def visao_global():
             with col2:
                 st.plotly_chart(grafico_mensal_por_tipo(df_selection_filtered, 'Prioridades', cor_prioridades), use_container_width=True)
             with col3:
-                st.plotly_chart(grafico_mensal_por_tipo(df_selection_filtered, 'Reenvios', cor_reenvios), use_container_width=True)
+                st.plotly_chart(grafico_mensal_por_tipo(df_selection_filtered, 'Reenvio', cor_reenvios), use_container_width=True)
 
             def grafico_mensal_area_por_tipo(df, tipo_envio, cor_area):
                 # Filtrar dados para o tipo de envio específico
@@ -615,27 +2612,14 @@ def visao_global():
             with col2:
                 st.plotly_chart(grafico_mensal_area_por_tipo(df_selection_filtered, 'Prioridades', cor_prioridades), use_container_width=True)
             with col3:
-                st.plotly_chart(grafico_mensal_area_por_tipo(df_selection_filtered, 'Reenvios', cor_reenvios), use_container_width=True)
+                st.plotly_chart(grafico_mensal_area_por_tipo(df_selection_filtered, 'Reenvio', cor_reenvios), use_container_width=True)
 
 
 
 
 ### Tipos de Processo
 
-            # Criar uma nova coluna 'Tipo de Processo' aplicando a função de extração
-            # Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-
-            # Aplicando a função para criar a coluna 'Tipo de Processo'
-            df_selection['Tipo de Processo'] = df_selection['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
+            # 'Tipo de Processo' vem do pré-processamento
 
             import locale
 
@@ -651,23 +2635,8 @@ def visao_global():
             # Título descritivo
             st.subheader("Distribuição Hierárquica dos Tipos de Processo ao Longo do Tempo - Comparativo Mensal e Semanal - 1° Envio e Prioridades")
 
-            # Função aprimorada para extrair o tipo de processo
-            # Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-
-            # Aplicando a função ao DataFrame
-            df_selection['Tipo de Processo'] = df_selection['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Filtrando para excluir "cancelados"
-            df_selection_filtrado = df_selection[~df_selection['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)]
+            df_selection_filtrado = df_selection[~df_selection['Envio_Cancelado']]
 
             # Filtro para "Tipo de Processo" dentro da seção de gráficos
             tipos_de_processo_unicos = sorted(df_selection['Tipo de Processo'].unique().tolist())
@@ -765,15 +2734,16 @@ def visao_global():
             # Aplicar o filtro para o gráfico semanal
             df_selection_filtrado = df_selection_filtrado if "Todos" in tipo_processo_selecionado or not tipo_processo_selecionado else df_selection_filtrado[df_selection_filtrado['Tipo de Processo'].isin(tipo_processo_selecionado)]
 
-            # Agrupamento semanal para o gráfico de áreas
-            df_area_semana = df_selection_filtrado.groupby(['ANO_envio', 'SEMANA_envio', 'Tipo de Processo']).size().reset_index(name='Quantidade')
-            df_area_semana['Data_Semana'] = pd.to_datetime(df_area_semana['ANO_envio'].astype(str) + df_area_semana['SEMANA_envio'].astype(str) + '1', format='%Y%U%w')
+            # Agrupamento semanal para o gráfico de áreas, pela chave da semana (ano ISO e semana) no calendário
+            calendario = calendario_das_datas(df_selection_filtrado['Carimbo de data/hora'])
+            df_area_semana = df_selection_filtrado.assign(
+                CHAVE_SEMANA=calendario.chave_semana(df_selection_filtrado['Carimbo de data/hora'])
+            ).query('CHAVE_SEMANA > 0').groupby(['CHAVE_SEMANA', 'Tipo de Processo']).size().reset_index(name='Quantidade')
 
-            # Criar coluna 'Período_Semana' para exibição no formato desejado
-            df_area_semana['Período_Semana'] = (
-                'S' + df_area_semana['SEMANA_envio'].astype(str) + '-' +
-                df_area_semana['Data_Semana'].dt.strftime('%b-%y').str.upper()
-            )
+            # Início da semana e rótulo 'Período_Semana' (ex.: S40-SET-26) vindos da tabela de semanas do calendário
+            semanas_area = calendario.tabela_semanas.loc[df_area_semana['CHAVE_SEMANA']]
+            df_area_semana['Data_Semana'] = semanas_area['INICIO'].to_numpy()
+            df_area_semana['Período_Semana'] = semanas_area['ROTULO_CURTO'].to_numpy()
 
             # Agrupar quantidades totais semanais, ordenadas por 'Data_Semana'
             df_area_semana_total = df_area_semana.groupby(['Data_Semana', 'Período_Semana'])['Quantidade'].sum().reset_index(name='Total_Quantidade')
@@ -847,8 +2817,8 @@ def visao_global():
 
             # Aplicando filtros de ano e mês ao DataFrame filtrado
             df_filtered = df_selection[
-                ~df_selection['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)
-                & (df_selection['Qual o tipo de envio?'].str.contains('1º envio|Prioridades', case=False))
+                ~df_selection['Envio_Cancelado']
+                & (df_selection['Tipo_Envio'].isin(['1º Envio', 'Prioridades']))
                 & (df_selection['ANO_envio'].isin(anos_filtrados))  # Filtro de ano ajustado
                 & (df_selection['MÊS_envio'].isin(meses_filtrados))  # Filtro de mês ajustado
             ].copy()
@@ -866,7 +2836,7 @@ def visao_global():
             soma_quantidade_empreendimentos = df_filtered.groupby('Tipo de empreendimento_agrupado')['Quantidade de empreendimentos'].sum()
 
             # Contagem de processos por tipo de empreendimento para "1º Envio + Prioridades"
-            contagem_primeiro_envio = df_filtered['Tipo de empreendimento_agrupado'].value_counts()
+            contagem_primeiro_envio = contar_valores(df_filtered['Tipo de empreendimento_agrupado'])
 
             # Criando a legenda personalizada para o primeiro gráfico
             legenda_customizada_envio = contagem_primeiro_envio.reset_index()
@@ -970,21 +2940,16 @@ def visao_global():
             # Título descritivo
             st.subheader("Processos Enviados e Quantitativo por Tipo de Empreendimento - Classificação por Informação Técnica (IT) - 1° Envio e Prioridades")
 
-            # Aplicando o filtro "TODOS" para a segunda seção da mesma forma
-            df_it_summary = df_filtered.groupby(['Informação Técnica', 'Tipo de empreendimento_agrupado']).agg(
+            # Agrupamento único pela categoria igual à resposta de Informação Técnica, usado por todos os treemaps
+            df_it_summary = df_filtered.groupby(['Categoria_IT', 'Informação Técnica', 'Tipo de empreendimento_agrupado']).agg(
                 Quantidade_Processos=('Tipo de empreendimento_agrupado', 'count'),
                 Quantidade_Empreendimentos=('Quantidade de empreendimentos', 'sum')
             ).reset_index()
 
             # Função para criar o treemap para uma categoria específica de Informação Técnica
-            def criar_treemap_por_informacao_tecnica(informacao_tecnica, dados):
-                # Filtrando os dados para a informação técnica específica
-                dados_treemap = dados[dados['Informação Técnica'].str.strip().str.upper() == informacao_tecnica.strip().upper()].groupby(
-                    ['Informação Técnica', 'Tipo de empreendimento_agrupado']
-                ).agg(
-                    Quantidade_Processos=('Tipo de empreendimento_agrupado', 'count'),
-                    Quantidade_Empreendimentos=('Quantidade de empreendimentos', 'sum')
-                ).reset_index()
+            def criar_treemap_por_informacao_tecnica(informacao_tecnica, resumo):
+                # Filtrando o agrupamento para a categoria específica
+                dados_treemap = resumo[resumo['Categoria_IT'] == informacao_tecnica]
 
                 # Verifica se existem dados para a categoria
                 if dados_treemap.empty:
@@ -1019,30 +2984,30 @@ def visao_global():
             # Exibindo os gráficos para "NÃO" e "IT - RADA" lado a lado
             col1, col2 = st.columns(2)
             with col1:
-                fig_nao = criar_treemap_por_informacao_tecnica('NÃO', df_filtered)
+                fig_nao = criar_treemap_por_informacao_tecnica('Não', df_it_summary)
                 if fig_nao:
                     st.plotly_chart(fig_nao, use_container_width=True)
             with col2:
-                fig_rada = criar_treemap_por_informacao_tecnica('IT - RADA', df_filtered)
+                fig_rada = criar_treemap_por_informacao_tecnica('IT - RADA', df_it_summary)
                 if fig_rada:
                     st.plotly_chart(fig_rada, use_container_width=True)
 
             # Exibindo os gráficos para as outras categorias em colunas menores
             col3, col4, col5, col6 = st.columns(4)
             with col3:
-                fig_descumprimento = criar_treemap_por_informacao_tecnica('IT - Descumprimento de Condicionante', df_filtered)
+                fig_descumprimento = criar_treemap_por_informacao_tecnica('IT - Descumprimento de Condicionante', df_it_summary)
                 if fig_descumprimento:
                     st.plotly_chart(fig_descumprimento, use_container_width=True)
             with col4:
-                fig_ipa = criar_treemap_por_informacao_tecnica('IT - IPA', df_filtered)
+                fig_ipa = criar_treemap_por_informacao_tecnica('IT - IPA', df_it_summary)
                 if fig_ipa:
                     st.plotly_chart(fig_ipa, use_container_width=True)
             with col5:
-                fig_outros = criar_treemap_por_informacao_tecnica('IT - Outros', df_filtered)
+                fig_outros = criar_treemap_por_informacao_tecnica('IT - Outros', df_it_summary)
                 if fig_outros:
                     st.plotly_chart(fig_outros, use_container_width=True)
             with col6:
-                fig_fiscalizacao = criar_treemap_por_informacao_tecnica('IT - FISCALIZAÇÃO', df_filtered)
+                fig_fiscalizacao = criar_treemap_por_informacao_tecnica('IT - FISCALIZAÇÃO', df_it_summary)
                 if fig_fiscalizacao:
                     st.plotly_chart(fig_fiscalizacao, use_container_width=True)
 
@@ -1071,8 +3036,8 @@ def visao_global():
 
             # Filtrando para excluir processos com 'cancelado' no tipo de envio e incluir apenas "1º Envio" e "Prioridades"
             df_filtered_empresa = df_selection_filtrado[
-                (~df_selection_filtrado['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)) &
-                (df_selection_filtrado['Qual o tipo de envio?'].str.contains('1º envio|Prioridades', case=False, na=False))
+                (~df_selection_filtrado['Envio_Cancelado']) &
+                (df_selection_filtrado['Tipo_Envio'].isin(['1º Envio', 'Prioridades']))
             ]
 
             # Definindo o DataFrame df_temporal para análises temporais
@@ -1130,8 +3095,8 @@ def visao_global():
             else:
                 # Filtrar para incluir apenas 1º Envio e Prioridades, excluindo cancelados
                 df_filtered_sunburst = df_selection_filtrado[
-                    (~df_selection_filtrado['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)) &
-                    (df_selection_filtrado['Qual o tipo de envio?'].str.contains('1º envio|Prioridades', case=False, na=False))
+                    (~df_selection_filtrado['Envio_Cancelado']) &
+                    (df_selection_filtrado['Tipo_Envio'].isin(['1º Envio', 'Prioridades']))
                 ]
 
                 # Colunas relevantes para o gráfico sunburst de Empresa e Tipo de Processo
@@ -1232,7 +3197,7 @@ def visao_global():
             # Tabela Geral
             st.markdown("<h3 style='text-align: center;'>Tabela Geral</h3>", unsafe_allow_html=True)
             st.write("Visualização de dados filtrados:")
-            styled_df_full = df_selection.style.apply(aplicar_estilos, axis=None)
+            styled_df_full = df_selection.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_full, use_container_width=True)
 
             # Crie sua Tabela
@@ -1243,16 +3208,16 @@ def visao_global():
             with st.expander("VISUALIZAÇÃO GERAL DOS DADOS"):
                 showData = st.multiselect(
                     'Filtrar: ',
-                    df_selection.columns,
+                    colunas_para_tabela(df_selection),
                     default=[
                         "Codigo_Processo", "Carimbo de data/hora",
-                        "Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)",
+                        COLUNA_PROCESSO,
                         "Analista (você)", "Qual o tipo de envio?", "Informação Técnica", "Empresa", "Tipo de empreendimento", "Quantidade de empreendimentos",
                         "Revisado por", "Revisado em", "MÊS", "ANO", "Status do processo pós revisão"
                     ]
                 )
 
-                styled_df = df_selection[showData].style.apply(aplicar_estilos, axis=None)
+                styled_df = anexar_colunas(uploaded_file, df_selection, showData)[showData].style.apply(aplicar_estilos, axis=None)
                 st.dataframe(styled_df, use_container_width=True)
 
 
@@ -1274,7 +3239,7 @@ def visao_analista():
     
     if uploaded_file is not None:
         # Carrega os dados do arquivo
-        df = load_data(uploaded_file)
+        df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Visão - Analista"])
 
         st.markdown(
             "<h1 style='text-align: center; color: #98FF98; font-size: 42px; font-weight: bold; text-decoration: underline;'>Visão - Revisão</h1>",
@@ -1285,15 +3250,10 @@ def visao_analista():
         st.markdown("<hr style='border: 1px solid #ccc; margin-top: 20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
 
         # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'\bcancel(ad|ar)\b', case=False, na=False)]
+        df = df[~df['Envio_Cancelado']]
 
         # Continuar com o código de filtragem e processamento apenas com os dados válidos
         if df is not None and not df.empty:
-            # Convertendo valores de ano, mês e semana, tratando valores ausentes
-            df['MÊS_envio'] = df['Carimbo de data/hora'].dt.month.fillna(0).astype(int)
-            df['ANO_envio'] = df['Carimbo de data/hora'].dt.year.fillna(0).astype(int)
-            df['SEMANA_envio'] = df['Carimbo de data/hora'].dt.isocalendar().week.fillna(0).astype(int)
-
             # Filtrando anos e meses disponíveis como inteiros, removendo o valor 0
             anos_disponiveis_envio = [ano for ano in sorted(df['ANO_envio'].unique(), reverse=True) if ano != 0]
             meses_disponiveis_envio = [mes for mes in sorted(df['MÊS_envio'].unique(), reverse=True) if mes != 0]
@@ -1317,46 +3277,37 @@ def visao_analista():
             mes_default = [mes_atual] if mes_atual in meses_disponiveis_envio else ["TODOS"]
             semana_default = ["TODOS"]
 
-            # Sidebar para seleção de ano, mês e semana
-            ano = st.sidebar.multiselect("SELECIONE O ANO", options=anos_disponiveis_envio, default=ano_default)
-            mes = st.sidebar.multiselect("SELECIONE O MÊS", options=meses_disponiveis_envio, default=mes_default)
-            semana = st.sidebar.multiselect(
+            # Sidebar para seleção de ano, mês e semana (compartilhada com as outras páginas)
+            ano = filtro_compartilhado('ano', 'analista', st.sidebar, "SELECIONE O ANO", anos_disponiveis_envio, ano_default)
+            mes = filtro_compartilhado('mes', 'analista', st.sidebar, "SELECIONE O MÊS", meses_disponiveis_envio, mes_default)
+            semana = filtro_compartilhado(
+                'semana', 'analista', st.sidebar,
                 "SELECIONE A SEMANA", 
-                options=semanas_disponiveis_envio, 
-                default=semana_default, 
+                semanas_disponiveis_envio, 
+                semana_default, 
                 format_func=lambda x: x[2] if isinstance(x, tuple) else x
             )
 
             # Filtro "Informação Técnica" com opção "TODOS" e excluindo NaN
             informacao_tecnica_opcoes = [opcao for opcao in sorted(df['Informação Técnica'].dropna().unique().tolist())]
             informacao_tecnica_opcoes.insert(0, "TODOS")  # Adiciona "TODOS" no início da lista
-            informacao_tecnica_selecionada = st.sidebar.multiselect(
+            informacao_tecnica_selecionada = filtro_compartilhado(
+                'it', 'analista', st.sidebar,
                 "Filtrar por Informação Técnica", 
-                options=informacao_tecnica_opcoes, 
-                default=["TODOS"]
+                informacao_tecnica_opcoes, 
+                ["TODOS"]
             )
 
-            # Aplicando os filtros ao DataFrame
-            df_selection_filtered = df.copy()  # Cria uma cópia para aplicar os filtros
-
-            # Filtra por ano se "TODOS" não estiver selecionado
-            if "TODOS" not in ano:
-                df_selection_filtered = df_selection_filtered[df_selection_filtered['ANO_envio'].isin(ano)]
-
-            # Filtra por mês se "TODOS" não estiver selecionado
-            if "TODOS" not in mes:
-                df_selection_filtered = df_selection_filtered[df_selection_filtered['MÊS_envio'].isin(mes)]
-
-            # Filtra por semana se "TODOS" não estiver selecionado
-            if "TODOS" not in semana:
-                semanas_selecionadas = [s[1] if isinstance(s, tuple) else s for s in semana]  # Extrai apenas o número da semana
-                df_selection_filtered = df_selection_filtered[df_selection_filtered['SEMANA_envio'].isin(semanas_selecionadas)]
-
-            # Filtra por "Informação Técnica" se "TODOS" não estiver selecionado
-            if "TODOS" not in informacao_tecnica_selecionada:
-                df_selection_filtered = df_selection_filtered[df_selection_filtered['Informação Técnica'].isin(informacao_tecnica_selecionada)]
-
-            # Agora utilize `df_selection_filtered` para todos os gráficos e tabelas subsequentes.
+            # Filtros de ano, mês, semana e "Informação Técnica" ("TODOS" deixa o filtro de fora); o de analista é
+            # acrescentado abaixo e as linhas são extraídas uma única vez, em `df_selection_filtered`, usado em todos os
+            # gráficos e tabelas subsequentes
+            indice = indice_filtros(df)
+            selecoes = {
+                'ANO_envio': None if "TODOS" in ano else ano,
+                'MÊS_envio': None if "TODOS" in mes else mes,
+                'Carimbo de data/hora': None if "TODOS" in semana else chaves_semanas(semana),
+                'Informação Técnica': None if "TODOS" in informacao_tecnica_selecionada else informacao_tecnica_selecionada,
+            }
 
 
             
@@ -1371,17 +3322,22 @@ def visao_analista():
             )
 
             # Filtro de analista com borda e fundo mais destacados em tons de verde
-            analistas_disponiveis = df_selection_filtered['Analista (você)'].dropna().unique().tolist()
+            analistas_disponiveis = df.loc[indice.mascara(df, selecoes), 'Analista (você)'].dropna().unique().tolist()
             analista_selecionado = st.selectbox(
                 label="",
                 options=["TODOS"] + sorted(analistas_disponiveis),
             )
 
 
-            # Aplicando filtro de analista com base na coluna "Analista (você)"
+            # Aplicando os filtros, com o de analista com base na coluna "Analista (você)"
+            selecoes['Analista (você)'] = None if analista_selecionado == "TODOS" else [analista_selecionado]
+            df_selection_filtered = indice.selecionar(df, selecoes).copy()
+            # Envios por analista, ano, mês, semana e tipo de envio (no banco, quando habilitado), usados nas contagens
+            # dos gráficos de envios
+            envios_agregados = agregar_envios(
+                uploaded_file, df_selection_filtered, ['Analista (você)', 'ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Tipo_Envio'], selecoes
+            )
             if analista_selecionado != "TODOS":
-                df_selection_filtered = df_selection_filtered[df_selection_filtered['Analista (você)'] == analista_selecionado]
-                
                 # Verificar se o analista selecionado também aparece como revisor na coluna "Revisado por"
                 if analista_selecionado in df['Revisado por'].values:
                     st.warning(f"Nota: {analista_selecionado} também aparece como 'Revisor' na coluna 'Revisado por'.")
@@ -1404,7 +3360,7 @@ def visao_analista():
 
                 # Filtrando o DataFrame para excluir processos cancelados e usar apenas "Carimbo de data/hora"
                 df_selection_filtered = df_selection_filtered[
-                    (~df_selection_filtered['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)) &
+                    (~df_selection_filtered['Envio_Cancelado']) &
                     (df_selection_filtered['Carimbo de data/hora'].notna())
                 ]
 
@@ -1434,19 +3390,17 @@ def visao_analista():
 
                 # Calcula os totais de envios por analista para exibir na legenda
                 analistas_unicos = sorted(df_selection_filtered['Analista (você)'].unique())
-                totais_por_analista = df_selection_filtered['Analista (você)'].value_counts().to_dict()
+                totais_por_analista = envios_agregados.groupby('Analista (você)', observed=True)['Quantidade'].sum().to_dict()
                 color_map = {analista: color_sequence[i % len(color_sequence)] for i, analista in enumerate(analistas_unicos)}
 
                 # Função para gerar gráfico empilhado de envios por semana para cada tipo de envio
-                def gerar_grafico_envio(tipo_envio, titulo, cor_linha="darkgoldenrod"):
-                    df_tipo_envio = df_selection_filtered[
-                        df_selection_filtered['Qual o tipo de envio?'].str.contains(tipo_envio, case=False, na=False)
-                    ]
+                def gerar_grafico_envio(tipos_envio, titulo, cor_linha="darkgoldenrod"):
+                    df_tipo_envio = envios_agregados[envios_agregados['Tipo_Envio'].isin(tipos_envio) & (envios_agregados['SEMANA_envio'] > 0)]
                     
                     # Agrupa por semana e analista
-                    df_analista_semana = df_tipo_envio.groupby(
-                        [df_tipo_envio['Carimbo de data/hora'].dt.isocalendar().week, 'Analista (você)']
-                    ).size().unstack(fill_value=0)
+                    df_analista_semana = df_tipo_envio.pivot_table(
+                        index='SEMANA_envio', columns='Analista (você)', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    )
 
                     analistas_ordenados = df_analista_semana.sum().sort_values(ascending=False).index
                     df_analista_semana = df_analista_semana[analistas_ordenados]
@@ -1501,9 +3455,9 @@ def visao_analista():
 
                 # Gráfico mensal de envios por analista com totais na legenda
                 def gerar_grafico_mensal_por_analista():
-                    df_analista_mes = df_selection_filtered.groupby(
-                        [df_selection_filtered['Carimbo de data/hora'].dt.month, 'Analista (você)']
-                    ).size().unstack(fill_value=0)
+                    df_analista_mes = envios_agregados[envios_agregados['MÊS_envio'] > 0].pivot_table(
+                        index='MÊS_envio', columns='Analista (você)', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    )
 
                     analistas_ordenados = df_analista_mes.sum().sort_values(ascending=False).index
                     df_analista_mes = df_analista_mes[analistas_ordenados]
@@ -1543,16 +3497,14 @@ def visao_analista():
                 # Exibindo gráficos de envios semanais e mensais lado a lado
                 col_main, col_side = st.columns([3, 1.5])
                 with col_main:
-                    st.plotly_chart(gerar_grafico_envio("Prioridades|1º envio|Reenvio após correções", "Total de Envios por Semana - Todos os Analistas"), use_container_width=True)
+                    st.plotly_chart(gerar_grafico_envio(['Prioridades', '1º Envio', 'Reenvio'], "Total de Envios por Semana - Todos os Analistas"), use_container_width=True)
                 with col_side:
                     st.plotly_chart(gerar_grafico_mensal_por_analista(), use_container_width=True)
                 
                 # Gráficos de rosca para distribuições totais
                 def gerar_grafico_donut(tipo_envio, titulo):
-                    df_tipo_envio = df_selection_filtered[
-                        df_selection_filtered['Qual o tipo de envio?'].str.contains(tipo_envio, case=False, na=False)
-                    ]
-                    total_por_analista = df_tipo_envio['Analista (você)'].value_counts().reset_index()
+                    df_tipo_envio = envios_agregados[envios_agregados['Tipo_Envio'] == tipo_envio]
+                    total_por_analista = df_tipo_envio.groupby('Analista (você)', observed=True)['Quantidade'].sum().sort_values(ascending=False).reset_index()
                     total_por_analista.columns = ['Analista', 'Quantidade']
 
                     fig_donut = px.pie(
@@ -1588,9 +3540,9 @@ def visao_analista():
                 with col_pie1:
                     st.plotly_chart(gerar_grafico_donut("Prioridades", "Envios de Prioridades por Analista"), use_container_width=True)
                 with col_pie2:
-                    st.plotly_chart(gerar_grafico_donut("1º envio", "1º Envios por Analista"), use_container_width=True)
+                    st.plotly_chart(gerar_grafico_donut("1º Envio", "1º Envios por Analista"), use_container_width=True)
                 with col_pie3:
-                    st.plotly_chart(gerar_grafico_donut("Reenvio após correções", "Reenvios por Analista"), use_container_width=True)
+                    st.plotly_chart(gerar_grafico_donut("Reenvio", "Reenvios por Analista"), use_container_width=True)
 
 
 
@@ -1598,13 +3550,13 @@ def visao_analista():
 
 
                 # Agrupa os dados por analista e tipo de envio para contar a quantidade
-                df_analista_envio = df_selection_filtered.groupby(['Analista (você)', 'Qual o tipo de envio?']).size().reset_index(name='Quantidade')
+                df_analista_envio = envios_agregados.groupby(['Analista (você)', 'Tipo_Envio'], observed=True)['Quantidade'].sum().reset_index(name='Quantidade')
 
                 # Calcula o total de envios para cada tipo de envio
-                df_total_envio_por_tipo = df_selection_filtered.groupby('Qual o tipo de envio?').size().reset_index(name='Total por Tipo de Envio')
+                df_total_envio_por_tipo = envios_agregados.groupby('Tipo_Envio', observed=True)['Quantidade'].sum().reset_index(name='Total por Tipo de Envio')
 
                 # Junta as tabelas para adicionar o total de cada tipo de envio na tabela por analista
-                df_analista_envio = df_analista_envio.merge(df_total_envio_por_tipo, on='Qual o tipo de envio?', how='left')
+                df_analista_envio = df_analista_envio.merge(df_total_envio_por_tipo, on='Tipo_Envio', how='left')
 
                 # Calcula a proporção de cada analista para cada tipo de envio
                 df_analista_envio['Proporção (%)'] = (df_analista_envio['Quantidade'] / df_analista_envio['Total por Tipo de Envio']) * 100
@@ -1622,7 +3574,7 @@ def visao_analista():
                                     {'range': [25, 50], 'color': "#7fcdbb"},
                                     {'range': [50, 75], 'color': "#41b6c4"},
                                     {'range': [75, 100], 'color': "#1d91c0"}]
-                    elif tipo_envio == 'Reenvios':
+                    elif tipo_envio == 'Reenvio':
                         cor_barra = "darkblue"
                         cor_steps = [{'range': [0, 25], 'color': "#c6dbef"},
                                     {'range': [25, 50], 'color': "#9ecae1"},
@@ -1662,7 +3614,7 @@ def visao_analista():
 
 
                 # Cálculo do total de envios por tipo e média proporcional por tipo de envio
-                total_envios_por_tipo = df_analista_envio.groupby('Qual o tipo de envio?')['Quantidade'].sum().reset_index()
+                total_envios_por_tipo = df_analista_envio.groupby('Tipo_Envio')['Quantidade'].sum().reset_index()
                 num_analistas = df_analista_envio['Analista (você)'].nunique()
 
                 # Adiciona a coluna da média de envios em valores absolutos (sem porcentagem)
@@ -1670,7 +3622,7 @@ def visao_analista():
 
                 # Renomeia colunas para melhorar a apresentação
                 total_envios_por_tipo = total_envios_por_tipo.rename(columns={
-                    'Qual o tipo de envio?': 'Tipo de Envio',
+                    'Tipo_Envio': 'Tipo de Envio',
                     'Quantidade': 'Total de Envios'
                 })
 
@@ -1712,13 +3664,6 @@ def visao_analista():
 
                 
 
-                # Ajustando os textos dos tipos de envio no DataFrame
-                df_analista_envio['Qual o tipo de envio?'] = df_analista_envio['Qual o tipo de envio?'].replace({
-                    '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1º Envio',
-                    'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridades',
-                    'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvios'
-                })
-
                 # Título da seção
                 st.markdown("<h3 style='text-align: center;'>Gráficos de Velocidade por Analista e Tipo de Envio</h3>", unsafe_allow_html=True)
 
@@ -1746,7 +3691,7 @@ def visao_analista():
                             df_analista = df_analista_envio[df_analista_envio['Analista (você)'] == analista]
 
                             # Gráfico de 1º Envio
-                            df_envio = df_analista[df_analista['Qual o tipo de envio?'] == '1º Envio']
+                            df_envio = df_analista[df_analista['Tipo_Envio'] == '1º Envio']
                             if not df_envio.empty:
                                 proporcao = df_envio['Proporção (%)'].values[0]
                                 total = df_envio['Quantidade'].values[0]
@@ -1763,7 +3708,7 @@ def visao_analista():
                                 )
 
                             # Gráfico de Prioridades
-                            df_prioridade = df_analista[df_analista['Qual o tipo de envio?'] == 'Prioridades']
+                            df_prioridade = df_analista[df_analista['Tipo_Envio'] == 'Prioridades']
                             if not df_prioridade.empty:
                                 proporcao = df_prioridade['Proporção (%)'].values[0]
                                 total = df_prioridade['Quantidade'].values[0]
@@ -1780,18 +3725,18 @@ def visao_analista():
                                 )
 
                             # Gráfico de Reenvios
-                            df_reenvio = df_analista[df_analista['Qual o tipo de envio?'] == 'Reenvios']
+                            df_reenvio = df_analista[df_analista['Tipo_Envio'] == 'Reenvio']
                             if not df_reenvio.empty:
                                 proporcao = df_reenvio['Proporção (%)'].values[0]
                                 total = df_reenvio['Quantidade'].values[0]
                                 st.plotly_chart(
-                                    gerar_grafico_velocidade('Reenvios', proporcao, total),
+                                    gerar_grafico_velocidade('Reenvio', proporcao, total),
                                     use_container_width=True,
                                     key=f"{analista}_reenvios"
                                 )
                             else:
                                 st.plotly_chart(
-                                    gerar_grafico_velocidade('Reenvios', 0, 0),
+                                    gerar_grafico_velocidade('Reenvio', 0, 0),
                                     use_container_width=True,
                                     key=f"{analista}_reenvios_empty"
                                 )
@@ -1813,11 +3758,11 @@ def visao_analista():
             st.subheader(f'Processos por Semana - {analista_selecionado}')
 
             # Agrupando os dados por semana e tipo de envio
-            df_temporal_analista = df_selection_filtered.groupby(['ANO_envio', 'SEMANA_envio', 'Qual o tipo de envio?']).size().reset_index(name='Quantidade de Processos')
+            df_temporal_analista = envios_agregados.groupby(['ANO_envio', 'SEMANA_envio', 'Tipo_Envio'], observed=True)['Quantidade'].sum().reset_index(name='Quantidade de Processos')
 
             # Filtra apenas os envios de prioridades e primeiros envios
             df_prioridade_primeiro_envio_analista = df_temporal_analista[
-                df_temporal_analista['Qual o tipo de envio?'].str.contains('Prioridades|1º envio', case=False, na=False)
+                df_temporal_analista['Tipo_Envio'].isin(['1º Envio', 'Prioridades'])
             ]
 
             # Soma a quantidade de processos de prioridade e primeiro envio por semana
@@ -1827,11 +3772,11 @@ def visao_analista():
             fig_temporal_analista = go.Figure()
 
             # Define the order of types for stacking: "1º Envio" at the base, "Prioridades" in the middle, and "Reenvio" on top
-            stack_order = ["1º envio (Primeira vez que o Parecer está sendo enviado para revisão)", "Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)", "Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)"]
+            stack_order = list(TIPOS_ENVIO)
 
             # Adicionando as barras empilhadas para cada tipo de envio na ordem especificada
             for tipo_envio in stack_order:
-                df_tipo = df_temporal_analista[df_temporal_analista['Qual o tipo de envio?'] == tipo_envio]
+                df_tipo = df_temporal_analista[df_temporal_analista['Tipo_Envio'] == tipo_envio]
                 fig_temporal_analista.add_trace(go.Bar(
                     x=df_tipo['SEMANA_envio'],
                     y=df_tipo['Quantidade de Processos'],
@@ -1843,7 +3788,7 @@ def visao_analista():
                 ))
 
             # Adicionando a linha com a quantidade total de processos por semana para o analista
-            df_total_semana_analista = df_selection_filtered.groupby(['ANO_envio', 'SEMANA_envio']).size().reset_index(name='Quantidade Total de Processos')
+            df_total_semana_analista = envios_agregados.groupby(['ANO_envio', 'SEMANA_envio'])['Quantidade'].sum().reset_index(name='Quantidade Total de Processos')
             fig_temporal_analista.add_trace(go.Scatter(
                 x=df_total_semana_analista['SEMANA_envio'],
                 y=df_total_semana_analista['Quantidade Total de Processos'],
@@ -1909,33 +3854,12 @@ def visao_analista():
             st.subheader(f'Processos Enviados - {analista_selecionado}')
 
             # Função aprimorada para extrair o tipo de processo de acordo com diferentes padrões
-            # Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-
-            # Criando a coluna 'Tipo de Processo' aplicando a função de extração ao 'Número do Processo'
-            if 'Tipo de Processo' not in df_selection_filtered.columns:
-                df_selection_filtered['Tipo de Processo'] = df_selection_filtered[
-                    'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'
-                ].apply(extrair_tipo_processo)
-
-            # Remove as entradas que contêm "cancelado" em "Qual o tipo de envio?"
-            df_selection_filtered = df_selection_filtered[~df_selection_filtered['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)]
-
-
-            # Simplifica os textos dos tipos de envio
-            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Qual o tipo de envio?'].replace({
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1º Envio',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridades',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvio'
-            })
+            # Remove os envios cancelados
+            df_selection_filtered = df_selection_filtered[~df_selection_filtered['Envio_Cancelado']]
+
+
+            # Rótulos curtos dos tipos de envio (calculados na carga)
+            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Tipo_Envio'].astype(TIPO_TEXTO)
 
             # Filtros interativos para "Tipo de Envio" e "Informação Técnica" com múltipla seleção
             tipo_envio_opcoes = df_selection_filtered['Qual o tipo de envio?'].unique().tolist()
@@ -2234,7 +4158,7 @@ def visao_analista():
             # Tabela Geral com Estilos Aplicados
             st.markdown("<h3 style='text-align: center;'>Tabela Geral com Estilos</h3>", unsafe_allow_html=True)
             st.write("Visualização de dados filtrados com estilo condicional:")
-            styled_df_full = df_selection_filtered.style.apply(aplicar_estilos, axis=None)
+            styled_df_full = df_selection_filtered.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
 
             # Converte a tabela estilizada para HTML e exibe com st.write
             st.write(styled_df_full.to_html(), unsafe_allow_html=True)
@@ -2246,10 +4170,10 @@ def visao_analista():
             with st.expander("VISUALIZAÇÃO GERAL DOS DADOS"):
                 showData = st.multiselect(
                     'Filtrar: ',
-                    df_selection_filtered.columns,
+                    colunas_para_tabela(df_selection_filtered),
                     default=[
                         "Analista (você)", "Carimbo de data/hora",
-                        "Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)", 
+                        COLUNA_PROCESSO, 
                         "Tipo de Processo", "Qual o tipo de envio?",
                         "Tipo de empreendimento", "Quantidade de empreendimentos", "Informação Técnica", "Empresa",
                         "Revisado por", "Revisado em", "MÊS_envio", "ANO_envio", "Status do processo pós revisão"
@@ -2257,7 +4181,7 @@ def visao_analista():
                 )
                 
                 # Aplicação de estilo condicional na tabela filtrada e conversão para HTML
-                styled_df = df_selection_filtered[showData].style.apply(aplicar_estilos, axis=None)
+                styled_df = anexar_colunas(uploaded_file, df_selection_filtered, showData)[showData].style.apply(aplicar_estilos, axis=None)
                 st.write(styled_df.to_html(), unsafe_allow_html=True)
 
 
@@ -2279,7 +4203,7 @@ def visao_revisao():
     
     if uploaded_file is not None:
         # Carrega os dados do arquivo
-        df = load_data(uploaded_file)
+        df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Visão - Revisão"])
 
         st.markdown(
             "<h1 style='text-align: center; color: #98FF98; font-size: 42px; font-weight: bold; text-decoration: underline;'>Visão - Revisão</h1>",
@@ -2293,16 +4217,9 @@ def visao_revisao():
         st.subheader('Revisõs Totais Realizadas na Planilha de Revisão do NUPETR')
         # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
 
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'\bcancel(ad|ar)\b', case=False, na=False)]
+        df = df[~df['Envio_Cancelado']]
          
         if df is not None and not df.empty:
-            # Verifica se a coluna 'Revisado em' existe e converte para datetime
-            if 'Revisado em' in df.columns:
-                df['Revisado em'] = pd.to_datetime(df['Revisado em'], errors='coerce', dayfirst=True)
-
-            # Adiciona a coluna de semana a partir de 'Revisado em'
-            df['SEMANA_revisão'] = df['Revisado em'].dt.isocalendar().week.fillna(0).astype(int)
-
             # Converte colunas "ANO" e "MÊS" para numéricas, ignorando valores não numéricos
             df['ANO'] = pd.to_numeric(df['ANO'], errors='coerce').fillna(0).astype(int)
             df['MÊS'] = pd.to_numeric(df['MÊS'], errors='coerce').fillna(0).astype(int)
@@ -2328,46 +4245,45 @@ def visao_revisao():
             mes_default_revisão = [mes_atual] if mes_atual in meses_disponiveis_revisão else ["TODOS"]
             semana_default_revisão = ["TODOS"]
 
-            # Sidebar para seleção de ano, mês e semana
-            ano_revisão = st.sidebar.multiselect("SELECIONE O ANO", options=anos_disponiveis_revisão, default=ano_default_revisão)
-            mes_revisão = st.sidebar.multiselect("SELECIONE O MÊS", options=meses_disponiveis_revisão, default=mes_default_revisão)
-            semana_revisão = st.sidebar.multiselect(
+            # Sidebar para seleção de ano, mês e semana (compartilhada com as outras páginas)
+            ano_revisão = filtro_compartilhado('ano', 'revisao', st.sidebar, "SELECIONE O ANO", anos_disponiveis_revisão, ano_default_revisão)
+            mes_revisão = filtro_compartilhado('mes', 'revisao', st.sidebar, "SELECIONE O MÊS", meses_disponiveis_revisão, mes_default_revisão)
+            semana_revisão = filtro_compartilhado(
+                'semana', 'revisao', st.sidebar,
                 "SELECIONE A SEMANA",
-                options=semanas_disponiveis_revisão,
-                default=semana_default_revisão,
+                semanas_disponiveis_revisão,
+                semana_default_revisão,
                 format_func=lambda x: x[2] if isinstance(x, tuple) else x
             )
 
-            # Aplicando os filtros de ano, mês e semana ao DataFrame
-            df_selection = df
-            if "TODOS" not in ano_revisão:
-                df_selection = df_selection[df_selection['ANO'].isin(ano_revisão)]
-            if "TODOS" not in mes_revisão:
-                df_selection = df_selection[df_selection['MÊS'].isin(mes_revisão)]
-
-            # Verifica se "TODOS" não está selecionado para aplicar o filtro da semana
-            if "TODOS" not in semana_revisão:
-                semanas_selecionadas_revisão = [s[1] for s in semana_revisão if isinstance(s, tuple)]
-                df_selection = df_selection[df_selection['SEMANA_revisão'].isin(semanas_selecionadas_revisão)]
+            # Aplicando os filtros de ano, mês e semana ao DataFrame ("TODOS" deixa o filtro de fora)
+            selecoes = {
+                'ANO': None if "TODOS" in ano_revisão else ano_revisão,
+                'MÊS': None if "TODOS" in mes_revisão else mes_revisão,
+                'Revisado em': None if "TODOS" in semana_revisão else chaves_semanas(semana_revisão),
+            }
+            df_selection = indice_filtros(df).selecionar(df, selecoes)
 
+            # Revisões por tipo de envio, com as contagens de Informação Técnica (no banco, quando habilitado)
+            revisoes_agregadas = agregar_envios(uploaded_file, df_selection, ['Tipo_Envio'], selecoes)
             
             # Contagem de revisões totais e únicas baseadas no 'Codigo_Processo'
-            revisoes_totais = df_selection.shape[0]
+            revisoes_totais = int(revisoes_agregadas['Quantidade'].sum())
             # revisoes_totais_unicos = df_selection['Codigo_Processo'].nunique()
 
             # Contagem de revisões por tipo de envio
-            envios_por_tipo = df_selection['Qual o tipo de envio?'].value_counts()
+            envios_por_tipo = revisoes_agregadas.groupby('Tipo_Envio', observed=True)['Quantidade'].sum()
 
             # Envios de Prioridades
-            prioridades_totais = envios_por_tipo.get('Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)', 0)
+            prioridades_totais = envios_por_tipo.get('Prioridades', 0)
             # prioridades_unicos = df_selection[df_selection['Qual o tipo de envio?'] == 'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)']['Codigo_Processo'].nunique()
 
             # Envios de 1º Envio
-            primeiro_envio_totais = envios_por_tipo.get('1º envio (Primeira vez que o Parecer está sendo enviado para revisão)', 0)
+            primeiro_envio_totais = envios_por_tipo.get('1º Envio', 0)
             # primeiro_envio_unicos = df_selection[df_selection['Qual o tipo de envio?'] == '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)']['Codigo_Processo'].nunique()
 
             # Envios de Reenvios - Correções
-            reenvio_totais = envios_por_tipo.get('Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)', 0)
+            reenvio_totais = envios_por_tipo.get('Reenvio', 0)
             # reenvio_unicos = df_selection[df_selection['Qual o tipo de envio?'] == 'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)']['Codigo_Processo'].nunique()
 
             # Layout: 4 colunas para as contagens
@@ -2398,13 +4314,14 @@ def visao_revisao():
             # Seção para "Informação Técnica"
             st.subheader('Informação Técnica')
 
-            # Contagem de processos por tipo de "Informação Técnica"
-            it_rada = df_selection[df_selection['Informação Técnica'].str.contains('IT - RADA', na=False, case=False)].shape[0]
-            it_ipa = df_selection[df_selection['Informação Técnica'].str.contains('IT - IPA', na=False, case=False)].shape[0]
-            nao = df_selection[df_selection['Informação Técnica'].str.contains('Não', na=False, case=False)].shape[0]
-            it_fiscalizacao = df_selection[df_selection['Informação Técnica'].str.contains('IT - FISCALIZAÇÃO', na=False, case=False)].shape[0]
-            it_descumprimento = df_selection[df_selection['Informação Técnica'].str.contains('IT - Descumprimento de Condicionante', na=False, case=False)].shape[0]
-            it_outros = df_selection[df_selection['Informação Técnica'].str.contains('IT - Outros', na=False, case=False)].shape[0]
+            # Contagem de processos por categoria de "Informação Técnica" (calculada na carga)
+            contagem_it = revisoes_agregadas[list(COLUNAS_CONTEM_IT.values())].sum().set_axis(CATEGORIAS_IT)
+            it_rada = contagem_it.get('IT - RADA', 0)
+            it_ipa = contagem_it.get('IT - IPA', 0)
+            nao = contagem_it.get('Não', 0)
+            it_fiscalizacao = contagem_it.get('IT - FISCALIZAÇÃO', 0)
+            it_descumprimento = contagem_it.get('IT - Descumprimento de Condicionante', 0)
+            it_outros = contagem_it.get('IT - Outros', 0)
 
             # Layout para contagens de "Informação Técnica"
             col_it1, col_it2, col_it3, col_it4 = st.columns(4)
@@ -2447,21 +4364,14 @@ def visao_revisao():
             st.subheader('Contagem de Envios por Revisor')
 
             # Preenchendo valores ausentes na coluna 'Revisado por' e 'Qual o tipo de envio?' com valores padrão
-            df_selection['Revisado por'] = df_selection['Revisado por'].fillna('Desconhecido')
-            df_selection['Qual o tipo de envio?'] = df_selection['Qual o tipo de envio?'].fillna('Desconhecido')
-
-            # Simplifica as legendas no DataFrame
-            df_selection['Qual o tipo de envio?'] = df_selection['Qual o tipo de envio?'].replace({
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1º Envio',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridade',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvio'
-            })
+            df_selection['Revisado por'] = df_selection['Revisado por'].astype(TIPO_TEXTO).fillna('Desconhecido')
+            df_selection['Qual o tipo de envio?'] = df_selection['Tipo_Envio'].astype(TIPO_TEXTO).fillna('Desconhecido')
 
             # Contando revisões por tipo e por analista
             revisoes_por_tipo_analista = df_selection.groupby(['Revisado por', 'Qual o tipo de envio?']).size().unstack(fill_value=0)
 
             # Verificando se as colunas simplificadas para tipos de envio estão presentes
-            tipos_envio = ['1º Envio', 'Prioridade', 'Reenvio']
+            tipos_envio = list(TIPOS_ENVIO)
             for tipo in tipos_envio:
                 if tipo not in revisoes_por_tipo_analista.columns:
                     revisoes_por_tipo_analista[tipo] = 0  # Garante que a coluna exista com valor 0 caso esteja ausente
@@ -2490,10 +4400,10 @@ def visao_revisao():
             # Adicionando linha para a soma de "1º Envio" e "Prioridade" em dourado pontilhado
             fig_pareto.add_trace(go.Scatter(
                 x=revisoes_por_tipo_analista.index,
-                y=(revisoes_por_tipo_analista['1º Envio'] + revisoes_por_tipo_analista['Prioridade']),
+                y=(revisoes_por_tipo_analista['1º Envio'] + revisoes_por_tipo_analista['Prioridades']),
                 name='Soma 1º Envio e Prioridade',
                 mode='lines+markers+text',
-                text=(revisoes_por_tipo_analista['1º Envio'] + revisoes_por_tipo_analista['Prioridade']),
+                text=(revisoes_por_tipo_analista['1º Envio'] + revisoes_por_tipo_analista['Prioridades']),
                 textposition='top center',
                 line=dict(color='darkgoldenrod', width=3, dash='dot'),
                 marker=dict(size=8, color='darkgoldenrod'),
@@ -2567,7 +4477,7 @@ def visao_revisao():
             revisoes_por_mes_tipo['Total Mensal'] = revisoes_por_mes_tipo.sum(axis=1)
             revisoes_por_mes_tipo['Soma 1º Envio e Prioridades'] = (
                 revisoes_por_mes_tipo.get('1º Envio', 0) +
-                revisoes_por_mes_tipo.get('Prioridade', 0)
+                revisoes_por_mes_tipo.get('Prioridades', 0)
             )
 
             # Ordenando por índice do mês para manter a sequência cronológica
@@ -2655,23 +4565,6 @@ def visao_revisao():
 
 
 
-# Verifica se a coluna "Tipo de Processo" existe, se não, cria a coluna com a função de extração
-            if 'Tipo de Processo' not in df_selection.columns:
-                siglas_reconhecidas = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']
-                
-                # Função para extrair o tipo de processo
-                def extrair_tipo_processo(numero_processo):
-                    # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                    match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                    if match:
-                        sigla = match.group(1)
-                        # Verifica se a sigla extraída é uma das especificadas
-                        if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                            return sigla
-                    return 'Outros'
-                
-                df_selection['Tipo de Processo'] = df_selection['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Contando revisões por tipo de processo e analista
             revisoes_por_tipo_analista = df_selection.groupby(['Revisado por', 'Tipo de Processo']).size().unstack(fill_value=0)
 
@@ -2841,12 +4734,8 @@ def visao_revisao():
             # Subtítulo
             st.subheader('Desempenho do Revisor por Tipo de Envio')
 
-            # Simplifica as legendas no DataFrame
-            df_selection['Qual o tipo de envio?'] = df_selection['Qual o tipo de envio?'].replace({
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1° Envio',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridade',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvio'
-            })
+            # Rótulos curtos dos tipos de envio (calculados na carga)
+            df_selection['Qual o tipo de envio?'] = df_selection['Tipo_Envio'].astype(TIPO_TEXTO)
 
             # Organização em colunas para gráficos
             revisores = df_selection['Revisado por'].unique()
@@ -2954,33 +4843,12 @@ def visao_revisao():
             st.subheader(f'Processos Enviados - {revisor_selecionado}')
 
             # Função aprimorada para extrair o tipo de processo de acordo com diferentes padrões
-            # Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-
-            # Criando a coluna 'Tipo de Processo' aplicando a função de extração ao 'Número do Processo'
-            if 'Tipo de Processo' not in df_selection_filtered.columns:
-                df_selection_filtered['Tipo de Processo'] = df_selection_filtered[
-                    'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'
-                ].apply(extrair_tipo_processo)
-
-            # Remove as entradas que contêm "cancelado" em "Qual o tipo de envio?"
-            df_selection_filtered = df_selection_filtered[~df_selection_filtered['Qual o tipo de envio?'].str.contains('cancelado', case=False, na=False)]
-
-
-            # Simplifica os textos dos tipos de envio
-            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Qual o tipo de envio?'].replace({
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)': '1º Envio',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)': 'Prioridades',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)': 'Reenvio'
-            })
+            # Remove os envios cancelados
+            df_selection_filtered = df_selection_filtered[~df_selection_filtered['Envio_Cancelado']]
+
+
+            # Rótulos curtos dos tipos de envio (calculados na carga)
+            df_selection_filtered['Qual o tipo de envio?'] = df_selection_filtered['Tipo_Envio'].astype(TIPO_TEXTO)
 
             # Filtros interativos para "Tipo de Envio" e "Informação Técnica" com múltipla seleção
             tipo_envio_opcoes = df_selection_filtered['Qual o tipo de envio?'].unique().tolist()
@@ -3246,7 +5114,7 @@ def visao_revisao():
 
                 # Selecionar colunas para exibição e organizar em ordem alfabética e por tempo de correção em ordem decrescente
                 df_correcao_selecao = df_correcao[['Revisado por', 'Analista (você)',
-                                                'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)',
+                                                COLUNA_PROCESSO,
                                                 'Carimbo de data/hora', 'Revisado em', 'Foi corrigido há (dias)']]
                 df_correcao_selecao = df_correcao_selecao.sort_values(by=['Revisado por', 'Foi corrigido há (dias)'], ascending=[True, False])
 
@@ -3264,8 +5132,8 @@ def visao_revisao():
                 # Gráfico de Barras para Quantidade por Revisor
                 fig_barras = go.Figure(data=[
                     go.Bar(
-                        x=df_correcao['Revisado por'].value_counts().index,
-                        y=df_correcao['Revisado por'].value_counts().values,
+                        x=contar_valores(df_correcao['Revisado por']).index,
+                        y=contar_valores(df_correcao['Revisado por']).values,
                         marker_color="green"
                     )
                 ])
@@ -3357,7 +5225,7 @@ def visao_revisao():
             # Tabela Geral
             st.markdown("<h3 style='text-align: center;'>Tabela Geral</h3>", unsafe_allow_html=True)
             st.write("Visualização de dados filtrados:")
-            styled_df_full = df_selection.style.apply(aplicar_estilos, axis=None)
+            styled_df_full = df_selection.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_full, use_container_width=True)
 
             # Crie sua Tabela
@@ -3366,7 +5234,7 @@ def visao_revisao():
 
             # Filtra colunas existentes para usar como valores padrão
             default_columns = [
-                'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)',
+                COLUNA_PROCESSO,
                 "Qual o tipo de envio?", 
                 "Revisado por", 
                 "Revisado em",
@@ -3382,11 +5250,11 @@ def visao_revisao():
             with st.expander("VISUALIZAÇÃO GERAL DOS DADOS"):
                 showData = st.multiselect(
                     'Filtrar: ',
-                    df_selection.columns,
+                    colunas_para_tabela(df_selection),
                     default=default_columns
                 )
 
-                styled_df = df_selection[showData].style.apply(aplicar_estilos, axis=None)
+                styled_df = anexar_colunas(uploaded_file, df_selection, showData)[showData].style.apply(aplicar_estilos, axis=None)
                 st.dataframe(styled_df, use_container_width=True)
 
         else:
@@ -3407,7 +5275,7 @@ def resumo_envios():
     
     if uploaded_file is not None:
         # Carrega os dados do arquivo
-        df = load_data(uploaded_file)
+        df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Resumo de Envios"])
 
         # Título principal da seção
         st.markdown(
@@ -3416,34 +5284,13 @@ def resumo_envios():
         )
 
         # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'\bcancel(ad|ar)\b', case=False, na=False)]
+        df = df[~df['Envio_Cancelado']]
 
         # Espaçador ou linha de separação entre seções
         st.markdown("<hr style='border: 1px solid #ccc; margin-top: 20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
 
         # Verifica se o DataFrame contém dados
         if df is not None and not df.empty:
-            # Converte a coluna de data "Carimbo de data/hora" para o formato datetime
-            if 'Carimbo de data/hora' in df.columns:
-                df['Carimbo de data/hora'] = pd.to_datetime(df['Carimbo de data/hora'], errors='coerce', dayfirst=True)
-
-            # Verifica se a coluna "Tipo de Processo" existe, se não, cria a coluna com a função de extração
-            if 'Tipo de Processo' not in df.columns:
-                siglas_reconhecidas = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']
-                
-                # Função para extrair o tipo de processo
-                def extrair_tipo_processo(numero_processo):
-                    # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                    match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                    if match:
-                        sigla = match.group(1)
-                        # Verifica se a sigla extraída é uma das especificadas
-                        if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                            return sigla
-                    return 'Outros'
-                
-                df['Tipo de Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Define as variáveis para a data atual e o mês corrente
             hoje = datetime.now().date()
             mes_corrente = datetime.now().month
@@ -3453,7 +5300,8 @@ def resumo_envios():
             st.markdown("<h3 style='text-align: center;'>Filtros</h3>", unsafe_allow_html=True)
             col1_filter, col2_filter = st.columns(2)
             with col1_filter:
-                dias_disponiveis = sorted(df['Carimbo de data/hora'].dt.date.dropna().unique(), reverse=True)
+                datas = indice_datas(df, 'Carimbo de data/hora')
+                dias_disponiveis = datas.dias
                 default_dias = [hoje] if hoje in dias_disponiveis else []
                 dias_selecionados = st.multiselect(
                     "Selecione os Dias", 
@@ -3464,8 +5312,9 @@ def resumo_envios():
                 )
             
             with col2_filter:
-                meses_disponiveis = sorted(df['Carimbo de data/hora'].dt.to_period("M").dropna().unique(), reverse=True)
-                default_meses = [pd.Period(year=ano_corrente, month=mes_corrente, freq='M')] if pd.Period(year=ano_corrente, month=mes_corrente, freq='M') in meses_disponiveis else []
+                meses_disponiveis = datas.meses
+                mes_atual = date(ano_corrente, mes_corrente, 1)
+                default_meses = [mes_atual] if mes_atual in meses_disponiveis else []
                 meses_selecionados = st.multiselect(
                     "Selecione os Meses", 
                     options=meses_disponiveis, 
@@ -3475,7 +5324,7 @@ def resumo_envios():
                 )
 
             # Exibindo filtros adicionais para Tipo de Envio, Tipo de Processo e Informação Técnica
-            tipos_envio_opcoes = ["Todos"] + sorted(df[~df['Qual o tipo de envio?'].str.contains("CANCELADO", case=False)]['Qual o tipo de envio?'].dropna().unique())
+            tipos_envio_opcoes = ["Todos"] + sorted(df['Qual o tipo de envio?'].dropna().unique())
             tipos_processo_opcoes = ["Todos"] + sorted(df['Tipo de Processo'].dropna().unique())
             informacao_tecnica_opcoes = ["Todos"] + sorted(df['Informação Técnica'].dropna().unique())
 
@@ -3499,22 +5348,36 @@ def resumo_envios():
                 )
 
             # Aplicando filtros ao DataFrame, ignorando filtros "Todos"
-            if "Todos" not in tipos_envio_selecionados:
-                df = df[df['Qual o tipo de envio?'].isin(tipos_envio_selecionados)]
-            if "Todos" not in tipos_processo_selecionados:
-                df = df[df['Tipo de Processo'].isin(tipos_processo_selecionados)]
-            if "Todos" not in informacao_tecnica_selecionada:
-                df = df[df['Informação Técnica'].isin(informacao_tecnica_selecionada)]
-
-
+            selecoes = {
+                'Qual o tipo de envio?': None if "Todos" in tipos_envio_selecionados else tipos_envio_selecionados,
+                'Tipo de Processo': None if "Todos" in tipos_processo_selecionados else tipos_processo_selecionados,
+                'Informação Técnica': None if "Todos" in informacao_tecnica_selecionada else informacao_tecnica_selecionada,
+            }
+            linhas = indice_filtros(df).mascara(df, selecoes)
+            if not linhas.all():
+                df = df[linhas]
+
+            # Linhas (do DataFrame filtrado) dos dias e dos meses selecionados
+            nos_dias = datas.mascara_dias(dias_selecionados)[linhas]
+            nos_meses = datas.mascara_meses(meses_selecionados)[linhas]
+
+            # Envios dos dias e dos meses selecionados por analista, tipo de envio e tipo de processo (no banco, quando
+            # habilitado), usados nos totais e nos quadros
+            grupos = ['Analista (você)', 'Tipo_Envio', 'Tipo de Processo']
+            df_dias_selecionados = df[nos_dias]
+            envios_dia = agregar_envios(
+                uploaded_file, df_dias_selecionados, grupos, selecoes, {'Carimbo de data/hora': intervalos_dias(dias_selecionados)}
+            )
+            df_meses_selecionados = df[nos_meses]
+            envios_mes = agregar_envios(
+                uploaded_file, df_meses_selecionados, grupos, selecoes, {'Carimbo de data/hora': intervalos_meses(meses_selecionados)}
+            )
 
             # Calcula o total do(s) dia(s) selecionado(s)
-            df_dias_selecionados = df[df['Carimbo de data/hora'].dt.date.isin(dias_selecionados)]
-            total_dia = df_dias_selecionados.shape[0]
+            total_dia = int(envios_dia['Quantidade'].sum())
 
             # Calcula o total do(s) mês(es) selecionado(s)
-            df_meses_selecionados = df[df['Carimbo de data/hora'].dt.to_period("M").isin(meses_selecionados)]
-            total_mes = df_meses_selecionados.shape[0]
+            total_mes = int(envios_mes['Quantidade'].sum())
 
             # Definindo estilo customizado para métricas com múltiplas linhas
             def style_metric_box_multi(box_color, font_color, title, content):
@@ -3538,8 +5401,8 @@ def resumo_envios():
                 st.markdown(style_metric_box_multi("#D8F0D8", "black", "Total de Envios do Mês(es) Selecionado(s)", total_mes), unsafe_allow_html=True)
 
             # Exibindo o total de envios por cada analista para o dia e para o mês
-            totais_por_analista_dia = df_dias_selecionados.groupby("Analista (você)").size()
-            totais_por_analista_mes = df_meses_selecionados.groupby("Analista (você)").size()
+            totais_por_analista_dia = envios_dia.groupby("Analista (você)", observed=True)['Quantidade'].sum()
+            totais_por_analista_mes = envios_mes.groupby("Analista (você)", observed=True)['Quantidade'].sum()
 
             conteudo_dia = "<br>".join([f"{analista}: {total}" for analista, total in totais_por_analista_dia.items()])
             conteudo_mes = "<br>".join([f"{analista}: {total}" for analista, total in totais_por_analista_mes.items()])
@@ -3562,12 +5425,7 @@ def resumo_envios():
 
             # Definição de cores e tipos de envio com os nomes simplificados, utilizando a paleta Tealgrn
             cores = ['#66CDAA', '#98FB98', '#00FA9A'] 
-            tipos_envio = [
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)'
-            ]
-            nomes_legenda = ["1° Envio", "Prioridades", "Reenvios"]
+            tipos_envio = list(TIPOS_ENVIO)
 
             # Gráfico de Envios do Dia
             with col1:
@@ -3576,7 +5434,7 @@ def resumo_envios():
 
 
                 # Filtragem do DataFrame com base nos dias selecionados
-                df_dias_selecionados = df[df['Carimbo de data/hora'].dt.date.isin(dias_selecionados)]
+                df_dias_selecionados = df[nos_dias]
                 
         
                 # Verifica se há dados para o(s) dia(s) selecionado(s)
@@ -3584,9 +5442,11 @@ def resumo_envios():
                     st.warning("A base não contém dados para o dia selecionado. Selecione outro(s) dia(s).")
                 else:
                     # Agrupa os dados por tipo de envio e analista
-                    revisoes_dia = df_dias_selecionados.groupby(['Analista (você)', 'Qual o tipo de envio?']).size().unstack(fill_value=0).reset_index()
+                    revisoes_dia = envios_dia.pivot_table(
+                        index='Analista (você)', columns='Tipo_Envio', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     
-                    # Garante que as colunas dos tipos de envio estão presentes com os nomes completos
+                    # Garante que as colunas dos tipos de envio estão presentes
                     for tipo in tipos_envio:
                         if tipo not in revisoes_dia.columns:
                             revisoes_dia[tipo] = 0
@@ -3608,12 +5468,12 @@ def resumo_envios():
 
 
                     # Adiciona barras para cada tipo de envio com os nomes simplificados e rótulos de dados
-                    for tipo_envio, cor, nome_legenda in zip(tipos_envio, cores, nomes_legenda):
+                    for tipo_envio, cor in zip(tipos_envio, cores):
                         total_tipo_envio = int(totais_por_tipo_envio_dia[tipo_envio])  # Obtém o total e converte para inteiro
                         fig_revisoes_dia.add_trace(go.Bar(
                             x=revisoes_dia['Analista (você)'],
                             y=revisoes_dia[tipo_envio],
-                            name=f"{nome_legenda} ({total_tipo_envio})",  # Inclui o total na legenda
+                            name=f"{tipo_envio} ({total_tipo_envio})",  # Inclui o total na legenda
                             marker_color=cor,
                             yaxis='y1',
                             text=revisoes_dia[tipo_envio],  # Rótulo de dados
@@ -3676,39 +5536,26 @@ def resumo_envios():
 
 # Gráficos de Envios Diárias e Mensais por Tipo de Processo com estilo consistente
 
-            # Função aprimorada para extrair o tipo de processo, lidando com valores não-string
-            # Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-            # Adicionando coluna "Tipo de Processo" se ainda não existir
-            if 'Tipo de Processo' not in df.columns:
-                df['Tipo de Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Cores e tipos para o gráfico
             cores_processo = [
                 '#66CDAA', '#98FB98', '#00FA9A', '#d4f0e1', '#a8e6cf', '#81cfa9', '#b3e2d4', '#cce5ff', '#99d3ff', 
                 '#c3e8b0', '#fef9d7', '#fff7c1', '#fbf3d0', '#d2f1e1', '#9ad1e6', '#b5e0cc'
             ]
-            tipos_processo_legenda = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr' "Outros"]
+            tipos_processo_legenda = SIGLAS_TIPO_PROCESSO + ["Outros"]
 
             # Gráficos Diários e Mensais por Tipo de Processo com ordenação e totais na legenda
             for periodo, (df_tipo_processo, filtro_periodo, titulo) in {
-                'dia': (df[df['Carimbo de data/hora'].dt.date.isin(dias_selecionados)], col1, "Envios Diárias por Tipo de Processo"),
-                'mes': (df[df['Carimbo de data/hora'].dt.to_period("M").isin(meses_selecionados)], col2, "Envios Mensais por Tipo de Processo")
+                'dia': (envios_dia, col1, "Envios Diárias por Tipo de Processo"),
+                'mes': (envios_mes, col2, "Envios Mensais por Tipo de Processo")
             }.items():
 
                 with filtro_periodo:
                     st.markdown("<div class='custom-col'>", unsafe_allow_html=True)
                     st.subheader(titulo)
 
-                    df_tipo_processo = df_tipo_processo.groupby(['Analista (você)', 'Tipo de Processo']).size().unstack(fill_value=0).reset_index()
+                    df_tipo_processo = df_tipo_processo.pivot_table(
+                        index='Analista (você)', columns='Tipo de Processo', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     if not df_tipo_processo.empty:
                         # Calcula totais e organiza ordem
                         df_tipo_processo['Total'] = df_tipo_processo.select_dtypes(include=[int, float]).sum(axis=1)
@@ -3775,16 +5622,18 @@ def resumo_envios():
             # Gráfico de Envios do Mês
             with col2:
                 # Filtragem do DataFrame com base nos meses selecionados
-                df_meses_selecionados = df[df['Carimbo de data/hora'].dt.to_period("M").isin(meses_selecionados)]
+                df_meses_selecionados = df[nos_meses]
                 
                 # Verifica se há dados para o(s) mês(es) selecionado(s)
                 if df_meses_selecionados.empty:
                     st.warning("A base não contém dados para o mês selecionado. Selecione outro(s) mês(es).")
                 else:
                     # Agrupa os dados por tipo de envio e analista
-                    revisoes_mes = df_meses_selecionados.groupby(['Analista (você)', 'Qual o tipo de envio?']).size().unstack(fill_value=0).reset_index()
+                    revisoes_mes = envios_mes.pivot_table(
+                        index='Analista (você)', columns='Tipo_Envio', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     
-                    # Garante que as colunas dos tipos de envio estão presentes com os nomes completos
+                    # Garante que as colunas dos tipos de envio estão presentes
                     for tipo in tipos_envio:
                         if tipo not in revisoes_mes.columns:
                             revisoes_mes[tipo] = 0
@@ -3805,12 +5654,12 @@ def resumo_envios():
                     fig_revisoes_mes = go.Figure()
 
                     # Adiciona barras para cada tipo de envio com os nomes simplificados e valores totais na legenda
-                    for tipo_envio, cor, nome_legenda in zip(tipos_envio, cores, nomes_legenda):
+                    for tipo_envio, cor in zip(tipos_envio, cores):
                         total_tipo_envio = int(totais_por_tipo_envio[tipo_envio])  # Obtém o total e converte para inteiro
                         fig_revisoes_mes.add_trace(go.Bar(
                             x=revisoes_mes['Analista (você)'],
                             y=revisoes_mes[tipo_envio],
-                            name=f"{nome_legenda} ({total_tipo_envio})",  # Inclui o total na legenda
+                            name=f"{tipo_envio} ({total_tipo_envio})",  # Inclui o total na legenda
                             marker_color=cor,
                             yaxis='y1',
                             text=revisoes_mes[tipo_envio],  # Rótulo de dados
@@ -3890,14 +5739,14 @@ def resumo_envios():
 
             # Tabela de processos do dia
             st.markdown("<h3 style='text-align: center;'>Tabela de Processos do Dia Selecionado</h3>", unsafe_allow_html=True)
-            df_dia_selecionados = df[df['Carimbo de data/hora'].dt.date.isin(dias_selecionados)]
-            styled_df_dia = df_dia_selecionados.style.apply(aplicar_estilos, axis=None)
+            df_dia_selecionados = df[nos_dias]
+            styled_df_dia = df_dia_selecionados.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_dia, use_container_width=True)
 
             # Tabela de processos do mês
             st.markdown("<h3 style='text-align: center;'>Tabela de Processos do Mês Selecionado</h3>", unsafe_allow_html=True)
-            df_mes_selecionados = df[df['Carimbo de data/hora'].dt.to_period("M").isin(meses_selecionados)]
-            styled_df_mes = df_mes_selecionados.style.apply(aplicar_estilos, axis=None)
+            df_mes_selecionados = df[nos_meses]
+            styled_df_mes = df_mes_selecionados.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_mes, use_container_width=True)
 
 
@@ -3918,7 +5767,7 @@ def resumo_revisoes():
     
     if uploaded_file is not None:
         # Carrega os dados do arquivo
-        df = load_data(uploaded_file)
+        df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Resumo de Revisões"])
 
         # Título principal da seção
         st.markdown(
@@ -3927,35 +5776,13 @@ def resumo_revisoes():
         )
 
         # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'\bcancel(ad|ar)\b', case=False, na=False)]
+        df = df[~df['Envio_Cancelado']]
 
         # Espaçador ou linha de separação entre seções
         st.markdown("<hr style='border: 1px solid #ccc; margin-top: 20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
 
         # Verifica se o DataFrame contém dados
         if df is not None and not df.empty:
-            # Converte a coluna de data "Revisado em" para o formato datetime
-            if 'Revisado em' in df.columns:
-                df['Revisado em'] = pd.to_datetime(df['Revisado em'], errors='coerce', dayfirst=True)
-
-
-            # Verifica se a coluna "Tipo de Processo" existe, se não, cria a coluna com a função de extração
-            if 'Tipo de Processo' not in df.columns:
-                siglas_reconhecidas = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']
-                
-                # Função para extrair o tipo de processo
-                def extrair_tipo_processo(numero_processo):
-                    # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                    match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                    if match:
-                        sigla = match.group(1)
-                        # Verifica se a sigla extraída é uma das especificadas
-                        if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                            return sigla
-                    return 'Outros'
-                
-                df['Tipo de Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Define as variáveis para a data atual e o mês corrente
             hoje = datetime.now().date()
             mes_corrente = datetime.now().month
@@ -3965,7 +5792,9 @@ def resumo_revisoes():
             st.markdown("<h3 style='text-align: center;'>Filtros</h3>", unsafe_allow_html=True)
             col1_filter, col2_filter = st.columns(2)
             with col1_filter:
-                dias_disponiveis = sorted(df['Revisado em'].dt.date.dropna().unique(), reverse=True)
+                datas = indice_datas(df, 'Revisado em')
+                datas_envio = indice_datas(df, 'Carimbo de data/hora')
+                dias_disponiveis = datas.dias
                 default_dias = [hoje] if hoje in dias_disponiveis else []
                 dias_selecionados = st.multiselect(
                     "Selecione os Dias", 
@@ -3976,8 +5805,9 @@ def resumo_revisoes():
                 )
             
             with col2_filter:
-                meses_disponiveis = sorted(df['Revisado em'].dt.to_period("M").dropna().unique(), reverse=True)
-                default_meses = [pd.Period(year=ano_corrente, month=mes_corrente, freq='M')] if pd.Period(year=ano_corrente, month=mes_corrente, freq='M') in meses_disponiveis else []
+                meses_disponiveis = datas.meses
+                mes_atual = date(ano_corrente, mes_corrente, 1)
+                default_meses = [mes_atual] if mes_atual in meses_disponiveis else []
                 meses_selecionados = st.multiselect(
                     "Selecione os Meses", 
                     options=meses_disponiveis, 
@@ -3988,7 +5818,7 @@ def resumo_revisoes():
 
 
             # Exibindo filtros adicionais para Tipo de Envio, Tipo de Processo e Informação Técnica
-            tipos_envio_opcoes = ["Todos"] + sorted(df[~df['Qual o tipo de envio?'].str.contains("CANCELADO", case=False)]['Qual o tipo de envio?'].dropna().unique())
+            tipos_envio_opcoes = ["Todos"] + sorted(df['Qual o tipo de envio?'].dropna().unique())
             tipos_processo_opcoes = ["Todos"] + sorted(df['Tipo de Processo'].dropna().unique())
             informacao_tecnica_opcoes = ["Todos"] + sorted(df['Informação Técnica'].dropna().unique())
 
@@ -4012,20 +5842,38 @@ def resumo_revisoes():
                 )
 
             # Aplicando filtros ao DataFrame, ignorando filtros "Todos"
-            if "Todos" not in tipos_envio_selecionados:
-                df = df[df['Qual o tipo de envio?'].isin(tipos_envio_selecionados)]
-            if "Todos" not in tipos_processo_selecionados:
-                df = df[df['Tipo de Processo'].isin(tipos_processo_selecionados)]
-            if "Todos" not in informacao_tecnica_selecionada:
-                df = df[df['Informação Técnica'].isin(informacao_tecnica_selecionada)]
+            selecoes = {
+                'Qual o tipo de envio?': None if "Todos" in tipos_envio_selecionados else tipos_envio_selecionados,
+                'Tipo de Processo': None if "Todos" in tipos_processo_selecionados else tipos_processo_selecionados,
+                'Informação Técnica': None if "Todos" in informacao_tecnica_selecionada else informacao_tecnica_selecionada,
+            }
+            linhas = indice_filtros(df).mascara(df, selecoes)
+            if not linhas.all():
+                df = df[linhas]
+
+            # Linhas (do DataFrame filtrado) dos dias e dos meses selecionados
+            nos_dias = datas.mascara_dias(dias_selecionados)[linhas]
+            nos_meses = datas.mascara_meses(meses_selecionados)[linhas]
+            nos_dias_envio = datas_envio.mascara_dias(dias_selecionados)[linhas]
+
+            # Respostas enviadas nos dias selecionados e revisadas nos dias e nos meses selecionados, por revisor, tipo
+            # de envio e tipo de processo (no banco, quando habilitado), usadas nos totais e nos quadros
+            grupos = ['Revisado por', 'Tipo_Envio', 'Tipo de Processo']
+            df_dias_selecionados = df[nos_dias_envio]
+            envios_dia = agregar_envios(
+                uploaded_file, df_dias_selecionados, grupos, selecoes, {'Carimbo de data/hora': intervalos_dias(dias_selecionados)}
+            )
+            revisados_dia = agregar_envios(uploaded_file, df[nos_dias], grupos, selecoes, {'Revisado em': intervalos_dias(dias_selecionados)})
+            df_meses_selecionados = df[nos_meses]
+            revisados_mes = agregar_envios(
+                uploaded_file, df_meses_selecionados, grupos, selecoes, {'Revisado em': intervalos_meses(meses_selecionados)}
+            )
 
             # Calcula o total do(s) dia(s) selecionado(s)
-            df_dias_selecionados = df[df['Carimbo de data/hora'].dt.date.isin(dias_selecionados)]
-            total_dia = df_dias_selecionados.shape[0]
+            total_dia = int(envios_dia['Quantidade'].sum())
 
             # Calcula o total do(s) mês(es) selecionado(s)
-            df_meses_selecionados = df[df['Revisado em'].dt.to_period("M").isin(meses_selecionados)]
-            total_mes = df_meses_selecionados.shape[0]
+            total_mes = int(revisados_mes['Quantidade'].sum())
 
             # Definindo estilo customizado para métricas com múltiplas linhas
             def style_metric_box_multi(box_color, font_color, title, content):
@@ -4050,8 +5898,8 @@ def resumo_revisoes():
 
             # Exibindo o total de revisões por cada revisor para o dia e para o mês
             # Calculando os totais revisados por cada revisor no período selecionado
-            totais_por_revisor_dia = df_dias_selecionados.groupby("Revisado por").size()
-            totais_por_revisor_mes = df_meses_selecionados.groupby("Revisado por").size()
+            totais_por_revisor_dia = envios_dia.groupby("Revisado por", observed=True)['Quantidade'].sum()
+            totais_por_revisor_mes = revisados_mes.groupby("Revisado por", observed=True)['Quantidade'].sum()
 
             # Gerando o conteúdo formatado para exibição em uma única string
             conteudo_dia = "<br>".join([f"{revisor}: {total}" for revisor, total in totais_por_revisor_dia.items()])
@@ -4076,12 +5924,7 @@ def resumo_revisoes():
 
             # Definição de cores e tipos de envio com os nomes simplificados, utilizando a paleta Tealgrn
             cores = ['#66CDAA', '#98FB98', '#00FA9A'] 
-            tipos_envio = [
-                '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)',
-                'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)',
-                'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)'
-            ]
-            nomes_legenda = ["1° Envio", "Prioridades", "Reenvios"]
+            tipos_envio = list(TIPOS_ENVIO)
 
             # Gráfico de Enviados do Dia
             with col1:
@@ -4089,16 +5932,18 @@ def resumo_revisoes():
                 st.subheader("Revisões do Dia")
 
                 # Filtragem do DataFrame com base nos dias selecionados
-                df_dias_selecionados = df[df['Revisado em'].dt.date.isin(dias_selecionados)]
+                df_dias_selecionados = df[nos_dias]
                 
                 # Verifica se há dados para o(s) dia(s) selecionado(s)
                 if df_dias_selecionados.empty:
                     st.warning("A base não contém dados para o dia selecionado. Selecione outro(s) dia(s).")
                 else:
                     # Agrupa os dados por tipo de envio e analista
-                    revisoes_dia = df_dias_selecionados.groupby(['Revisado por', 'Qual o tipo de envio?']).size().unstack(fill_value=0).reset_index()
+                    revisoes_dia = revisados_dia.pivot_table(
+                        index='Revisado por', columns='Tipo_Envio', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     
-                    # Garante que as colunas dos tipos de envio estão presentes com os nomes completos
+                    # Garante que as colunas dos tipos de envio estão presentes
                     for tipo in tipos_envio:
                         if tipo not in revisoes_dia.columns:
                             revisoes_dia[tipo] = 0
@@ -4119,12 +5964,12 @@ def resumo_revisoes():
                     totais_por_tipo_envio_dia = revisoes_dia[tipos_envio].sum().to_dict()
 
                     # Adiciona barras para cada tipo de envio com os nomes simplificados e rótulos de dados
-                    for tipo_envio, cor, nome_legenda in zip(tipos_envio, cores, nomes_legenda):
+                    for tipo_envio, cor in zip(tipos_envio, cores):
                         total_tipo_envio = int(totais_por_tipo_envio_dia[tipo_envio])  # Obtém o total e converte para inteiro
                         fig_revisoes_dia.add_trace(go.Bar(
                             x=revisoes_dia['Revisado por'],
                             y=revisoes_dia[tipo_envio],
-                            name=f"{nome_legenda} ({total_tipo_envio})",  # Inclui o total na legenda
+                            name=f"{tipo_envio} ({total_tipo_envio})",  # Inclui o total na legenda
                             marker_color=cor,
                             yaxis='y1',
                             text=revisoes_dia[tipo_envio],  # Rótulo de dados
@@ -4196,16 +6041,18 @@ def resumo_revisoes():
             # Gráfico de Revisões do Mês
             with col2:
                 # Filtragem do DataFrame com base nos meses selecionados
-                df_meses_selecionados = df[df['Revisado em'].dt.to_period("M").isin(meses_selecionados)]
+                df_meses_selecionados = df[nos_meses]
                 
                 # Verifica se há dados para o(s) mês(es) selecionado(s)
                 if df_meses_selecionados.empty:
                     st.warning("A base não contém dados para o mês selecionado. Selecione outro(s) mês(es).")
                 else:
                     # Agrupa os dados por tipo de envio e analista
-                    revisoes_mes = df_meses_selecionados.groupby(['Revisado por', 'Qual o tipo de envio?']).size().unstack(fill_value=0).reset_index()
+                    revisoes_mes = revisados_mes.pivot_table(
+                        index='Revisado por', columns='Tipo_Envio', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     
-                    # Garante que as colunas dos tipos de envio estão presentes com os nomes completos
+                    # Garante que as colunas dos tipos de envio estão presentes
                     for tipo in tipos_envio:
                         if tipo not in revisoes_mes.columns:
                             revisoes_mes[tipo] = 0
@@ -4226,12 +6073,12 @@ def resumo_revisoes():
                     fig_revisoes_mes = go.Figure()
 
                     # Adiciona barras para cada tipo de envio com os nomes simplificados e valores totais na legenda
-                    for tipo_envio, cor, nome_legenda in zip(tipos_envio, cores, nomes_legenda):
+                    for tipo_envio, cor in zip(tipos_envio, cores):
                         total_tipo_envio = int(totais_por_tipo_envio[tipo_envio])  # Obtém o total e converte para inteiro
                         fig_revisoes_mes.add_trace(go.Bar(
                             x=revisoes_mes['Revisado por'],
                             y=revisoes_mes[tipo_envio],
-                            name=f"{nome_legenda} ({total_tipo_envio})",  # Inclui o total na legenda
+                            name=f"{tipo_envio} ({total_tipo_envio})",  # Inclui o total na legenda
                             marker_color=cor,
                             yaxis='y1',
                             text=revisoes_mes[tipo_envio],  # Rótulo de dados
@@ -4296,21 +6143,6 @@ def resumo_revisoes():
 
 # Gráficos de Revisões Diárias e Mensais por Tipo de Processo com estilo consistente
 
-            ## Função para extrair o tipo de processo
-            def extrair_tipo_processo(numero_processo):
-                # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-                match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-                if match:
-                    sigla = match.group(1)
-                    # Verifica se a sigla extraída é uma das especificadas
-                    if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                        return sigla
-                return 'Outros'
-
-            # Adicionando coluna "Tipo de Processo" se ainda não existir
-            if 'Tipo de Processo' not in df.columns:
-                df['Tipo de Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
             # Cores e tipos para o gráfico
             cores_processo = [
                 '#66CDAA', '#98FB98', '#00FA9A', '#d4f0e1', '#a8e6cf', '#81cfa9', '#b3e2d4', '#cce5ff', '#99d3ff', 
@@ -4319,15 +6151,17 @@ def resumo_revisoes():
 
             # Gráficos Diários e Mensais por Tipo de Processo com ordenação e totais na legenda
             for periodo, (df_tipo_processo, filtro_periodo, titulo) in {
-                'dia': (df[df['Revisado em'].dt.date.isin(dias_selecionados)], col1, "Revisões Diárias por Tipo de Processo"),
-                'mes': (df[df['Revisado em'].dt.to_period("M").isin(meses_selecionados)], col2, "Revisões Mensais por Tipo de Processo")
+                'dia': (revisados_dia, col1, "Revisões Diárias por Tipo de Processo"),
+                'mes': (revisados_mes, col2, "Revisões Mensais por Tipo de Processo")
             }.items():
 
                 with filtro_periodo:
                     st.markdown("<div class='custom-col'>", unsafe_allow_html=True)
                     st.subheader(titulo)
 
-                    df_tipo_processo = df_tipo_processo.groupby(['Revisado por', 'Tipo de Processo']).size().unstack(fill_value=0).reset_index()
+                    df_tipo_processo = df_tipo_processo.pivot_table(
+                        index='Revisado por', columns='Tipo de Processo', values='Quantidade', aggfunc='sum', fill_value=0, observed=True
+                    ).reset_index()
                     if not df_tipo_processo.empty:
                         # Calcula totais e organiza ordem
                         df_tipo_processo['Total'] = df_tipo_processo.select_dtypes(include=[int, float]).sum(axis=1)
@@ -4399,14 +6233,14 @@ def resumo_revisoes():
 
             # Tabela de processos do dia
             st.markdown("<h3 style='text-align: center;'>Tabela de Processos do Dia Selecionado</h3>", unsafe_allow_html=True)
-            df_dia_selecionados = df[df['Revisado em'].dt.date.isin(dias_selecionados)]
-            styled_df_dia = df_dia_selecionados.style.apply(aplicar_estilos, axis=None)
+            df_dia_selecionados = df[nos_dias]
+            styled_df_dia = df_dia_selecionados.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_dia, use_container_width=True)
 
             # Tabela de processos do mês
             st.markdown("<h3 style='text-align: center;'>Tabela de Processos do Mês Selecionado</h3>", unsafe_allow_html=True)
-            df_mes_selecionados = df[df['Revisado em'].dt.to_period("M").isin(meses_selecionados)]
-            styled_df_mes = df_mes_selecionados.style.apply(aplicar_estilos, axis=None)
+            df_mes_selecionados = df[nos_meses]
+            styled_df_mes = df_mes_selecionados.drop(columns=COLUNAS_AUXILIARES).style.apply(aplicar_estilos, axis=None)
             st.dataframe(styled_df_mes, use_container_width=True)
 
         else:
@@ -4429,16 +6263,30 @@ def analisar_tempos_revisao(df):
     # Remover processos com valores ausentes em 'Revisado em' ou 'Carimbo de data/hora'
     df = df.dropna(subset=['Revisado em', 'Carimbo de data/hora'])
 
-    # Converter colunas para apenas data, assumindo formato dia/mês/ano
-    df['Revisado em'] = pd.to_datetime(df['Revisado em'], dayfirst=True, errors='coerce').dt.date
-    df['Carimbo de data/hora'] = pd.to_datetime(df['Carimbo de data/hora'], dayfirst=True, errors='coerce').dt.date
+    # Calcular o tempo de revisão em dias corridos e em dias úteis
+    dias_corridos, dias_uteis = calcular_prazos(df['Carimbo de data/hora'], df['Revisado em'])
 
-    # Remover linhas com datas inválidas
-    df = df.dropna(subset=['Revisado em', 'Carimbo de data/hora'])
+    # Revisões com data anterior à do envio, conforme POLITICA_PRAZO_NEGATIVO
+    invertidos = dias_corridos < 0
+    if invertidos.any():
+        if POLITICA_PRAZO_NEGATIVO == 'excluir':
+            df, dias_corridos, dias_uteis = df[~invertidos], dias_corridos[~invertidos], dias_uteis[~invertidos]
+            st.caption(f"{invertidos.sum()} revisão(ões) com data anterior à do envio fora da análise.")
+        else:
+            dias_corridos, dias_uteis = np.maximum(dias_corridos, 0), np.maximum(dias_uteis, 0)
+            st.caption(f"{invertidos.sum()} revisão(ões) com data anterior à do envio contadas como 0 dias.")
+    df['Dias_Corridos'] = dias_corridos
+    df['Dias_Uteis'] = dias_uteis
 
-    # Calcular o tempo de revisão em dias
-    df['Tempo_Em_Revisao'] = df.apply(lambda row: (row['Revisado em'] - row['Carimbo de data/hora']).days 
-                                    if row['Revisado em'] >= row['Carimbo de data/hora'] else 0, axis=1)
+    # Contagem usada nos gráficos
+    contagem_dias = st.radio("Contagem do tempo de revisão", ["Dias corridos", "Dias úteis"], horizontal=True)
+    df['Tempo_Em_Revisao'] = df['Dias_Uteis'] if contagem_dias == "Dias úteis" else df['Dias_Corridos']
+
+    # Converter colunas para apenas data (já vêm como datetime da carga), depois de tirar do envio as chaves dos
+    # agrupamentos por semana e por mês
+    semanas_envio, meses_envio = chaves_semana_mes(df['Carimbo de data/hora'])
+    df['Revisado em'] = df['Revisado em'].dt.date
+    df['Carimbo de data/hora'] = df['Carimbo de data/hora'].dt.date
 
     # Verificar se existem dados válidos para 'Tempo_Em_Revisao'
     if df['Tempo_Em_Revisao'].notnull().any():
@@ -4479,9 +6327,9 @@ def analisar_tempos_revisao(df):
 
 
             # Gráfico de Linha Temporal (Média do Tempo de Revisão por Semana)
-            df['Ano_Semana'] = pd.to_datetime(df['Carimbo de data/hora'], dayfirst=True, errors='coerce').dt.to_period("W").apply(lambda r: r.start_time)
+            df['Ano_Semana'] = semanas_envio
             tempo_medio_semanal = df.groupby('Ano_Semana')['Tempo_Em_Revisao'].mean().round(2).reset_index()
-            tempo_medio_semanal['Ano_Semana_Label'] = tempo_medio_semanal['Ano_Semana'].dt.strftime('S%V-%m-%y')  # Formato SXX-MM-AA
+            tempo_medio_semanal['Ano_Semana_Label'] = rotulos_periodos(tempo_medio_semanal['Ano_Semana'], 'D', 'S%V-%m-%y')  # Formato SXX-MM-AA
 
             st.subheader('Média do Tempo de Revisão por Semana')
             fig_semanal = go.Figure()
@@ -4516,9 +6364,9 @@ def analisar_tempos_revisao(df):
             st.plotly_chart(fig_box, use_container_width=True)
 
             # Gráfico de Linha Temporal (Média de Tempo de Revisão por Mês, em formato horizontal)
-            df['Ano_Mes'] = pd.to_datetime(df['Carimbo de data/hora'], dayfirst=True, errors='coerce').dt.to_period("M").apply(lambda r: r.start_time)
+            df['Ano_Mes'] = meses_envio
             tempo_medio_mensal = df.groupby('Ano_Mes')['Tempo_Em_Revisao'].mean().round(2).reset_index()
-            tempo_medio_mensal['Ano_Mes_Label'] = tempo_medio_mensal['Ano_Mes'].dt.strftime('%m-%y')  # Formato MM-AA
+            tempo_medio_mensal['Ano_Mes_Label'] = rotulos_periodos(tempo_medio_mensal['Ano_Mes'], 'M', '%m-%y')  # Formato MM-AA
 
             st.subheader('Média do Tempo de Revisão por Mês')
             fig_mes = go.Figure()
@@ -4583,18 +6431,8 @@ def analisar_tempos_revisao(df):
         fig_empreendimento.update_layout(showlegend=False)
         st.plotly_chart(fig_empreendimento, use_container_width=True)
 
-        # Criar uma função para simplificar os rótulos
-        def simplificar_tipo_envio(tipo_envio):
-            if "1º envio" in tipo_envio:
-                return "1º Envio"
-            elif "Reenvio após correções" in tipo_envio:
-                return "Reenvio"
-            elif "Prioridades" in tipo_envio:
-                return "Prioridades"
-            return tipo_envio  # Caso não corresponda a nenhum dos padrões, manter o original
-
-        # Aplicar a função para simplificar os rótulos
-        df['Tipo de Envio Simplificado'] = df['Qual o tipo de envio?'].apply(simplificar_tipo_envio)
+        # Rótulos curtos dos tipos de envio (calculados na carga)
+        df['Tipo de Envio Simplificado'] = df['Tipo_Envio'].astype(TIPO_TEXTO)
 
         # Gráfico de Média de Tempo de Revisão por Tipo de Envio
         st.subheader('Média do Tempo de Revisão por Tipo de Envio')
@@ -4631,42 +6469,50 @@ def analisar_tempos_revisao(df):
 
         # Tabela de Análise dos Tempos de Revisão
         st.subheader('Tabela de Análise dos Tempos de Revisão')
-        st.write(df[['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)', 
+        st.write(df[[COLUNA_PROCESSO, 
                      'Codigo_Processo', 'Analista (você)', 'Revisado por', 'Carimbo de data/hora', 
-                     'Revisado em', 'Tempo_Em_Revisao', 'Tipo de Processo', 'Tipo de empreendimento', 
+                     'Revisado em', 'Dias_Corridos', 'Dias_Uteis', 'Tipo de Processo', 'Tipo de empreendimento', 
                      'Qual o tipo de envio?', 'Informação Técnica']])
     else:
         st.warning("Não há dados suficientes para calcular os tempos de revisão.")
 
 
 
+# Ciclo de vida dos processos da seleção, com a linha do tempo de um processo informado
+def exibir_ciclo_processos(ciclo, df_selection):
+    st.subheader('Ciclo de Vida dos Processos')
+    tabela = ciclo.tabela(df_selection['Codigo_Processo'])
+    if tabela.empty:
+        st.warning("Não há processos identificados na seleção.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Processos", len(tabela))
+    col2.metric("Com reenvio", int((tabela['Ciclos'] > 1).sum()))
+    col3.metric("Média de ciclos", f"{tabela['Ciclos'].mean():.2f}")
+    col4.metric("Média de dias (1º envio à última revisão)", f"{tabela['Dias_Totais'].mean():.1f}")
+    st.write(tabela.sort_values(['Ciclos', 'Dias_Totais'], ascending=False))
+
+    codigo = st.text_input("Linha do tempo do processo (código de 6 dígitos)").strip()
+    if codigo:
+        resumo = ciclo.resumo(codigo)
+        if resumo is None:
+            st.warning(f"Processo {codigo} não encontrado na base.")
+        else:
+            st.caption(f"{resumo['ciclos']} ciclo(s), {resumo['dias']:.1f} dias desde o 1º envio; situação atual: {resumo['situacao']}")
+            st.write(ciclo.eventos(codigo))
+
+
 def analise_tempos():
     # Carrega os dados do arquivo
-    df = load_data(uploaded_file)
+    df = load_data(uploaded_file, COLUNAS_POR_PAGINA["Análise dos Tempos e Estatísticas"])
     
     if df is not None and not df.empty:
-        # Filtrar o DataFrame para remover processos contendo qualquer variação de "cancelado" ou "cancelar"
-        df = df[~df['Qual o tipo de envio?'].str.contains(r'cancelado|cancelar', case=False, na=False)]
-
-        # Função para extrair o tipo de processo
-        def extrair_tipo_processo(numero_processo):
-            # Usa uma expressão regular que captura qualquer uma das variações de separador ou sem separador
-            match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
-            if match:
-                sigla = match.group(1)
-                # Verifica se a sigla extraída é uma das especificadas
-                if sigla in ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']:
-                    return sigla
-            return 'Outros'
-
-        # Aplicando a função para criar a coluna 'Tipo de Processo'
-        df['Tipo de Processo'] = df['Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'].apply(extrair_tipo_processo)
-
-        # Garantir que 'Carimbo de data/hora' está em formato datetime
-        df['Carimbo de data/hora'] = pd.to_datetime(df['Carimbo de data/hora'], dayfirst=True, errors='coerce')
-        df['ANO_envio'] = df['Carimbo de data/hora'].dt.year
-        df['MÊS_envio'] = df['Carimbo de data/hora'].dt.month
-        df['SEMANA_envio'] = df['Carimbo de data/hora'].dt.isocalendar().week
+        # Índice do ciclo de vida dos processos, sobre a base inteira
+        ciclo = ciclo_processos(df)
+
+        # Filtrar o DataFrame para remover processos "cancelados" e "cancelar"
+        df = df[~df['Envio_Cancelado']]
 
         # Aplicar função de criação do código do processo
         df = criar_codigo_processo(df)
@@ -4679,47 +6525,76 @@ def analise_tempos():
         mes_default = [datetime.now().month] if datetime.now().month in meses_disponiveis_envio else ["Todos"]
         semana_default = [("Todos", "Todos", "Todos")]
 
-        # Sidebar para seleção de Ano, Mês e Semana
-        ano = st.sidebar.multiselect("SELECIONE O ANO", options=anos_disponiveis_envio, default=ano_default)
-        mes = st.sidebar.multiselect("SELECIONE O MÊS", options=meses_disponiveis_envio, default=mes_default)
-        semana = st.sidebar.multiselect(
+        # Sidebar para seleção de Ano, Mês e Semana (compartilhada com as outras páginas)
+        ano = filtro_compartilhado('ano', 'tempos', st.sidebar, "SELECIONE O ANO", anos_disponiveis_envio, ano_default)
+        mes = filtro_compartilhado('mes', 'tempos', st.sidebar, "SELECIONE O MÊS", meses_disponiveis_envio, mes_default)
+        semana = filtro_compartilhado(
+            'semana', 'tempos', st.sidebar,
             "SELECIONE A SEMANA", 
-            options=semanas_disponiveis_envio, 
-            default=semana_default, 
+            semanas_disponiveis_envio, 
+            semana_default, 
             format_func=lambda x: x[2] if isinstance(x, tuple) else str(x)
         )
 
-        # Aplicando os filtros de ano, mês e semana ao DataFrame
-        df_selection = df
-        if "Todos" not in ano:
-            df_selection = df_selection[df_selection['ANO_envio'].isin(ano)]
-        if "Todos" not in mes:
-            df_selection = df_selection[df_selection['MÊS_envio'].isin(mes)]
-        if ("Todos", "Todos", "Todos") not in semana:
-            semanas_selecionadas = [s[1] for s in semana if isinstance(s, tuple)]
-            df_selection = df_selection[df_selection['SEMANA_envio'].isin(semanas_selecionadas)]
+        # Filtros de ano, mês e semana ("Todos" deixa o filtro de fora)
+        indice = indice_filtros(df)
+        selecoes = {
+            'ANO_envio': None if "Todos" in ano else ano,
+            'MÊS_envio': None if "Todos" in mes else mes,
+            'Carimbo de data/hora': None if ("Todos", "Todos", "Todos") in semana else chaves_semanas(semana),
+        }
+        no_periodo = indice.mascara(df, selecoes)
 
         # Filtros de Tipo de Envio, Tipo de Processo e Informação Técnica na interface principal
-        tipo_envio_opcoes = ["Todos"] + df_selection['Qual o tipo de envio?'].unique().tolist()
-        tipo_processo_opcoes = ["Todos"] + df_selection['Tipo de Processo'].unique().tolist()
-        informacao_tecnica_opcoes = ["Todos"] + df_selection['Informação Técnica'].unique().tolist()
+        tipo_envio_opcoes = ["Todos"] + df.loc[no_periodo, 'Qual o tipo de envio?'].unique().tolist()
+        tipo_processo_opcoes = ["Todos"] + df.loc[no_periodo, 'Tipo de Processo'].unique().tolist()
+        informacao_tecnica_opcoes = ["Todos"] + df.loc[no_periodo, 'Informação Técnica'].unique().tolist()
 
         tipo_envio_selecionado = st.multiselect("Filtrar por Tipo de Envio", options=tipo_envio_opcoes, default="Todos")
         tipo_processo_selecionado = st.multiselect("Filtrar por Tipo de Processo", options=tipo_processo_opcoes, default="Todos")
-        informacao_tecnica_selecionada = st.multiselect("Filtrar por Informação Técnica", options=informacao_tecnica_opcoes, default="Todos")
+        informacao_tecnica_selecionada = filtro_compartilhado('it', 'tempos', st, "Filtrar por Informação Técnica", informacao_tecnica_opcoes, ["Todos"])
 
-        # Aplicar filtros ao DataFrame final
-        if "Todos" not in tipo_envio_selecionado:
-            df_selection = df_selection[df_selection['Qual o tipo de envio?'].isin(tipo_envio_selecionado)]
-        if "Todos" not in tipo_processo_selecionado:
-            df_selection = df_selection[df_selection['Tipo de Processo'].isin(tipo_processo_selecionado)]
-        if "Todos" not in informacao_tecnica_selecionada:
-            df_selection = df_selection[df_selection['Informação Técnica'].isin(informacao_tecnica_selecionada)]
+        # Aplicar todos os filtros ao DataFrame final
+        selecoes['Qual o tipo de envio?'] = None if "Todos" in tipo_envio_selecionado else tipo_envio_selecionado
+        selecoes['Tipo de Processo'] = None if "Todos" in tipo_processo_selecionado else tipo_processo_selecionado
+        selecoes['Informação Técnica'] = None if "Todos" in informacao_tecnica_selecionada else informacao_tecnica_selecionada
+        df_selection = indice.selecionar(df, selecoes)
 
         # Chamar a função de análise de tempos de revisão
         analisar_tempos_revisao(df_selection)
+
+        # Ciclo de vida dos processos selecionados
+        exibir_ciclo_processos(ciclo, df_selection)
     else:
         st.warning("Carregue a base no Sidebar ao lado.")
 
+# Fontes de dados da sessão: os arquivos enviados ou, sem upload, a planilha do link informado ou os CSVs do
+# diretório local monitorado
+def obter_fontes(arquivos_enviados, url):
+    if arquivos_enviados:
+        return [FonteUpload(arquivo) for arquivo in arquivos_enviados]
+    if url:
+        fonte = FonteHTTP(url_exportacao_csv(url), obter_cliente_http())
+        try:
+            situacao = fonte.verificar()
+        except requests.RequestException as erro:
+            st.sidebar.error(f"Não foi possível baixar a planilha do link: {erro}")
+            return None
+        st.sidebar.caption(f"Planilha do link: {situacao}")
+        return [fonte]
+    if os.path.isdir(DIRETORIO_DADOS):
+        return arquivos_diretorio_dados()
+    return None
+
+
+# Nos processos de leitura em paralelo (LeituraParalela), que importam o módulo só pelas funções de processamento,
+# nenhuma fonte é aberta: nem link, nem diretório monitorado, nem banco
+if multiprocessing.parent_process() is None:
+    uploaded_file = obter_fontes(uploaded_file, url_dados)
+
+    # Com o banco de dados habilitado, as fontes carregadas são gravadas nele e as páginas leem do banco
+    if obter_banco() is not None:
+        uploaded_file = sincronizar_banco(obter_banco(), uploaded_file or [])
+
 if __name__ == "__main__":
     main()
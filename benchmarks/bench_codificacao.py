@@ -0,0 +1,51 @@
+# Leitura de CSVs grandes em utf-8 e latin1: tentativa em utf-8 com novo parse em latin1 quando falha (leitura
+# anterior) x detectar_codificacao (validação do arquivo inteiro) + um único parse. Uso: python benchmarks/bench_codificacao.py [linhas]
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Plan_rev as plan  # noqa: E402
+
+
+def ler_antigo(dados):
+    try:
+        return pd.read_csv(io.BytesIO(dados), encoding='utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return pd.read_csv(io.BytesIO(dados), encoding='latin1'), 'latin1'
+
+
+def ler_novo(dados):
+    codificacao = plan.detectar_codificacao(dados)
+    return pd.read_csv(io.BytesIO(dados), encoding=codificacao), codificacao
+
+
+def gerar_csv(linhas, cabecalho, final=''):
+    linha = '01/02/2025 10:00:00,Ana,100746/2023-TEC/LP,Primeiro envio,IT - RADA,Empresa X,Loteamento,1\n'
+    return cabecalho + linha * linhas + final
+
+
+def medir(funcao, dados, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _, codificacao = funcao(dados)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), codificacao
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cabecalho = 'Carimbo de data/hora,Analista (você),Número,Tipo de envio,Informação Técnica,Empresa,Tipo,Quantidade\n'
+    arquivos = {
+        'utf-8': gerar_csv(linhas, cabecalho).encode('utf-8'),
+        'latin1 (cabeçalho)': gerar_csv(linhas, cabecalho).encode('latin1'),
+        'latin1 (só no fim)': gerar_csv(linhas, cabecalho.replace('ê', 'e').replace('ú', 'u').replace('ç', 'c').replace('ã', 'a'), 'x,Conceição\n').encode('latin1'),
+    }
+    for nome, dados in arquivos.items():
+        tempo_antigo, _ = medir(ler_antigo, dados)
+        tempo_novo, codificacao = medir(ler_novo, dados)
+        print(f"{nome:20} {len(dados) / 1e6:6.0f} MB | antes: {tempo_antigo:.2f} s | agora: {tempo_novo:.2f} s ({codificacao})")
@@ -0,0 +1,41 @@
+# Conversão das colunas de data de uma exportação sintética: pd.to_datetime com inferência (dayfirst=True, como as
+# páginas faziam a cada rerun) x converter_datas (cada valor distinto uma vez, pelos FORMATOS_DATA).
+# Uso: python benchmarks/bench_datas.py [linhas]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Plan_rev as plan  # noqa: E402
+from dados import gerar_csv  # noqa: E402
+
+
+def medir(funcao, repeticoes=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000, resultado
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    diretorio = tempfile.mkdtemp()
+    caminho = os.path.join(diretorio, 'exportacao.csv')
+    gerar_csv(caminho, linhas)
+    df = pd.read_csv(caminho, dtype=str)
+    shutil.rmtree(diretorio, ignore_errors=True)
+
+    for coluna in plan.COLUNAS_DATA:
+        valores = df[coluna]
+        tempo_inferencia, inferidas = medir(lambda: pd.to_datetime(valores, dayfirst=True, errors='coerce'))
+        tempo_formatos, (convertidas, _) = medir(lambda: plan.converter_datas(valores))
+        iguais = inferidas.astype(plan.TIPO_DATA).equals(convertidas)
+        print(
+            f"{coluna} ({valores.nunique()} distintos): inferência {tempo_inferencia:.0f} ms"
+            f" | converter_datas {tempo_formatos:.0f} ms | resultados iguais: {iguais}"
+        )
@@ -0,0 +1,40 @@
+# Construção de uma dimensão do índice de filtros em 1 milhão de linhas, para poucos e muitos valores distintos: um
+# bitmap por valor montado com uma comparação por valor (versão anterior) x posições agrupadas pelos códigos do
+# factorize em uma única passada. Uso: python benchmarks/bench_indice_filtros.py [linhas]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Plan_rev as plan  # noqa: E402
+
+
+def bitmaps_por_valor(serie):
+    codigos, valores = pd.factorize(serie, use_na_sentinel=False)
+    bitmaps = np.empty((len(valores), (len(serie) + 7) // 8), dtype=np.uint8)
+    for posicao in range(len(valores)):
+        bitmaps[posicao] = np.packbits(codigos == posicao)
+    return bitmaps
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    for distintos in (5, 300, 3000):
+        df = pd.DataFrame({'Empresa': pd.Series([f'Empresa {i}' for i in rng.integers(0, distintos, linhas)], dtype='str')})
+
+        inicio = time.perf_counter()
+        bitmaps = bitmaps_por_valor(df['Empresa'])
+        tempo_anterior = time.perf_counter() - inicio
+
+        indice = plan.IndiceFiltros(linhas, 2 ** 40)
+        inicio = time.perf_counter()
+        indice.mascara(df, {'Empresa': ['Empresa 1']})
+        tempo_atual = time.perf_counter() - inicio
+        print(
+            f"{distintos:5} valores | por valor: {tempo_anterior:.2f} s, {bitmaps.nbytes / 2 ** 20:.0f} MB"
+            f" | uma passada (com a 1ª seleção): {tempo_atual:.2f} s, {indice._total_bytes / 2 ** 20:.0f} MB"
+        )
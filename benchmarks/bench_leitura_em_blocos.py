@@ -0,0 +1,49 @@
+# Pico de memória (RssAnon, Linux) e tempo da carga de uma exportação grande com as colunas de uma página, lida em
+# blocos do próprio arquivo para o snapshot. Uso: python benchmarks/bench_leitura_em_blocos.py [linhas] (padrão: 5 milhões)
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+DIRETORIO = tempfile.mkdtemp()
+os.environ.setdefault('NUPETR_SNAPSHOT_DIR', os.path.join(DIRETORIO, 'snapshots'))
+os.environ.setdefault('NUPETR_BLOCOS_MB', '50')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Plan_rev as plan  # noqa: E402
+from dados import gerar_csv  # noqa: E402
+
+
+def memoria_anonima_mb():
+    with open('/proc/self/status') as status:
+        for linha in status:
+            if linha.startswith('RssAnon'):
+                return int(linha.split()[1]) // 1024
+    return 0
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    caminho = os.path.join(DIRETORIO, 'exportacao.csv')
+    gerar_csv(caminho, linhas)
+
+    pico, terminou = [0], threading.Event()
+
+    def amostrar():
+        while not terminou.is_set():
+            pico[0] = max(pico[0], memoria_anonima_mb())
+            time.sleep(0.02)
+
+    antes = memoria_anonima_mb()
+    amostragem = threading.Thread(target=amostrar)
+    amostragem.start()
+    inicio = time.perf_counter()
+    df = plan.obter_base(plan.FonteLocal(caminho), plan.COLUNAS_POR_PAGINA['Análise dos Tempos e Estatísticas'])
+    tempo = time.perf_counter() - inicio
+    terminou.set()
+    amostragem.join()
+    print(f"{os.path.getsize(caminho) / 1e6:.0f} MB, {df.shape[0]} linhas x {df.shape[1]} colunas: {tempo:.1f} s")
+    print(f"pico +{pico[0] - antes} MB | depois +{memoria_anonima_mb() - antes} MB")
+    shutil.rmtree(DIRETORIO, ignore_errors=True)
@@ -0,0 +1,66 @@
+# Carga de várias exportações de uma vez (ex.: uma por ano): processamento em sequência x nos processos de leitura em
+# paralelo (LeituraParalela), com os processos já iniciados e contando a partida (spawn). Uso:
+# python benchmarks/bench_leitura_paralela.py [arquivos] [linhas por arquivo]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+DIRETORIO = tempfile.mkdtemp()
+os.environ.setdefault('NUPETR_SNAPSHOT_DIR', os.path.join(DIRETORIO, 'snapshots'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Plan_rev as plan  # noqa: E402
+from dados import gerar_csv  # noqa: E402
+
+
+def limpar_snapshots():
+    shutil.rmtree(plan.DIRETORIO_SNAPSHOTS, ignore_errors=True)
+
+
+def em_sequencia(arquivos):
+    for fonte, chave in arquivos:
+        plan.processar_arquivo(fonte, chave, colunas=[])
+
+
+def em_paralelo(leitura, arquivos):
+    situacoes = leitura.processar(arquivos)
+    assert situacoes == ['pronto'] * len(arquivos), situacoes
+
+
+if __name__ == '__main__':
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    linhas = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    arquivos = []
+    for indice in range(quantidade):
+        caminho = os.path.join(DIRETORIO, f'exportacao_{indice}.csv')
+        gerar_csv(caminho, linhas, semente=indice)
+        arquivos.append((plan.FonteLocal(caminho), plan.hash_fonte(caminho)))
+    maior = max(os.path.getsize(fonte.caminho) for fonte, _ in arquivos) / 1e6
+
+    limpar_snapshots()
+    inicio = time.perf_counter()
+    em_sequencia(arquivos[:1])
+    tempo_um = time.perf_counter() - inicio
+
+    limpar_snapshots()
+    inicio = time.perf_counter()
+    em_sequencia(arquivos)
+    tempo_sequencia = time.perf_counter() - inicio
+
+    leitura = plan.LeituraParalela(min(quantidade, os.cpu_count() or 1), plan.TIMEOUT_LEITURA_PARALELA_S)
+    limpar_snapshots()
+    inicio = time.perf_counter()
+    em_paralelo(leitura, arquivos)
+    tempo_partida = time.perf_counter() - inicio
+
+    limpar_snapshots()
+    inicio = time.perf_counter()
+    em_paralelo(leitura, arquivos)
+    tempo_paralelo = time.perf_counter() - inicio
+
+    print(f"{quantidade} arquivos de {linhas} linhas (até {maior:.0f} MB), {leitura.processos} processos")
+    print(f"um arquivo: {tempo_um:.2f} s | em sequência: {tempo_sequencia:.2f} s")
+    print(f"em paralelo: {tempo_paralelo:.2f} s (com a partida dos processos: {tempo_partida:.2f} s)")
+    shutil.rmtree(DIRETORIO, ignore_errors=True)
@@ -0,0 +1,51 @@
+# Classificação do tipo de processo em 1 milhão de números: extrair_tipo_processo linha a linha (.apply, como nas
+# páginas antes de classificar_tipo_processo) x classificar_tipo_processo. Uso: python benchmarks/bench_tipo_processo.py [linhas]
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Plan_rev as plan  # noqa: E402
+
+
+def extrair_tipo_processo(numero_processo):
+    match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
+    if match:
+        sigla = match.group(1)
+        if sigla in plan.SIGLAS_TIPO_PROCESSO:
+            return sigla
+    return 'Outros'
+
+
+def numeros_processo(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    siglas = np.array(plan.SIGLAS_TIPO_PROCESSO + ['XYZ'])
+    separadores = np.array(['/', '-', '', '--'])
+    numeros = pd.Series(rng.integers(100000, 999999, linhas).astype(str)) + '/' + pd.Series(rng.integers(2019, 2026, linhas).astype(str))
+    numeros = numeros + '-TEC' + separadores[rng.integers(0, len(separadores), linhas)] + siglas[rng.integers(0, len(siglas), linhas)]
+    reenvios = rng.random(linhas) < 0.1
+    numeros[reenvios] = 'A-CORRIGIDO-' + numeros[reenvios]
+    return numeros
+
+
+def medir(funcao, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    numeros = numeros_processo(linhas)
+    tempo_apply, antigo = medir(lambda: numeros.apply(extrair_tipo_processo))
+    tempo_vetorizado, novo = medir(lambda: plan.classificar_tipo_processo(numeros))
+    print(f"{linhas} linhas, {numeros.nunique()} distintas")
+    print(f"apply: {tempo_apply:.2f} s | classificar_tipo_processo: {tempo_vetorizado:.2f} s")
+    print(f"diferenças: {(antigo.to_numpy() != novo.to_numpy()).sum()}")
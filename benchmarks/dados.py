@@ -0,0 +1,46 @@
+# Exportação sintética do formulário, com as mesmas colunas e formatos da planilha, usada pelos benchmarks
+import csv
+import datetime as dt
+import random
+
+COLUNA_PROCESSO = 'Número do Processo a ser revisado (Caso seja Reenvio, coloque a Inicial do revisor-CORRIGIDO-NúmeroDoProcesso)'
+COLUNAS = [
+    'Carimbo de data/hora', 'Analista (você)', COLUNA_PROCESSO, 'Qual o tipo de envio?', 'Informação Técnica', 'Empresa',
+    'Tipo de empreendimento', 'Quantidade de empreendimentos', 'Observações', 'Revisado em', 'Revisado por',
+    'Status do processo pós revisão', 'ANO', 'MÊS',
+]
+TIPOS_ENVIO = [
+    '1º envio (Primeira vez que o Parecer está sendo enviado para revisão)',
+    'Prioridades (Tarja amarela no Cerberus, LP, Lpper, LI, LIO, primeira LO, LRO, LA, AE, ATO ou solicitação da supervisão)',
+    'Reenvio após correções (Parecer que já foi revisado e feitas as correções por você)',
+    'Cancelado',
+]
+INFORMACOES_TECNICAS = ['Não', 'IT - RADA', 'IT - IPA', 'IT - FISCALIZAÇÃO', 'IT - Descumprimento de Condicionante', 'IT - Outros']
+SIGLAS = ['LP', 'LI', 'LO', 'LRO', 'RLO', 'LS', 'ATO', 'XX', 'LPpe']
+ANALISTAS = ['Ana', 'Bruno', 'Carla', 'Davi', 'Érica']
+REVISORES = ['Fábio', 'Gil', 'Helena']
+EMPRESAS = ['Petrobras', 'Potiguar', '3R', 'Outra']
+EMPREENDIMENTOS = ['Poço', 'Duto', 'Estação', 'Sonda', 'Base', 'Tanque', 'Linha', 'Bateria', 'Outro']
+
+
+def gerar_csv(caminho, linhas, codificacao='utf-8', semente=0):
+    aleatorio = random.Random(semente)
+    inicio = dt.datetime(2024, 11, 20)
+    with open(caminho, 'w', newline='', encoding=codificacao) as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(COLUNAS)
+        for _ in range(linhas):
+            envio = inicio + dt.timedelta(minutes=aleatorio.randint(0, 60 * 24 * 700))
+            separador = '/' if aleatorio.random() < 0.5 else '-'
+            processo = f"{aleatorio.randint(100000, 100000 + linhas // 3 + 10)}/2023-TEC{separador}{aleatorio.choice(SIGLAS)}"
+            tipo = aleatorio.choice(TIPOS_ENVIO)
+            if tipo.startswith('Reenvio'):
+                processo = f"AB-CORRIGIDO-{processo}"
+            revisao = envio + dt.timedelta(days=aleatorio.randint(-1, 20)) if aleatorio.random() < 0.8 else None
+            escritor.writerow([
+                envio.strftime('%d/%m/%Y %H:%M:%S'), aleatorio.choice(ANALISTAS), processo, tipo,
+                aleatorio.choice(INFORMACOES_TECNICAS), aleatorio.choice(EMPRESAS), aleatorio.choice(EMPREENDIMENTOS),
+                aleatorio.randint(1, 5), 'obs "x", ção',
+                revisao.strftime('%d/%m/%Y') if revisao else '', aleatorio.choice(REVISORES) if revisao else '',
+                'Aprovado' if revisao else '', revisao.year if revisao else '', revisao.month if revisao else '',
+            ])
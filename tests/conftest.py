@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os testes importam o Plan_rev.py da raiz do repositório (sem sessão do Streamlit, os elementos da página são ignorados)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
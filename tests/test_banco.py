@@ -0,0 +1,139 @@
+import io
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import Plan_rev as plan
+
+CSV = (
+    'Carimbo de data/hora,Analista (você),Informação Técnica,Revisado em\n'
+    + ''.join(f'0{1 + i % 9}/0{1 + i % 9}/202{i % 3 + 3} 10:{i % 60:02d}:00,Analista {i},IT - RADA,\n' for i in range(25))
+).encode('utf-8')
+
+
+def test_gravacao_em_blocos_igual_a_base_inteira(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan, 'DIRETORIO_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(plan, 'LINHAS_POR_BLOCO', 4)
+    em_blocos = plan.BancoRespostas(str(tmp_path / 'blocos.db'))
+    em_blocos.gravar('carga', plan.blocos_respostas(io.BytesIO(CSV), plan.hash_conteudo(CSV)))
+    inteira = plan.BancoRespostas(str(tmp_path / 'inteira.db'))
+    inteira.gravar('carga', [plan.processar_csv(CSV)])
+
+    pd.testing.assert_frame_equal(em_blocos.consultar(), inteira.consultar())
+    assert em_blocos.anos() == [2025, 2024, 2023]
+    recentes = em_blocos.consultar(['Analista (você)'], 2025)['Analista (você)']
+    assert sorted(recentes) == sorted(f'Analista {i}' for i in range(2, 25, 3))
+
+
+def test_indices_existentes_mantidos(tmp_path):
+    caminho = str(tmp_path / 'banco.db')
+    conexao = sqlite3.connect(caminho)
+    conexao.execute('CREATE TABLE respostas (chave_linha INTEGER PRIMARY KEY, "Revisado por")')
+    conexao.execute('CREATE INDEX indice_proprio ON respostas ("Revisado por")')
+    conexao.commit()
+    conexao.close()
+
+    banco = plan.BancoRespostas(caminho)
+    banco.gravar('carga', [plan.processar_csv(CSV)])
+    indices = {linha[0] for linha in banco._conexao.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'indice_proprio', 'indice_envio', 'indice_revisao', 'indice_analista'} <= indices
+    plano = banco._conexao.execute(
+        'EXPLAIN QUERY PLAN SELECT chave_linha FROM respostas WHERE "Carimbo de data/hora" >= ? ORDER BY "Carimbo de data/hora"',
+        ('2024-01-01',),
+    ).fetchall()
+    assert 'indice_envio' in plano[0][-1]
+
+
+TIPOS = list(plan.TIPOS_ENVIO.values()) + ['Cancelado', None]
+ENVIOS = pd.DataFrame({
+    'Carimbo de data/hora': [f'{1 + i % 28:02d}/{1 + i % 12:02d}/202{4 + i % 2} 10:00:00' for i in range(60)],
+    'Analista (você)': [f'Analista {i % 4}' for i in range(60)],
+    'Qual o tipo de envio?': [TIPOS[i % len(TIPOS)] for i in range(60)],
+    'Informação Técnica': [['IT - RADA', 'Não', 'IT - IPA, IT - RADA'][i % 3] for i in range(60)],
+    'Revisado em': [f'{1 + i % 7:02d}/0{1 + i % 3}/2025 15:00:00' if i % 5 else None for i in range(60)],
+    'Revisado por': [f'Revisor {i % 3}' if i % 4 else None for i in range(60)],
+}).to_csv(index=False).encode('utf-8')
+
+
+# As contagens agrupadas no banco são as mesmas do groupby sobre a seleção em memória, com e sem filtros
+@pytest.mark.parametrize('selecoes', [
+    {'ANO_envio': None, 'MÊS_envio': None, 'Carimbo de data/hora': None},
+    {'ANO_envio': [2025], 'MÊS_envio': None, 'Carimbo de data/hora': None},
+    {'ANO_envio': None, 'MÊS_envio': [3, 12], 'Carimbo de data/hora': None},
+    {'ANO_envio': [2024, 2025], 'MÊS_envio': [5], 'Carimbo de data/hora': [202418, 202421, 202518]},
+])
+def test_agregar_igual_ao_groupby(tmp_path, selecoes):
+    banco = plan.BancoRespostas(str(tmp_path / 'banco.db'))
+    df = plan.processar_csv(ENVIOS)
+    banco.gravar('carga', [df])
+    grupos = ['ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Tipo_Envio']
+
+    df = df[~df['Envio_Cancelado']]
+    selecao = plan.IndiceFiltros(len(df), 1 << 20).selecionar(df, selecoes)
+    esperado = plan.agregar_envios(None, selecao, grupos, selecoes)
+    obtido = banco.agregar(grupos, intervalos={'Carimbo de data/hora': plan.intervalos_envio(selecoes, banco.anos())})
+    assert len(obtido) and obtido['Quantidade'].sum() == len(selecao)
+    pd.testing.assert_frame_equal(obtido, esperado[obtido.columns].sort_values(grupos, ignore_index=True), check_dtype=False)
+
+
+# Com as respostas no banco, as seleções de analista, Informação Técnica, semanas da revisão e os dias escolhidos nos
+# resumos dão as mesmas contagens que o groupby da seleção em memória
+@pytest.mark.parametrize('grupos, selecoes, dias', [
+    (
+        ['Analista (você)', 'ANO_envio', 'MÊS_envio', 'SEMANA_envio', 'Tipo_Envio'],
+        {'ANO_envio': [2025], 'MÊS_envio': None, 'Carimbo de data/hora': None,
+         'Informação Técnica': ['IT - RADA', 'Não'], 'Analista (você)': ['Analista 1', 'Analista 2']},
+        None,
+    ),
+    (['Tipo_Envio'], {'Revisado em': 'semanas'}, None),
+    (['Revisado por', 'Tipo_Envio'], {'Qual o tipo de envio?': [plan.TIPOS_ENVIO['Reenvio'], 'Cancelado']}, 'dias'),
+])
+def test_agregar_envios_do_banco_igual_ao_da_selecao(tmp_path, monkeypatch, grupos, selecoes, dias):
+    monkeypatch.setattr(plan, 'obter_cache_datasets', lambda: plan.CacheDatasets(1 << 20))
+    banco = plan.BancoRespostas(str(tmp_path / 'banco.db'))
+    df = plan.processar_csv(ENVIOS)
+    banco.gravar('carga', [df])
+
+    df = df[~df['Envio_Cancelado']].reset_index(drop=True)
+    revisao = df['Revisado em']
+    if selecoes.get('Revisado em') == 'semanas':
+        semanas = sorted(set(plan.calendario_das_datas(revisao).chave_semana(revisao)) - {0})
+        selecoes = {'Revisado em': semanas[::2]}
+    selecao = plan.IndiceFiltros(len(df), 1 << 20).selecionar(df, selecoes)
+    intervalos = None
+    if dias:
+        dias = sorted(set(revisao.dropna().dt.date))[1:3]
+        selecao = df[plan.IndiceFiltros(len(df), 1 << 20).mascara(df, selecoes) & plan.IndiceDatas(revisao).mascara_dias(dias)]
+        intervalos = {'Revisado em': plan.intervalos_dias(dias)}
+
+    esperado = plan.agregar_envios(None, selecao, grupos, selecoes)
+    obtido = plan.agregar_envios(plan.FonteBanco(banco), None, grupos, selecoes, intervalos)
+    assert len(obtido) and obtido['Quantidade'].sum() == len(selecao)
+    pd.testing.assert_frame_equal(obtido, esperado[obtido.columns].sort_values(grupos, ignore_index=True), check_dtype=False, check_categorical=False)
+
+
+def test_agregar_usa_indice_das_datas(tmp_path):
+    banco = plan.BancoRespostas(str(tmp_path / 'banco.db'))
+    banco.gravar('carga', [plan.processar_csv(ENVIOS)])
+    plano = banco._conexao.execute(
+        'EXPLAIN QUERY PLAN SELECT "Tipo_Envio", count(*) FROM respostas '
+        'WHERE "Carimbo de data/hora" >= ? AND "Carimbo de data/hora" < ? GROUP BY "Tipo_Envio"',
+        ('2025-01-01', '2026-01-01'),
+    ).fetchall()
+    assert any('indice_envio' in linha[-1] for linha in plano)
+
+
+# Respostas repetidas de um arquivo são mantidas no banco, mesmo em blocos diferentes, como na leitura dos arquivos;
+# gravar de novo a mesma exportação só atualiza as respostas
+def test_respostas_repetidas_mantidas(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan, 'DIRETORIO_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(plan, 'LINHAS_POR_BLOCO', 4)
+    linhas = CSV.decode('utf-8').splitlines(keepends=True)
+    repetidas = (''.join(linhas) + ''.join(linhas[1:6]) + linhas[1]).encode('utf-8')
+    banco = plan.BancoRespostas(str(tmp_path / 'banco.db'))
+    banco.gravar('carga', plan.blocos_respostas(io.BytesIO(repetidas), plan.hash_conteudo(repetidas)))
+    assert len(banco.consultar()) == len(plan.processar_csv(repetidas)) == 31
+
+    banco.gravar('outra carga', [plan.processar_csv(repetidas)])
+    assert len(banco.consultar()) == 31
@@ -0,0 +1,26 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+import Plan_rev as plan
+
+
+@pytest.mark.parametrize('tipo, cancelado', [
+    ('Cancelado', True),
+    ('CANCELADA', True),
+    ('Cancelados', True),
+    ('Envios canceladas', True),
+    ('Cancelar envio anterior', True),
+    ('Envio cancelado pelo analista', True),
+    ('Cancelamento', False),
+    ('Descancelado', False),
+    (plan.TIPOS_ENVIO['Reenvio'], False),
+    (None, False),
+])
+def test_envio_cancelado(tipo, cancelado):
+    with warnings.catch_warnings():
+        # O padrão não pode ter grupos de captura (o str.contains avisaria a cada carga)
+        warnings.simplefilter('error')
+        df = plan.etapa_cancelamento(pd.DataFrame({'Qual o tipo de envio?': [tipo]}))
+    assert df['Envio_Cancelado'].tolist() == [cancelado]
@@ -0,0 +1,42 @@
+import pandas as pd
+
+import Plan_rev as plan
+
+RESPOSTAS = [
+    'IT - RADA', ' it - rada ', 'IT - RADA e IT - IPA', 'IT - IPA', 'Não', ' NÃO', 'Não se aplica',
+    'IT - Outros (Não)', 'IT - FISCALIZAÇÃO', 'it - fiscalização', 'IT - Descumprimento de Condicionante', None,
+]
+
+
+def categorias(respostas):
+    return plan.etapa_categoria_it(pd.DataFrame({'Informação Técnica': respostas}))
+
+
+# Quadros: cada categoria contada de forma independente, como nas contagens originais com str.contains
+def test_contagens_iguais_as_originais():
+    df = categorias(RESPOSTAS)
+    respostas = pd.Series(RESPOSTAS)
+    for categoria, coluna in plan.COLUNAS_CONTEM_IT.items():
+        assert df[coluna].sum() == respostas[respostas.str.contains(categoria, na=False, case=False)].shape[0]
+
+
+def test_resposta_com_duas_categorias_conta_nas_duas():
+    df = categorias(['IT - RADA e IT - IPA'])
+    assert df[plan.COLUNAS_CONTEM_IT['IT - RADA']].all()
+    assert df[plan.COLUNAS_CONTEM_IT['IT - IPA']].all()
+    assert df['Categoria_IT'].isna().all()
+
+
+# Treemaps: só as respostas iguais à categoria, como no filtro original por str.strip().str.upper()
+def test_categoria_it_igual_ao_filtro_original():
+    df = categorias(RESPOSTAS)
+    respostas = pd.Series(RESPOSTAS)
+    for categoria in plan.CATEGORIAS_IT:
+        original = respostas.str.strip().str.upper() == categoria.upper()
+        assert (df['Categoria_IT'] == categoria).fillna(False).tolist() == original.fillna(False).tolist()
+
+
+def test_resposta_ausente_sem_categoria():
+    df = categorias([None])
+    assert not df[list(plan.COLUNAS_CONTEM_IT.values())].any(axis=None)
+    assert df['Categoria_IT'].isna().all()
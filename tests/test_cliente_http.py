@@ -0,0 +1,103 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import Plan_rev as plan
+
+
+# Planilha publicada: responde 304 quando o If-None-Match traz o ETag do conteúdo atual
+class Planilha(BaseHTTPRequestHandler):
+    conteudo = b''
+    requisicoes = []
+
+    def do_GET(self):
+        etag = f'"{plan.hash_conteudo(self.conteudo)}"'
+        Planilha.requisicoes.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(self.conteudo)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Mon, 06 Jan 2025 10:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(self.conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    Planilha.conteudo = 'Carimbo de data/hora,Analista (você)\n01/01/2025 10:00:00,Ana\n'.encode('utf-8')
+    Planilha.requisicoes = []
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Planilha)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{servidor.server_port}/planilha.csv'
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_primeira_verificacao_baixa(url):
+    chave, dados, situacao = plan.ClienteHTTP(intervalo=0).verificar(url)
+    assert situacao == 'baixada'
+    assert dados == Planilha.conteudo
+    assert chave == plan.hash_conteudo(Planilha.conteudo)
+    assert 'If-None-Match' not in Planilha.requisicoes[0]
+
+
+def test_sem_alteracoes_reaproveita_chave(url):
+    cliente = plan.ClienteHTTP(intervalo=0)
+    chave, _, _ = cliente.verificar(url)
+    assert cliente.verificar(url) == (chave, None, 'sem alterações')
+    assert Planilha.requisicoes[1]['If-None-Match'] == f'"{chave}"'
+    assert Planilha.requisicoes[1]['If-Modified-Since'] == 'Mon, 06 Jan 2025 10:00:00 GMT'
+
+
+def test_conteudo_alterado_baixa_de_novo(url):
+    cliente = plan.ClienteHTTP(intervalo=0)
+    chave, _, _ = cliente.verificar(url)
+    Planilha.conteudo += '02/01/2025 11:00:00,Bruno\n'.encode('utf-8')
+    nova_chave, dados, situacao = cliente.verificar(url)
+    assert situacao == 'baixada'
+    assert dados == Planilha.conteudo
+    assert nova_chave != chave
+
+
+def test_intervalo_minimo_sem_requisicao(url):
+    cliente = plan.ClienteHTTP(intervalo=60)
+    chave, _, _ = cliente.verificar(url)
+    assert cliente.verificar(url) == (chave, None, 'verificada há pouco')
+    assert len(Planilha.requisicoes) == 1
+
+
+def test_fonte_le_sem_baixar_de_novo(url):
+    fonte = plan.FonteHTTP(url, plan.ClienteHTTP(intervalo=0))
+    assert fonte.verificar() == 'baixada'
+    assert fonte.ler() == Planilha.conteudo
+    assert len(Planilha.requisicoes) == 1
+
+    # Sem alterações, o conteúdo só é baixado se a base não estiver em cache nem em snapshot
+    fonte = plan.FonteHTTP(url, plan.ClienteHTTP(intervalo=0))
+    fonte.verificar()
+    assert fonte.verificar() == 'sem alterações'
+    assert fonte.ler() == Planilha.conteudo
+    assert len(Planilha.requisicoes) == 4
+    assert 'If-None-Match' not in Planilha.requisicoes[-1]
+
+
+@pytest.mark.parametrize('url, exportacao', [
+    ('https://docs.google.com/spreadsheets/d/1AbC-d_9/edit#gid=123',
+     'https://docs.google.com/spreadsheets/d/1AbC-d_9/export?format=csv&gid=123'),
+    ('https://docs.google.com/spreadsheets/d/1AbC-d_9/edit?usp=sharing',
+     'https://docs.google.com/spreadsheets/d/1AbC-d_9/export?format=csv'),
+    ('https://docs.google.com/spreadsheets/d/1AbC-d_9/export?format=csv&gid=0',
+     'https://docs.google.com/spreadsheets/d/1AbC-d_9/export?format=csv&gid=0'),
+    ('http://servidor.local/respostas.csv', 'http://servidor.local/respostas.csv'),
+])
+def test_url_exportacao_csv(url, exportacao):
+    assert plan.url_exportacao_csv(url) == exportacao
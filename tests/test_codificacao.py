@@ -0,0 +1,59 @@
+import codecs
+import io
+
+import pytest
+
+import Plan_rev as plan
+
+CABECALHO = 'Carimbo de data/hora,Analista (você),Informação Técnica\n'
+
+
+def csv(linhas, codificacao, final='', cabecalho=CABECALHO):
+    texto = cabecalho + ''.join(f'01/02/2025 10:{i % 60:02d}:00,Ana,IT - RADA\n' for i in range(linhas)) + final
+    return texto.encode(codificacao)
+
+
+@pytest.mark.parametrize('dados, codificacao', [
+    (csv(10, 'utf-8'), 'utf-8'),
+    (codecs.BOM_UTF8 + csv(10, 'utf-8'), 'utf-8-sig'),
+    (csv(10, 'latin1'), 'latin1'),
+])
+def test_detectar_codificacao(dados, codificacao):
+    assert plan.detectar_codificacao(dados) == codificacao
+
+
+# Caractere de vários bytes dividido entre dois blocos da validação não indica latin1
+def test_caractere_dividido_entre_blocos():
+    dados = b'a' * (plan.TAMANHO_BLOCO_LEITURA - 1) + 'ç'.encode('utf-8')
+    assert plan.detectar_codificacao(dados) == 'utf-8'
+
+
+# A detecção também lê de um arquivo binário, que volta à posição inicial para o parse
+def test_detectar_codificacao_arquivo():
+    arquivo = io.BytesIO(csv(10, 'latin1', '01/02/2025 11:00:00,Conceição,Não\n'))
+    assert plan.detectar_codificacao(arquivo) == 'latin1'
+    assert arquivo.tell() == 0
+
+
+@pytest.mark.parametrize('codificacao', ['utf-8', 'latin1'])
+def test_processar_csv(codificacao):
+    df = plan.processar_csv(csv(10, codificacao, '01/02/2025 11:00:00,Conceição,Não\n'))
+    assert df.attrs['codificacao'] == codificacao
+    assert df['Analista (você)'].iloc[-1] == 'Conceição'
+    assert len(df) == 11
+
+
+# Início do arquivo em ASCII e trecho em latin1 só no fim: detectado antes do parse, que é feito uma única vez
+def test_latin1_no_fim_do_arquivo(monkeypatch):
+    linhas = plan.TAMANHO_BLOCO_LEITURA // 30 + 10
+    dados = csv(linhas, 'latin1', '01/02/2025 11:00:00,Conceição,Não\n', 'Carimbo de data/hora,Analista,Status\n')
+    assert plan.detectar_codificacao(dados) == 'latin1'
+
+    parses = []
+    read_csv = plan.pd.read_csv
+    monkeypatch.setattr(plan.pd, 'read_csv', lambda *args, **kwargs: parses.append(kwargs['encoding']) or read_csv(*args, **kwargs))
+    df = plan.processar_csv(dados)
+    assert parses == ['latin1']
+    assert df.attrs['codificacao'] == 'latin1'
+    assert df['Analista'].iloc[-1] == 'Conceição'
+    assert len(df) == linhas + 1
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importar(**variaveis):
+    return subprocess.run(
+        [sys.executable, '-c', 'import Plan_rev as plan; print(plan.POLITICA_PRAZO_NEGATIVO)'],
+        cwd=RAIZ, env={**os.environ, **variaveis}, capture_output=True, text=True,
+    )
+
+
+@pytest.mark.parametrize('valor, politica', [('excluir', 'excluir'), (' Zerar ', 'zerar')])
+def test_politica_prazo_negativo(valor, politica):
+    resultado = importar(NUPETR_PRAZO_NEGATIVO=valor)
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.split()[-1] == politica
+
+
+# Valor desconhecido (ex.: erro de digitação) impede a importação em vez de valer como 'zerar'
+def test_politica_prazo_negativo_invalida():
+    resultado = importar(NUPETR_PRAZO_NEGATIVO='exluir')
+    assert resultado.returncode != 0
+    assert "NUPETR_PRAZO_NEGATIVO inválido: 'exluir'" in resultado.stderr
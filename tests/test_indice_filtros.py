@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import Plan_rev as plan
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    linhas = 1003
+    return pd.DataFrame({
+        'Analista (você)': pd.Series(rng.choice(['Ana', 'Bruno', 'Carla', None], linhas), dtype='str'),
+        'Empresa': pd.Series([f'Empresa {i}' for i in rng.integers(0, 300, linhas)], dtype='str'),
+        'ANO_envio': rng.choice([2023, 2024, 2025], linhas),
+    })
+
+
+def test_mascara_igual_a_isin(df):
+    indice = plan.IndiceFiltros(len(df), 2 ** 20)
+    selecoes = [
+        {'Analista (você)': ['Ana', 'Carla'], 'ANO_envio': None},
+        {'Analista (você)': ['Bruno'], 'ANO_envio': [2024, 2025], 'Empresa': ['Empresa 7', 'Empresa 250', 'Nenhuma']},
+        {'Empresa': ['Nenhuma']},
+        {'ANO_envio': [2023]},
+    ]
+    for selecao in selecoes:
+        esperado = np.ones(len(df), dtype=bool)
+        for coluna, escolhidos in selecao.items():
+            if escolhidos is not None:
+                esperado &= df[coluna].isin(escolhidos).to_numpy()
+        assert (indice.mascara(df, selecao) == esperado).all()
+        # Segunda vez, do resultado guardado
+        assert (indice.mascara(df, selecao) == esperado).all()
+
+
+def test_sem_selecao_devolve_a_base(df):
+    indice = plan.IndiceFiltros(len(df), 2 ** 20)
+    assert indice.selecionar(df, {'Analista (você)': None}) is df
+
+
+def test_memoria_limitada(df):
+    indice = plan.IndiceFiltros(len(df), 12_000)
+    for ano in (2023, 2024, 2025):
+        for analista in ('Ana', 'Bruno', 'Carla'):
+            indice.mascara(df, {'ANO_envio': [ano], 'Analista (você)': [analista], 'Empresa': ['Empresa 1']})
+            assert indice._total_bytes == sum(tamanho for _, tamanho in indice._itens.values())
+            assert indice._total_bytes <= indice.limite_bytes or len(indice._itens) == 1
+
+
+def test_base_vazia():
+    df = pd.DataFrame({'ANO_envio': pd.Series([], dtype='int64')})
+    assert plan.IndiceFiltros(0, 2 ** 20).mascara(df, {'ANO_envio': [2024]}).tolist() == []
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import Future
+
+import Plan_rev as plan
+
+
+def csv(prefixo=''):
+    return 'Carimbo de data/hora,Analista (você),Informação Técnica\n' + ''.join(
+        f'01/02/2025 10:{i:02d}:00,Analista {prefixo}{i},IT - RADA\n' for i in range(20)
+    )
+
+
+# Executor cujas leituras nunca terminam
+class ExecutorParado:
+    def __init__(self):
+        self.submetidos = []
+
+    def submit(self, funcao, fonte, chave):
+        self.submetidos.append(chave)
+        return Future()
+
+
+# Leitura que passou do tempo limite continua em andamento e não é submetida de novo (nem processada em sequência)
+def test_leitura_em_andamento_nao_repetida(tmp_path):
+    caminho = tmp_path / 'a.csv'
+    caminho.write_text(csv(), encoding='utf-8')
+    leitura = plan.LeituraParalela(2, 0.01)
+    leitura._executor = executor = ExecutorParado()
+    arquivos = [(plan.FonteLocal(str(caminho)), 'a'), (plan.FonteLocal(str(caminho)), 'b')]
+    assert leitura.processar(arquivos) == ['em andamento', 'em andamento']
+    assert leitura.processar(arquivos[:1]) == ['em andamento']
+    assert executor.submetidos == ['a', 'b']
+
+
+def test_snapshots_gravados_pelos_processos_de_leitura(tmp_path, monkeypatch):
+    monkeypatch.setenv('NUPETR_SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(plan, 'DIRETORIO_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    arquivos = []
+    for indice in range(2):
+        caminho = tmp_path / f'{indice}.csv'
+        caminho.write_text(csv(f'{indice}-'), encoding='utf-8')
+        arquivos.append((plan.FonteLocal(str(caminho)), plan.hash_fonte(str(caminho))))
+    assert plan.LeituraParalela(2, 120).processar(arquivos) == ['pronto', 'pronto']
+    for indice, (_, chave) in enumerate(arquivos):
+        df, _ = plan.ler_snapshot(chave, ['Analista (você)'])
+        assert df['Analista (você)'].iloc[0] == f'Analista {indice}-0'
+
+
+# Arquivos novos do diretório monitorado (que já trazem a chave) também passam pelos processos de leitura; o que não
+# terminou no tempo limite fica fora da versão e do estado, para a próxima verificação
+def test_monitor_le_arquivos_novos_em_paralelo(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan, 'DIRETORIO_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(plan.MonitorDiretorio, '_executar', lambda self: None)
+    plan.obter_cache_datasets().limpar()
+    for indice in range(3):
+        (tmp_path / f'{indice}.csv').write_text(csv(f'{indice}-'), encoding='utf-8')
+    pedidos = []
+
+    def processar_em_paralelo(arquivos):
+        pedidos.append([fonte.name for fonte, _ in arquivos])
+        return ['pronto', 'pronto', 'em andamento']
+
+    monkeypatch.setattr(plan, 'processar_em_paralelo', processar_em_paralelo)
+    monitor = plan.MonitorDiretorio(str(tmp_path), 60)
+    monitor._ingerir(monitor._listar())
+    _, arquivos, _, erros = monitor.estado()
+    assert pedidos == [['0.csv', '1.csv', '2.csv']]
+    assert [arquivo.name for arquivo in arquivos] == ['0.csv', '1.csv']
+    assert sorted(map(os.path.basename, monitor._estados)) == ['0.csv', '1.csv']
+    assert erros == []
+
+
+# Nova verificação do diretório: só o arquivo novo tem o hash calculado; os inalterados mantêm a chave
+def test_monitor_calcula_hash_so_dos_arquivos_alterados(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan, 'DIRETORIO_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(plan.MonitorDiretorio, '_executar', lambda self: None)
+    for indice in range(2):
+        (tmp_path / f'{indice}.csv').write_text(csv(f'{indice}-'), encoding='utf-8')
+    monitor = plan.MonitorDiretorio(str(tmp_path), 60)
+    monitor._ingerir(monitor._listar())
+
+    (tmp_path / '2.csv').write_text(csv('2-'), encoding='utf-8')
+    calculados = []
+    hash_fonte = plan.hash_fonte
+    def contar(fonte):
+        if isinstance(fonte, str):
+            calculados.append(os.path.basename(fonte))
+        return hash_fonte(fonte)
+
+    monkeypatch.setattr(plan, 'hash_fonte', contar)
+    monitor._ingerir(monitor._listar())
+    assert calculados == ['2.csv']
+    assert [arquivo.name for arquivo in monitor.estado()[1]] == ['0.csv', '1.csv', '2.csv']
+
+
+# Uma falha fora da leitura dos arquivos é registrada e a thread continua verificando o diretório
+def test_monitor_continua_depois_de_erro(tmp_path, monkeypatch):
+    verificacoes = []
+
+    def listar(self):
+        verificacoes.append(True)
+        raise KeyError('inesperado')
+
+    monkeypatch.setattr(plan.MonitorDiretorio, '_listar', listar)
+    monitor = plan.MonitorDiretorio(str(tmp_path), 0.01)
+    for _ in range(200):
+        if len(verificacoes) > 1:
+            break
+        plan.time.sleep(0.01)
+    assert len(verificacoes) > 1
+    assert monitor._thread.is_alive()
+    assert 'inesperado' in monitor.estado()[3][0]
@@ -0,0 +1,79 @@
+import re
+
+import pandas as pd
+import pytest
+
+import Plan_rev as plan
+
+SIGLAS = ['LP', 'LPpe', 'LI', 'LIO', 'LO', 'LRO', 'LA', 'AE', 'ATO', 'LS', 'RLO', 'RLS', 'LPpr']
+
+
+# extrair_tipo_processo das páginas, aplicado linha a linha antes de classificar_tipo_processo
+def extrair_tipo_processo(numero_processo):
+    match = re.search(r'TEC(?:[/-]*|)([A-Z]{2,5})', str(numero_processo))
+    if match:
+        sigla = match.group(1)
+        if sigla in SIGLAS:
+            return sigla
+    return 'Outros'
+
+
+# extrair_tipo_processo global (com a busca da sigla como palavra isolada)
+def extrair_tipo_processo_global(numero_processo):
+    match = re.search(r'TEC[-]*([A-Z]{2,3})', numero_processo, re.IGNORECASE)
+    if match:
+        sigla = match.group(1).upper()
+        if sigla in SIGLAS:
+            return sigla
+    for sigla in SIGLAS:
+        if re.search(rf'\b{sigla}\b', numero_processo, re.IGNORECASE):
+            return sigla
+    return 'Outros'
+
+
+def classificar(numeros):
+    return plan.classificar_tipo_processo(pd.Series(numeros, dtype=object)).tolist()
+
+
+# Sigla válida logo após o TEC, com as variações de separador
+@pytest.mark.parametrize('numero', [
+    '100746/2023-TEC/LP', '100746/2023-TEC-LI', '100746/2023-TECLO', '100746/2023-TEC--LA', '100746/2023-TEC/-RLO',
+    '100746/2023-TEC//ATO', '100746/2023-TEC/LIO', '100746/2023-TEC/LRO', '100746/2023-TEC/AE', '100746/2023-TEC/LS',
+    '100746/2023-TEC/RLS', '100746/2023-TEC/LPpe', 'A-CORRIGIDO-100746/2023-TEC/LO', '100746/2023 TEC/LP 2º envio',
+])
+def test_sigla_apos_tec_igual_as_paginas(numero):
+    assert classificar([numero]) == [extrair_tipo_processo(numero)]
+
+
+# Sem sigla reconhecida: 'Outros', como antes
+@pytest.mark.parametrize('numero', [
+    '100746/2023', '', 'sem número', '100746/2023-TEC', '100746/2023-TEC/XYZ', '100746/2023-TEC/LX', 'LOTE 12', 'PLANO',
+])
+def test_sem_sigla_outros(numero):
+    assert classificar([numero]) == [extrair_tipo_processo(numero)] == [extrair_tipo_processo_global(numero)] == ['Outros']
+
+
+# Sem sigla válida após o TEC: sigla isolada no número, sem diferenciar maiúsculas (regra da função global)
+@pytest.mark.parametrize('numero', [
+    '100746/2023-TEC lo', '100746/2023 LI', '100746/2023-TEC/lp', 'LA 100746/2023', '100746/2023 (ae)',
+])
+def test_sigla_avulsa_igual_a_funcao_global(numero):
+    assert classificar([numero]) == [extrair_tipo_processo_global(numero)]
+
+
+# Diferenças em relação à função global: a sigla mais à esquerda vence (e não a primeira da tabela) e siglas em
+# maiúsculas logo após o TEC também são reconhecidas quando têm mais de 3 letras
+@pytest.mark.parametrize('numero, tipo', [
+    ('100746/2023 LO/LP', 'LO'),
+    ('100746/2023-TEC/LPPR', 'LPpr'),
+    ('100746/2023-TEC/LPPE', 'LPpe'),
+])
+def test_sigla_avulsa_mais_a_esquerda(numero, tipo):
+    assert classificar([numero]) == [tipo]
+
+
+def test_serie_com_repetidos_e_ausentes():
+    numeros = pd.Series(['1/2023-TEC/LP', None, '2/2023-TEC/LO', '1/2023-TEC/LP', 'X'], index=[10, 11, 12, 13, 14])
+    tipos = plan.classificar_tipo_processo(numeros)
+    assert tipos.index.tolist() == [10, 11, 12, 13, 14]
+    assert tipos.tolist() == ['LP', 'Outros', 'LO', 'LP', 'Outros']